@@ -1,13 +1,32 @@
+import os
 import streamlit as st
-import PyPDF2
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
+import match_model
+import tracing
+from text_extraction import extract_text
+from charts import plot_bar_comparison, plot_pie_chart
+from ranking import rank_resumes, summarize_ranking, generate_recommendations
+from results_cache import ResultCache, ScreeningResult, screening_key
+from encoders import encoder_name, get_encoder
+import report_export
 
 # ------------------ Constants for Navigation ------------------
 HOME_PAGE = "🏠 Home"
 RESULTS_PAGE = "📊 Results"
 LOGOUT_PAGE = "🚪 Logout"
+PAGE_SIZES = [10, 25, 50]
+# Semantic scoring tiers offered on the home page: label -> encoder backend
+SEMANTIC_OPTIONS = {
+    "Off (skills only)": None,
+    "⚡ Fast offline (hashing)": "hashing",
+    "🧠 SBERT": "sbert",
+}
+# Users who see the stage latency panel in the sidebar
+ADMIN_USERS = {"admin"}
+
+# Load the SBERT model in the background right after login (set to 0 to disable)
+WARM_UP_MODEL = os.environ.get("RESUME_SCREENING_WARM_UP", "1") == "1"
+# Near-duplicate uploads (estimated Jaccard similarity >= this) are encoded once (0 disables)
+DEDUP_THRESHOLD = float(os.environ.get("RESUME_SCREENING_DEDUP_THRESHOLD", "0.9")) or None
 
 # ------------------ Page Config ------------------
 APP_TITLE = "AI-Powered Resume Screening"
@@ -67,99 +86,78 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# ------------------ Helper Functions ------------------
-def read_file(file):
-    if file.type == "application/pdf":
-        reader = PyPDF2.PdfReader(file)
-        return " ".join([page.extract_text() or "" for page in reader.pages])
-    else:
-        return file.read().decode("utf-8")
-
-def extract_skills_from_jd(jd_text, known_skills):
-    jd_text = jd_text.lower()
-    jd_skills = [skill for skill in known_skills if skill in jd_text]
-    return jd_skills
-
-def extract_skills(text, skill_list):
-    text = text.lower()
-    found = [skill for skill in skill_list if skill in text]
-    missing = [skill for skill in skill_list if skill not in text]
-    return found, missing
-
-def plot_bar_comparison(score1, score2):
-    df = pd.DataFrame({"Resume": ["Resume 1", "Resume 2"], "Match Score": [score1 * 100, score2 * 100]})
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(data=df, x="Resume", y="Match Score", palette=["#4CAF50", "#1976D2"], ax=ax)
-    ax.set_title("Resume Match Comparison")
-    for container in ax.containers:
-        ax.bar_label(container, fmt='%.1f%%')
-    st.pyplot(fig)
-
-def plot_pie_chart(matched, missing, title):
-    total = len(matched) + len(missing)
-    if total == 0:
-        st.write("No skills available to show chart.")
-        return
-
-    labels = [f'Matched ({len(matched)})', f'Missing ({len(missing)})']
-    sizes = [len(matched), len(missing)]
-    colors = ['#4CAF50', '#FF6F61']
-
-    fig, ax = plt.subplots()
-    _, _, _ = ax.pie(
-        sizes,
-        labels=labels,
-        colors=colors,
-        autopct='%1.1f%%',
-        startangle=90,
-        textprops={'fontsize': 10}
-    )
-    ax.axis('equal')
-    ax.set_title(f"{title} Skill Match")
-
-    st.markdown(f"**Matched Skills ({len(matched)}):** {', '.join(matched) or 'None'}")
-    st.markdown(f"**Missing Skills ({len(missing)}):** {', '.join(missing) or 'None'}")
-
-    st.pyplot(fig)
-
-def generate_recommendations(results):
-    recommendations = []
-
-    for i in [1, 2]:
-        missing = results[f'missing_skills_{i}']
-        if missing:
-            recommendations.append(f"**Resume {i}:** Consider adding these missing skills: *{', '.join(missing)}*.")
-        else:
-            recommendations.append(f"**Resume {i}:** All key job skills are covered. Great job!")
+# ------------------ Lazy Resources ------------------
+# Heavy libraries and the model are loaded once per process, on first use, so the
+# login page renders without paying for them.
+@st.cache_resource
+def get_pandas():
+    import pandas as pd
+    return pd
 
-    if results['score1'] > results['score2']:
-        recommendations.append("✅ **Resume 1 is a better match based on skills and similarity.**")
-    elif results['score2'] > results['score1']:
-        recommendations.append("✅ **Resume 2 is a better match based on skills and similarity.**")
-    else:
-        recommendations.append("🔄 **Both resumes have similar match scores.**")
+@st.cache_resource
+def get_scoring_service():
+    # Shared by all sessions, so concurrent recruiters' texts are encoded in one batch
+    return match_model.get_scoring_service()
 
-    return "\n\n".join(recommendations)
+@st.cache_resource
+def get_result_cache():
+    # One bounded LRU for all sessions: the same JD and files are only ranked once
+    return ResultCache()
 
-def create_downloadable_report(results):
-    report = f"""
-📊 Resume Screening Report
+@st.cache_resource
+def start_model_warm_up():
+    return match_model.warm_up()
 
-Resume 1 Match: {results['score1'] * 100:.1f}%
-Matched Skills: {', '.join(results['matched_skills_1']) or 'None'}
-Missing Skills: {', '.join(results['missing_skills_1']) or 'None'}
-
-Resume 2 Match: {results['score2'] * 100:.1f}%
-Matched Skills: {', '.join(results['matched_skills_2']) or 'None'}
-Missing Skills: {', '.join(results['missing_skills_2']) or 'None'}
-
-📌 Summary:
-{results['summary']}
-
-💡 Recommendations:
-{generate_recommendations(results)}
-"""
-    return report
+# ------------------ Helper Functions ------------------
+def read_file(file):
+    # Parsed text is cached by content hash, so reruns and re-uploads skip the parse
+    return extract_text(file.getvalue(), is_pdf=file.type == "application/pdf")
+
+def screen_uploads(job_desc, resume_files, backend):
+    """
+    Rank the uploaded resumes, blending in the similarity of the given encoder
+    backend (None for skills only); returns (ScreeningResult, cacheable). Results with
+    skipped files or a skill-only fallback are not cached, since a retry may succeed.
+    """
+    resumes, skipped = [], []
+    for resume_file in resume_files:
+        try:
+            with tracing.stage("file_parsing"):
+                resumes.append((resume_file.name, read_file(resume_file)))
+        except Exception as e:
+            # A corrupt, undecodable or too slow file skips only itself, as in screen_resumes.py
+            st.warning(f"Skipped {resume_file.name}: {type(e).__name__}: {e}")
+            skipped.append(resume_file.name)
+
+    jd_skills, ranked, cacheable = None, None, not skipped
+    if backend:
+        try:
+            with st.spinner(f"Scoring with the {backend} encoder..."):
+                # SBERT goes through the shared micro-batching service; the hashing tier is cheap enough inline
+                model = get_scoring_service() if backend == "sbert" else get_encoder(backend)
+                jd_skills, ranked = rank_resumes(job_desc, resumes, model=model, dedup_threshold=DEDUP_THRESHOLD)
+        except Exception as e:
+            st.warning(f"{backend} encoder unavailable, ranking on skills only: {e}")
+            cacheable = False
+    if ranked is None:
+        # Extract JD skills and score every resume against them in one matrix
+        jd_skills, ranked = rank_resumes(job_desc, resumes, dedup_threshold=DEDUP_THRESHOLD)
+
+    return ScreeningResult.from_ranking(jd_skills, ranked, summarize_ranking(ranked), skipped), cacheable
+
+def metrics_panel():
+    st.markdown("### ⏱️ Stage Latency")
+    stats = tracing.snapshot()
+    if not stats:
+        st.caption("No stages recorded yet." if tracing.ENABLED else "Tracing is disabled (RESUME_SCREENING_TRACING=0).")
+        return
+    st.dataframe(get_pandas().DataFrame([
+        {"Stage": name, "Runs": s["count"], "p50 ms": round(s["p50_ms"], 1),
+         "p95 ms": round(s["p95_ms"], 1), "p99 ms": round(s["p99_ms"], 1)}
+        for name, s in stats.items()
+    ]), hide_index=True)
+    st.download_button("📥 Prometheus", tracing.to_prometheus(), file_name="metrics.prom")
+    st.download_button("📥 JSON", tracing.to_json(), file_name="metrics.json")
 
 # ------------------ Login Function ------------------
 def login():
@@ -193,64 +191,17 @@ if "users" not in st.session_state:
 if "user" not in st.session_state:
     st.session_state.user = None
 
-# ------------------ Known Skills List ------------------
-known_skills = [
-    # Frontend & Web
-    "html", "css", "scss", "sass", "javascript", "typescript", "react", "redux", 
-    "next.js", "vue.js", "angular", "bootstrap", "tailwind css", "jquery", 
-    "responsive design", "web accessibility", "ui/ux", "figma", "adobe xd",
-
-    # Backend & Core Programming
-    "java", "spring", "spring boot", "hibernate", "rest api", "restful apis", 
-    "microservices", "servlets", "jsp", "sql", "mysql", "postgresql", "mongodb", 
-    "oracle", "node.js", "express.js", "php", "c", "c++", "c#", ".net", "flask", "django",
-
-    # Android Development
-    "android", "kotlin", "java for android", "android studio", "xml", "firebase", 
-    "retrofit", "room", "jetpack", "mvvm", "mvp", "jetpack compose", "google maps api", 
-    "material design", "rest", "json", "application design", "application development", 
-    "play store deployment", "android sdk", "lifecycle management",
-
-    # DevOps & Cloud
-    "git", "github", "gitlab", "bitbucket", "jenkins", "docker", "kubernetes", 
-    "aws", "gcp", "azure", "ci/cd", "terraform", "ansible", "helm", "monitoring", 
-    "grafana", "prometheus", "logstash", "devops tools",
-
-    # Data Science & Machine Learning
-    "python", "r", "pandas", "numpy", "scikit-learn", "matplotlib", "seaborn", 
-    "tensorflow", "pytorch", "keras", "xgboost", "lightgbm", "mlops", "mlflow", 
-    "airflow", "data preprocessing", "model evaluation", "feature engineering",
-
-    # NLP
-    "nlp", "text preprocessing", "nltk", "spacy", "transformers", "bert", "gpt", 
-    "hugging face", "langchain", "text classification", "sentiment analysis", 
-    "topic modeling", "ner", "text summarization",
-
-    # Tools & Platforms
-    "jupyter", "colab", "vs code", "pycharm", "eclipse", "intellij", 
-    "postman", "swagger", "docker hub", "heroku", "netlify", "streamlit", 
-
-    # BI & Analytics
-    "power bi", "tableau", "excel", "data visualization", "data analysis", 
-    "dash", "looker", "metabase", "superset",
-
-    # Software Engineering Practices
-    "agile", "scrum", "jira", "confluence", "uml", "software development lifecycle",
-    "system design", "api design", "unit testing", "integration testing", "test cases",
-
-    # Soft Skills / Misc
-    "problem solving", "communication", "teamwork", "critical thinking", 
-    "debugging", "adaptability", "leadership", "collaboration", 
-    "time management", "presentation", "analytical thinking", "creativity"
-]
-
-
 # ------------------ Main Application ------------------
 if st.session_state.logged_in:
+    if WARM_UP_MODEL:
+        start_model_warm_up()
+
     with st.sidebar:
         st.title("🧭 Menu")
         st.markdown(f"👤 Logged in as: **{st.session_state.user}**")
         nav_choice = st.radio("Select a Page:", [HOME_PAGE, RESULTS_PAGE, LOGOUT_PAGE], index=[HOME_PAGE, RESULTS_PAGE, LOGOUT_PAGE].index(st.session_state.get("nav_choice", HOME_PAGE)))
+        # Filled in at the end of the run, so it includes the stages of this run
+        admin_slot = st.container() if st.session_state.user in ADMIN_USERS else None
 
 
     if nav_choice == HOME_PAGE:
@@ -259,103 +210,105 @@ if st.session_state.logged_in:
 
         job_desc = st.text_area("📋 Paste Job Description Here", height=150)
 
-        col1, col2 = st.columns(2)
-        with col1:
-            st.write("### 📎 Resume 1")
-            resume1_file = st.file_uploader("Upload Resume 1", type=["pdf", "txt"], key="resume1")
-        with col2:
-            st.write("### 📎 Resume 2")
-            resume2_file = st.file_uploader("Upload Resume 2", type=["pdf", "txt"], key="resume2")
-
-        if st.button("🔍 Compare Resumes"):
-            if not job_desc.strip() or not resume1_file or not resume2_file:
-                st.error("Please provide all required inputs: Job Description and both resumes.")
+        st.write("### 📎 Resumes")
+        resume_files = st.file_uploader("Upload Resumes", type=["pdf", "txt"], accept_multiple_files=True, key="resumes")
+        semantic_choice = st.radio("Blend in semantic similarity", list(SEMANTIC_OPTIONS), horizontal=True,
+                                   help="The fast tier needs no model download; SBERT is slower but understands paraphrases.")
+        backend = SEMANTIC_OPTIONS[semantic_choice]
+
+        if st.button("🔍 Rank Resumes"):
+            if not job_desc.strip() or not resume_files:
+                st.error("Please provide all required inputs: Job Description and at least one resume.")
             else:
-                resume1_text = read_file(resume1_file)
-                resume2_text = read_file(resume2_file)
-
-                # Extract relevant JD skills dynamically
-                jd_skills = extract_skills_from_jd(job_desc, known_skills)
-
-                # Extract matched and missing skills from resumes based on JD skills
-                matched_skills_1, missing_skills_1 = extract_skills(resume1_text, jd_skills)
-                matched_skills_2, missing_skills_2 = extract_skills(resume2_text, jd_skills)
-
-                # Calculate match percentage based on JD skills only
-                score1 = round(len(matched_skills_1) / len(jd_skills), 2) if jd_skills else 0
-                score2 = round(len(matched_skills_2) / len(jd_skills), 2) if jd_skills else 0
-
-                # Store results in session_state
-                st.session_state["score1"] = score1
-                st.session_state["score2"] = score2
-                st.session_state["matched_skills_1"] = matched_skills_1
-                st.session_state["missing_skills_1"] = missing_skills_1
-                st.session_state["matched_skills_2"] = matched_skills_2
-                st.session_state["missing_skills_2"] = missing_skills_2
-                st.session_state["jd_skills"] = jd_skills
-
-                # Summary
-                if score1 > score2:
-                    summary = f"Resume 1 has better skill alignment ({score1*100:.0f}%)."
-                elif score2 > score1:
-                    summary = f"Resume 2 has better skill alignment ({score2*100:.0f}%)."
+                cache = get_result_cache()
+                key = screening_key(
+                    job_desc, [(f.name, f.getvalue()) for f in resume_files], semantic=backend is not None,
+                    model_name=encoder_name(backend) if backend else None, dedup_threshold=DEDUP_THRESHOLD,
+                )
+                screening = cache.get(key)
+                if screening is None:
+                    with tracing.stage("screening_total"):
+                        screening, cacheable = screen_uploads(job_desc, resume_files, backend)
+                    if cacheable:
+                        cache.put(key, screening)
+                    st.session_state["served_from_cache"] = False
                 else:
-                    summary = f"Both resumes are similarly aligned ({score1*100:.0f}%)."
-                st.session_state["summary"] = summary
+                    st.session_state["served_from_cache"] = True
+                if tracing.METRICS_FILE:
+                    tracing.export(tracing.METRICS_FILE)
+
+                # Only the shared, immutable result object is kept in session_state
+                st.session_state["screening"] = screening
+                st.session_state["results_page"] = 1
                 st.session_state["nav_choice"] = RESULTS_PAGE
                 st.rerun()
 
     elif nav_choice == RESULTS_PAGE:
-        if "score1" in st.session_state and "score2" in st.session_state:
-            st.title("📊 Resume Comparison Results")
-            st.markdown(f"### Job Description Skills: {', '.join(st.session_state.get('jd_skills', []))}")
-
-            results_data = {
-                "score1": st.session_state.score1,
-                "score2": st.session_state.score2,
-                "matched_skills_1": st.session_state.matched_skills_1,
-                "missing_skills_1": st.session_state.missing_skills_1,
-                "matched_skills_2": st.session_state.matched_skills_2,
-                "missing_skills_2": st.session_state.missing_skills_2,
-                "summary": st.session_state.summary,
-            }
-
-            # Display metrics, summaries, charts & recommendations
-            col1, col2 = st.columns(2)
-            with col1:
-                st.metric("Resume 1 Match", f"{results_data['score1']*100:.1f}%")
-                st.success(f"Matched Skills: {', '.join(results_data['matched_skills_1']) or 'None'}")
-                st.error(f"Missing Skills: {', '.join(results_data['missing_skills_1']) or 'None'}")
-            with col2:
-                st.metric("Resume 2 Match", f"{results_data['score2']*100:.1f}%")
-                st.success(f"Matched Skills: {', '.join(results_data['matched_skills_2']) or 'None'}")
-                st.error(f"Missing Skills: {', '.join(results_data['missing_skills_2']) or 'None'}")
+        if "screening" in st.session_state:
+            screening = st.session_state.screening
+            st.title("📊 Resume Ranking Results")
+            st.markdown(f"### Job Description Skills: {', '.join(screening.jd_skills)}")
+            if screening.skipped:
+                st.warning(f"Skipped (could not be read): {', '.join(screening.skipped)}")
 
             st.markdown("### 📌 Summary")
-            st.info(results_data['summary'])
-
-            st.markdown("### 📈 Bar Chart Comparison")
-            plot_bar_comparison(results_data['score1'], results_data['score2'])
-
-            st.markdown("### 🧠 Skill Match Pie Charts")
-            skill_col1, skill_col2 = st.columns(2)
-            with skill_col1:
-                st.markdown("#### Resume 1")
-                plot_pie_chart(results_data['matched_skills_1'], results_data['missing_skills_1'], "Resume 1")
-            with skill_col2:
-                st.markdown("#### Resume 2")
-                plot_pie_chart(results_data['matched_skills_2'], results_data['missing_skills_2'], "Resume 2")
+            st.info(screening.summary)
 
-            st.markdown("### 💡 Recommendations")
-            st.write(generate_recommendations(results_data))
+            stats = get_result_cache().stats()
+            source = "⚡ Served from the result cache" if st.session_state.get("served_from_cache") else "🧮 Freshly computed"
+            st.caption(f"{source} · cache: {stats['hits']} hits / {stats['misses']} misses "
+                       f"({stats['hit_rate'] * 100:.0f}% hit rate), {stats['entries']}/{stats['max_entries']} results")
 
-            report = create_downloadable_report(results_data)
-            st.download_button("📥 Download Report as TXT", report, file_name="resume_screening_report.txt")
+            if not len(screening):
+                # Every upload was skipped; there is nothing to rank or report
+                st.warning("None of the uploaded resumes could be read.")
+            else:
+                # Only one page of candidates is ever rendered
+                page_col1, page_col2 = st.columns(2)
+                with page_col1:
+                    page_size = st.selectbox("Candidates per page", PAGE_SIZES, key="results_page_size")
+                n_pages = max(1, -(-len(screening) // page_size))
+                with page_col2:
+                    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1, key="results_page")
+                page_results = screening.ranking((page - 1) * page_size, page * page_size)
+
+                st.dataframe(get_pandas().DataFrame({
+                    "Rank": [r["rank"] for r in page_results],
+                    "Resume": [r["name"] for r in page_results],
+                    "Match %": [round(r["score"] * 100, 1) for r in page_results],
+                    "Matched": [len(r["matched_skills"]) for r in page_results],
+                    "Missing": [len(r["missing_skills"]) for r in page_results],
+                    "Duplicate of": [r["duplicate_of"] or "" for r in page_results],
+                }), hide_index=True)
+
+                st.markdown("### 📈 Bar Chart Comparison")
+                plot_bar_comparison([r["name"] for r in page_results], [r["score"] for r in page_results])
+
+                st.markdown("### 🧠 Skill Match Pie Charts")
+                for result in page_results:
+                    with st.expander(f"#{result['rank']} {result['name']} — {result['score']*100:.1f}%"):
+                        plot_pie_chart(result['matched_skills'], result['missing_skills'], result['name'])
+
+                st.markdown("### 💡 Recommendations")
+                st.write(generate_recommendations(page_results, best=screening.ranking(0, 1)[0]))
+
+                # The report is only generated when the button is clicked
+                report_format = st.selectbox("Report format", report_export.FORMATS, key="report_format",
+                                             format_func=str.upper)
+                st.download_button(
+                    f"📥 Download Report as {report_format.upper()}",
+                    lambda: report_export.to_bytes(screening.candidates, report_format, screening.summary),
+                    file_name=f"resume_screening_report.{report_format}", mime=report_export.MIME_TYPES[report_format],
+                )
 
         else:
             st.warning("No results to display. Please upload resumes and job description, then compare.")
 
-    elif nav_choice == LOGOUT_PAGE:
+    if admin_slot is not None:
+        with admin_slot, st.expander("🛠️ Admin Metrics"):
+            metrics_panel()
+
+    if nav_choice == LOGOUT_PAGE:
         st.session_state.logged_in = False
         st.session_state.user = None
         st.rerun()
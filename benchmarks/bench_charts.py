@@ -0,0 +1,65 @@
+"""
+Memory and time of the result charts: render a results page 1,000 times and report
+how much the process grows. tests/test_charts.py asserts the growth stays bounded.
+
+Run from the repository root:
+    python -m benchmarks.bench_charts
+"""
+import gc
+import random
+import time
+
+import charts
+
+RENDERS = 1_000
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * 4096 / 1e6
+    except OSError:  # not Linux: fall back to the peak, which still catches a leak
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1e3
+
+
+def render_page(rng, distinct):
+    # One results view: the page's bar chart plus the pie chart of an expanded candidate.
+    # The page is one of `distinct` possible result sets.
+    page = random.Random(rng.randrange(distinct))
+    n = page.randint(2, 10)
+    names = tuple(f"resume_{page.randrange(10**6)}.pdf" for _ in range(n))
+    scores = tuple(round(page.random(), 2) for _ in range(n))
+    charts.render_bar_chart(names, scores)
+    charts.render_pie_chart(page.randint(0, 12), page.randint(1, 12), names[0])
+
+
+def measure(renders, distinct, seed=0):
+    """
+    (seconds, RSS growth in MB) of `renders` page renders once the chart caches are full.
+    """
+    rng = random.Random(seed)
+    charts.render_bar_chart.cache_clear()
+    charts.render_pie_chart.cache_clear()
+    # Warm up imports, font caches and fill the chart caches before measuring
+    for _ in range(charts.MAX_CACHED_CHARTS):
+        render_page(rng, distinct)
+    gc.collect()
+    baseline = rss_mb()
+    start = time.perf_counter()
+    for _ in range(renders):
+        render_page(rng, distinct)
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    return elapsed, rss_mb() - baseline
+
+
+def main():
+    print(f"{'scenario':>22} {'renders':>8} {'seconds':>8} {'RSS growth (MB)':>16}")
+    for name, distinct in [("repeat views (hits)", 20), ("new results (misses)", 10**9)]:
+        elapsed, growth = measure(RENDERS, distinct)
+        print(f"{name:>22} {RENDERS:>8} {elapsed:>8.2f} {growth:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
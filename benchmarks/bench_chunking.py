@@ -0,0 +1,68 @@
+"""
+Quality and cost of chunked encoding on long resumes, using a stub encoder that
+truncates its input like the real model.
+
+Run from the repository root:
+    python -m benchmarks.bench_chunking [--pairs 1000] [--preamble 600]
+
+Each synthetic resume is preceded by `preamble` words without any skills (summary,
+education, ...), so a truncating encoder never sees the part that matters.
+"""
+import argparse
+import time
+
+import match_model
+from benchmarks.stub_encoder import StubEncoder
+from benchmarks.synthetic import SyntheticCorpus
+from chunking import chunk_text
+from skill_matcher import known_skills
+
+MAX_SEQ_LENGTH = 256
+
+
+def long_pairs(n, preamble_words, seed=0):
+    """
+    Labelled pairs of long resumes and skill-list JDs: positives list the resume's
+    own skills, negatives random ones.
+    """
+    corpus = SyntheticCorpus(seed)
+    pairs = []
+    for i in range(n):
+        _, skills, text = corpus.resume(i)
+        rng = corpus._rng("preamble", i)
+        preamble = " ".join(rng.choices(corpus.words[:200], k=preamble_words))
+        label = rng.random() < 0.5
+        jd_skills = skills[:6] if label else rng.sample(known_skills, 6)
+        pairs.append({"resume_text": f"{preamble}. {text}", "job_description": f"Required skills: {', '.join(jd_skills)}.",
+                      "label": int(label)})
+    return pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=1000)
+    parser.add_argument("--preamble", type=int, default=600, help="skill-free words before each resume")
+    args = parser.parse_args(argv)
+
+    pairs = long_pairs(args.pairs, args.preamble)
+    resumes = [p["resume_text"] for p in pairs]
+    jds = [p["job_description"] for p in pairs]
+    labels = [p["label"] for p in pairs]
+    n_chunks = sum(len(chunk_text(text, MAX_SEQ_LENGTH - 2)) for text in set(resumes + jds))
+    print(f"📚 {len(pairs)} pairs, {n_chunks} windows of {MAX_SEQ_LENGTH - 2} tokens "
+          f"(one model call per window would be {n_chunks} calls)")
+
+    print(f"{'mode':>16} {'best F1':>8} {'threshold':>10} {'model calls':>12} {'texts':>8} {'seconds':>8}")
+    modes = [("truncated", False, "mean"), ("chunked mean", True, "mean"),
+             ("chunked max", True, "max"), ("chunked top_n", True, "top_n")]
+    for name, chunked, pooling in modes:
+        model = StubEncoder(call_overhead=0.005, max_seq_length=MAX_SEQ_LENGTH)
+        start = time.perf_counter()
+        scores = match_model.pair_scores(model, resumes, jds, chunked=chunked, pooling=pooling)
+        elapsed = time.perf_counter() - start
+        best = match_model.best_threshold(match_model.threshold_sweep(scores, labels))
+        print(f"{name:>16} {best['f1']:>8.3f} {best['threshold']:>10.3f} {model.calls:>12} {model.texts:>8} {elapsed:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark clean_text and check it is output-identical to the original implementation.
+
+Equivalence is checked on every field of small_resume_jd_dataset.json, on the
+resumes in UpdatedResumeDataSet.csv and on randomized edge cases, for the scalar
+function and for the pandas / Arrow batch modes. Exits non-zero on any mismatch.
+Run from the repository root:
+    python -m benchmarks.bench_clean_text
+"""
+import csv
+import json
+import random
+import re
+import sys
+import time
+
+from clean_resume_dataset import clean_text, clean_texts
+
+
+def legacy_clean_text(text):
+    # The original implementation, kept verbatim as the reference
+    text = text.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
+    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
+    text = re.sub(r'\S+@\S+', '', text)
+    text = re.sub(r'\b\d{10,15}\b', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def edge_cases(n, seed=0):
+    rng = random.Random(seed)
+    pieces = ["a", "bc", "@", "x@y.com", "1234567890", "98765432101234", "12345678901234567",
+              " ", "  ", "\n", "\r\n", "\t", "\x0b", "\x1c", "é", "—", "日本", "_", "-", ".",
+              "+91", "(555)", "user@", "@host", "a@b@c"]
+    return ["".join(rng.choices(pieces, k=rng.randint(0, 40))) for _ in range(n)]
+
+
+def load_texts():
+    with open('small_resume_jd_dataset.json', encoding='utf-8') as f:
+        data = json.load(f)
+    texts = [item[field] for item in data for field in ('resume_text', 'job_description')]
+    with open('UpdatedResumeDataSet.csv', newline='', encoding='utf-8') as f:
+        texts += [row['Resume'] for row in csv.DictReader(f)]
+    return texts
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    texts = load_texts()
+    cases = texts + edge_cases(20_000)
+    expected = [legacy_clean_text(text) for text in cases]
+
+    mismatches = {"scalar": sum(clean_text(text) != want for text, want in zip(cases, expected))}
+    try:
+        import pandas as pd
+        mismatches["pandas"] = int((clean_texts(pd.Series(cases)) != pd.Series(expected)).sum())
+    except ImportError:
+        pass
+    try:
+        import pyarrow as pa
+        mismatches["arrow"] = sum(got != want for got, want in zip(clean_texts(pa.array(cases)).to_pylist(), expected))
+    except ImportError:
+        pass
+
+    print(f"Equivalence on {len(cases)} texts: " + ", ".join(f"{mode} {n} mismatches" for mode, n in mismatches.items()))
+
+    corpus = texts * 5
+    legacy = timed(lambda: [legacy_clean_text(text) for text in corpus])
+    fast = timed(lambda: [clean_text(text) for text in corpus])
+    print(f"{'mode':>10} {'seconds':>8} {'MB/s':>8}")
+    size_mb = sum(len(text) for text in corpus) / 1e6
+    print(f"{'legacy':>10} {legacy:>8.3f} {size_mb / legacy:>8.1f}")
+    print(f"{'scalar':>10} {fast:>8.3f} {size_mb / fast:>8.1f}")
+    if "arrow" in mismatches:
+        import pyarrow as pa
+        array = pa.array(corpus)
+        arrow = timed(lambda: clean_texts(array))
+        print(f"{'arrow':>10} {arrow:>8.3f} {size_mb / arrow:>8.1f}")
+
+    if any(mismatches.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+Start-up and random access of a corpus store against loading the whole CSV.
+
+Run from the repository root:
+    python -m benchmarks.bench_corpus_store [--docs 50000] [--reads 100]
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+
+from benchmarks.synthetic import SyntheticCorpus
+from corpus_store import CorpusStore, convert
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=50_000)
+    parser.add_argument("--reads", type=int, default=100, help="random rows read after opening")
+    args = parser.parse_args(argv)
+
+    corpus = SyntheticCorpus(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "resumes.csv")
+        with open(csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["Category", "Resume"])
+            for i in range(args.docs):
+                category, _, text = corpus.resume(i)
+                writer.writerow([category, text])
+        store_path = os.path.join(tmp, "resumes.corpus")
+        start = time.perf_counter()
+        convert(csv_path, store_path)
+        print(f"📦 {args.docs} resumes, {os.path.getsize(csv_path) / 1e6:.0f} MB CSV, "
+              f"converted in {time.perf_counter() - start:.1f}s")
+        rows = random.Random(0).sample(range(args.docs), args.reads)
+
+        import pandas as pd  # import time is not counted
+        start = time.perf_counter()
+        frame = pd.read_csv(csv_path)
+        texts = [frame["Resume"].iloc[i] for i in rows]
+        pandas_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with CorpusStore(store_path) as store:
+            assert [store.text(i) for i in rows] == texts
+        store_seconds = time.perf_counter() - start
+
+    print(f"{'loader':>12} {'open + ' + str(args.reads) + ' reads':>20}")
+    print(f"{'pandas':>12} {pandas_seconds * 1000:>18.1f} ms")
+    print(f"{'store':>12} {store_seconds * 1000:>18.1f} ms  ({pandas_seconds / store_seconds:.0f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
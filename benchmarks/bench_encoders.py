@@ -0,0 +1,48 @@
+"""
+Speed and quality of the embedding backends on labelled synthetic pairs.
+
+Run from the repository root:
+    python -m benchmarks.bench_encoders [--pairs 2000]          # offline hashing backend
+    python -m benchmarks.bench_encoders --sbert                  # also all-MiniLM-L6-v2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import tempfile
+
+import match_model
+from benchmarks.synthetic import SyntheticCorpus
+from encoders import get_encoder
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pairs", type=int, default=2000)
+    parser.add_argument("--sbert", action="store_true", help="include the SBERT backend (needs the model)")
+    args = parser.parse_args(argv)
+
+    tmp = tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8")
+    with tmp:
+        for record in SyntheticCorpus(0).pairs(args.pairs):
+            tmp.write(json.dumps(record) + "\n")
+    backends = ["hashing", "sbert"] if args.sbert else ["hashing"]
+    try:
+        get_encoder("hashing")  # keep the one-off sklearn import out of the timing
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = match_model.evaluate_dataset("hashing", tmp.name, backends=backends)
+    finally:
+        os.remove(tmp.name)
+
+    print(f"📚 {args.pairs} synthetic pairs")
+    print(f"{'backend':>8} {'texts/s':>10} {'best F1':>8} {'threshold':>10}")
+    for backend, result in metrics["backends"].items():
+        if "error" in result:
+            print(f"{backend:>8} unavailable: {result['error']}")
+            continue
+        print(f"{backend:>8} {result['texts_per_sec']:>10.0f} {result['best_f1']:>8.3f} {result['best_threshold']:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Compare the per-pair evaluation loop with the batched evaluate_dataset.
+
+Run from the repository root:
+    python -m benchmarks.bench_evaluate            # offline stub encoder
+    python -m benchmarks.bench_evaluate --sbert    # real all-MiniLM-L6-v2
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+
+from sklearn.metrics.pairwise import cosine_similarity
+
+import match_model
+from benchmarks.stub_encoder import StubEncoder
+
+DATASET = "cleaned_resume_jd_dataset.json"
+
+
+def legacy_scores(model, data):
+    # The original loop: one encode and one cosine_similarity call per sample
+    scores = []
+    for sample in data:
+        embeddings = model.encode([sample['resume_text'], sample['job_description']])
+        scores.append(cosine_similarity([embeddings[0]], [embeddings[1]])[0][0])
+    return scores
+
+
+def synthetic_dataset(data, factor, seed=0):
+    rng = random.Random(seed)
+    resumes = [sample['resume_text'] for sample in data]
+    jds = [sample['job_description'] for sample in data]
+    return [{
+        'resume_text': f"{rng.choice(resumes)} candidate {i}",
+        'job_description': rng.choice(jds),
+        'label': rng.randint(0, 1),
+    } for i in range(len(data) * factor)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sbert", action="store_true", help="use the real SBERT model instead of the stub")
+    parser.add_argument("--factor", type=int, default=100, help="size of the synthetic dataset relative to the bundled one")
+    args = parser.parse_args()
+
+    model = match_model.get_model() if args.sbert else StubEncoder()
+
+    with open(DATASET, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        synthetic_path = os.path.join(tmp, "synthetic.json")
+        synthetic = synthetic_dataset(data, args.factor)
+        with open(synthetic_path, 'w', encoding='utf-8') as f:
+            json.dump(synthetic, f)
+
+        print(f"{'dataset':>12} {'pairs':>7} {'loop (s)':>9} {'batched (s)':>12} {'speedup':>8}")
+        for name, path, samples in [("bundled", DATASET, data), (f"{args.factor}x", synthetic_path, synthetic)]:
+            loop = timed(lambda: legacy_scores(model, samples))
+            batched = timed(lambda: match_model.evaluate_dataset(model, path))
+            print(f"{name:>12} {len(samples):>7} {loop:>9.2f} {batched:>12.2f} {loop / batched:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Check that preprocess_dataset's memory stays flat as the input grows.
+
+Each size runs the pipeline in a fresh process and reports its peak RSS.
+Run from the repository root:
+    python -m benchmarks.bench_preprocess
+    python -m benchmarks.bench_preprocess --sizes 1000 100000 10000000
+"""
+import argparse
+import csv
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+RUN = """
+import resource, sys
+import preprocess_dataset
+preprocess_dataset.main(sys.argv[1:])
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+
+def write_csv(path, column, rows, rng, vocabulary):
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([column])
+        for _ in range(rows):
+            writer.writerow([" ".join(rng.choices(vocabulary, k=60)) + f" contact{rng.randint(0, 10**6)}@mail.com"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = ["python", "java", "docker", "kubernetes", "team", "project", "experience",
+                  "developed", "sql", "machine", "learning", "résumé", "data", "analysis"]
+
+    print(f"{'rows':>10} {'seconds':>8} {'peak RSS (MB)':>14}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for rows in args.sizes:
+            resumes, jds = os.path.join(tmp, "resumes.csv"), os.path.join(tmp, "jds.csv")
+            write_csv(resumes, "Resume", rows, rng, vocabulary)
+            write_csv(jds, "Job Description", rows, rng, vocabulary)
+
+            start = time.perf_counter()
+            result = subprocess.run(
+                [sys.executable, "-c", RUN, "--resumes", resumes, "--jds", jds,
+                 "--output", os.path.join(tmp, "out.jsonl"), "--workers", str(args.workers)],
+                capture_output=True, text=True, check=True,
+            )
+            elapsed = time.perf_counter() - start
+            peak_mb = int(result.stdout.strip().splitlines()[-1]) / 1024
+            print(f"{rows:>10} {elapsed:>8.1f} {peak_mb:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
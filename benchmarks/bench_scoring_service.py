@@ -0,0 +1,61 @@
+"""
+Compare per-request encoding with the micro-batching ScoringService under
+concurrent load, using the offline stub encoder.
+
+Run from the repository root:
+    python -m benchmarks.bench_scoring_service
+"""
+import threading
+import time
+
+import numpy as np
+
+from benchmarks.stub_encoder import StubEncoder
+from scoring_service import ScoringService
+
+
+def run_clients(encode, clients, requests_per_client, texts_per_request):
+    latencies = []
+    lock = threading.Lock()
+
+    def client(worker):
+        for i in range(requests_per_client):
+            texts = [f"resume {worker} {i} {j} python docker" for j in range(texts_per_request)]
+            start = time.perf_counter()
+            encode(texts)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(w,)) for w in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main(clients=32, requests_per_client=20, texts_per_request=3):
+    # The stub spends a fixed 5 ms per encoder call, like a small transformer forward pass
+    encoder = StubEncoder(call_overhead=0.005)
+    lock = threading.Lock()
+
+    def direct(texts):
+        with lock:  # one model shared by all sessions, as in the app
+            return encoder.encode(texts)
+
+    service = ScoringService(lambda: encoder, max_batch_size=64, max_wait_ms=5)
+    total = clients * requests_per_client
+    print(f"{clients} clients x {requests_per_client} requests x {texts_per_request} texts")
+    print(f"{'mode':>10} {'seconds':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'encoder calls':>14}")
+    for name, encode in [("direct", direct), ("service", service.encode)]:
+        calls_before = encoder.calls
+        elapsed, latencies = run_clients(encode, clients, requests_per_client, texts_per_request)
+        print(f"{name:>10} {elapsed:>8.2f} {total / elapsed:>8.0f} {np.percentile(latencies, 50):>8.1f} "
+              f"{np.percentile(latencies, 95):>8.1f} {encoder.calls - calls_before:>14}")
+    print(service.stats())
+    service.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark boolean skill queries on the SkillIndex against scanning every resume
+with extract_skills per query, and check both return the same resumes.
+
+Run from the repository root:
+    python -m benchmarks.bench_skill_index [--csv UpdatedResumeDataSet.csv] [--factor 10]
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from skill_index import SkillIndex
+from skill_matcher import extract_skills
+from vector_index import read_corpus
+
+QUERIES = [
+    ("docker AND kubernetes AND NOT java", lambda s: "docker" in s and "kubernetes" in s and "java" not in s,
+     ["docker", "kubernetes", "java"]),
+    ("python AND (aws OR azure)", lambda s: "python" in s and ("aws" in s or "azure" in s), ["python", "aws", "azure"]),
+    ("sql OR excel", lambda s: "sql" in s or "excel" in s, ["sql", "excel"]),
+]
+
+
+def scan(texts, predicate, skills):
+    # What a query costs without the index: match every resume again
+    hits = []
+    for text in texts:
+        found, _ = extract_skills(text, skills)
+        hits.append(predicate(set(found)))
+    return np.array(hits)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--csv", default="UpdatedResumeDataSet.csv")
+    parser.add_argument("--factor", type=int, default=10, help="replicate the corpus this many times")
+    args = parser.parse_args(argv)
+
+    texts = [text for _, _, text in read_corpus(args.csv)] * args.factor
+    print(f"📚 {len(texts)} resumes")
+
+    start = time.perf_counter()
+    index = SkillIndex()
+    index.add(texts, list(range(len(texts))))
+    print(f"🏗️ Built index in {time.perf_counter() - start:.2f}s (one-off)")
+
+    mismatches = 0
+    print(f"{'query':>36} {'scan (ms)':>10} {'index (ms)':>11} {'speedup':>8}")
+    for query, predicate, skills in QUERIES:
+        start = time.perf_counter()
+        expected = scan(texts, predicate, skills)
+        scan_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        got = index.query(query)
+        index_ms = (time.perf_counter() - start) * 1000
+        mismatches += int((expected != got).sum())
+        print(f"{query:>36} {scan_ms:>10.1f} {index_ms:>11.3f} {scan_ms / index_ms:>7.0f}x")
+
+    if mismatches:
+        print(f"❌ {mismatches} resumes differ between the scan and the index")
+        sys.exit(1)
+    print("✅ Index and scan agree")
+
+
+if __name__ == "__main__":
+    main()
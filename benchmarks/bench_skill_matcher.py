@@ -0,0 +1,68 @@
+"""
+Benchmark the compiled SkillMatcher against the old per-skill substring scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_skill_matcher
+"""
+import random
+import time
+
+from skill_matcher import SkillMatcher, known_skills
+
+WORDS_PER_PAGE = 500
+
+
+def legacy_extract_skills(text, skill_list):
+    # The original implementation: two substring scans over the text per skill
+    text = text.lower()
+    found = [skill for skill in skill_list if skill in text]
+    missing = [skill for skill in skill_list if skill not in text]
+    return found, missing
+
+
+def synthetic_taxonomy(size, rng):
+    skills = list(known_skills)
+    while len(skills) < size:
+        n_words = rng.choice([1, 1, 2, 2, 3])
+        skills.append(" ".join("".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(3, 9)))
+                               for _ in range(n_words)))
+    return skills[:size]
+
+
+def synthetic_resume(pages, skills, rng):
+    filler = ["experience", "project", "team", "developed", "using", "worked", "with",
+              "responsible", "for", "designing", "and", "delivering", "solutions"]
+    words = []
+    for _ in range(pages * WORDS_PER_PAGE):
+        words.append(rng.choice(skills) if rng.random() < 0.05 else rng.choice(filler))
+    return " ".join(words)
+
+
+def timed(fn, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'skills':>8} {'pages':>6} {'compile (s)':>12} {'legacy (ms)':>12} {'matcher (ms)':>13} {'speedup':>8}")
+    for n_skills in [200, 1_000, 10_000, 20_000]:
+        skills = synthetic_taxonomy(n_skills, rng)
+        start = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        compile_time = time.perf_counter() - start
+
+        for pages in [1, 10, 50]:
+            text = synthetic_resume(pages, skills, rng)
+            legacy = timed(lambda: legacy_extract_skills(text, skills), repeat=1)
+            compiled = timed(lambda: matcher.match(text))
+            print(f"{n_skills:>8} {pages:>6} {compile_time:>12.2f} {legacy * 1000:>12.1f} "
+                  f"{compiled * 1000:>13.1f} {legacy / compiled:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Measure cold-start latency: time to the login page and time to the first score.
+
+Every measurement runs in a fresh interpreter so import costs are counted.
+Run from the repository root:
+    python -m benchmarks.bench_startup
+"""
+import json
+import subprocess
+import sys
+
+LOGIN_PAGE = """
+import time
+from streamlit.testing.v1 import AppTest
+start = time.perf_counter()
+at = AppTest.from_file("app.py", default_timeout=120)
+at.run()
+assert not at.exception, at.exception
+print(time.perf_counter() - start)
+"""
+
+FIRST_SKILL_SCORE = """
+import time
+start = time.perf_counter()
+from ranking import rank_resumes
+rank_resumes("Python developer with docker and kubernetes", [("resume.txt", "python and docker")])
+print(time.perf_counter() - start)
+"""
+
+FIRST_MODEL_SCORE = """
+import time
+start = time.perf_counter()
+import match_model
+if {warm_up}:
+    thread = match_model.warm_up()
+    time.sleep({login_delay})  # the recruiter is typing the job description meanwhile
+    start = time.perf_counter()
+model = match_model.get_model()
+match_model.compare_resumes("python developer", "java developer", "python role", model)
+print(time.perf_counter() - start)
+"""
+
+
+def run(code):
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    if result.returncode != 0:
+        return None, result.stderr.strip().splitlines()[-1]
+    return float(result.stdout.strip().splitlines()[-1]), None
+
+
+def main(repeat=3, login_delay=5.0):
+    cases = {
+        "time-to-login-page": LOGIN_PAGE,
+        "time-to-first-skill-score": FIRST_SKILL_SCORE,
+        "time-to-first-model-score (cold)": FIRST_MODEL_SCORE.format(warm_up=False, login_delay=0),
+        "time-to-first-model-score (warmed)": FIRST_MODEL_SCORE.format(warm_up=True, login_delay=login_delay),
+    }
+    results = {}
+    for name, code in cases.items():
+        timings = []
+        for _ in range(repeat):
+            elapsed, error = run(code)
+            if error:
+                print(f"{name:>36}: failed ({error})")
+                break
+            timings.append(elapsed)
+        else:
+            results[name] = min(timings)
+            print(f"{name:>36}: {min(timings) * 1000:8.1f} ms (best of {repeat})")
+    print(json.dumps(results))
+
+
+if __name__ == "__main__":
+    main()
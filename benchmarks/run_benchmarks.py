@@ -0,0 +1,273 @@
+"""
+Benchmark suite over seeded synthetic corpora from 10 to 100k documents, with
+JSON results and a baseline regression gate.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks                      # all cases, all sizes
+    python -m benchmarks.run_benchmarks --quick              # sizes up to 1,000
+    python -m benchmarks.run_benchmarks --save-baseline      # record the current numbers
+    python -m benchmarks.run_benchmarks --cases clean_text extract_skills --sizes 1000,10000
+
+Results go to benchmarks/results/latest.json. When a baseline exists, any case
+whose throughput drops by more than --tolerance fails the run (exit code 1).
+Model-dependent cases use the deterministic offline StubEncoder.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from benchmarks.stub_encoder import StubEncoder
+from benchmarks.synthetic import SyntheticCorpus
+
+SIZES = [10, 100, 1_000, 10_000, 100_000]
+QUICK_SIZES = [10, 100, 1_000]
+RESULTS_DIR = os.path.join("benchmarks", "results")
+DEFAULT_OUTPUT = os.path.join(RESULTS_DIR, "latest.json")
+DEFAULT_BASELINE = os.path.join(RESULTS_DIR, "baseline.json")
+# Keep repeating a case until this much time was measured (best run is reported)
+MIN_MEASURE_SECONDS = 1.0
+MAX_REPEATS = 7
+# Timings below this are too noisy to gate on
+MIN_GATED_SECONDS = 0.02
+
+
+# ------------------ Workload ------------------
+class Workload:
+    """
+    Synthetic documents for the largest requested size; smaller sizes use a prefix.
+    """
+
+    def __init__(self, corpus, size):
+        self.corpus = corpus
+        self.size = size
+        start = time.perf_counter()
+        self.records = [corpus.resume(i) for i in range(size)]
+        self.texts = [text for _, _, text in self.records]
+        self.job_desc = corpus.job_description(0)
+        self.generation_seconds = time.perf_counter() - start
+
+    def pairs(self, n):
+        return [self.corpus.pair(i, self.records[i]) for i in range(n)]
+
+
+# ------------------ Cases ------------------
+# Each case takes (workload, n), does its setup and returns the function to time.
+CASES = {}
+
+
+def case(name, max_size=None):
+    def register(fn):
+        CASES[name] = (fn, max_size)
+        return fn
+    return register
+
+
+@case("read_file_txt")
+def read_file_txt(workload, n):
+    import text_extraction
+    blobs = [text.encode("utf-8") for text in workload.texts[:n]]
+
+    def run():
+        for blob in blobs:
+            text_extraction.extract_text(blob, is_pdf=False)
+    return run
+
+
+@case("read_file_pdf", max_size=1_000)
+def read_file_pdf(workload, n):
+    import text_extraction
+    blobs = [workload.corpus.pdf(i) for i in range(n)]
+
+    def run():
+        # Measure parsing, not the content-hash cache of a previous repeat
+        text_extraction._cache.clear()
+        for blob in blobs:
+            text_extraction.extract_text(blob, is_pdf=True)
+    return run
+
+
+@case("extract_skills")
+def extract_skills_case(workload, n):
+    from skill_matcher import extract_skills, extract_skills_from_jd, known_skills
+    texts = workload.texts[:n]
+    jd_skills = extract_skills_from_jd(workload.job_desc, known_skills)
+
+    def run():
+        for text in texts:
+            extract_skills(text, jd_skills)
+    return run
+
+
+@case("clean_text")
+def clean_text_case(workload, n):
+    from clean_resume_dataset import clean_texts
+    texts = workload.texts[:n]
+    return lambda: clean_texts(texts)
+
+
+@case("embedding")
+def embedding_case(workload, n):
+    import match_model
+    texts = workload.texts[:n]
+    model = StubEncoder(call_overhead=0)
+    return lambda: match_model.encode(model, texts, batch_size=64)
+
+
+@case("evaluate_dataset")
+def evaluate_dataset_case(workload, n):
+    import match_model
+    import sklearn.metrics  # noqa: F401 -- keep the one-off import out of the first timing
+    tmp = tempfile.NamedTemporaryFile("w", suffix=".jsonl", delete=False, encoding="utf-8")
+    with tmp:
+        for record in workload.pairs(n):
+            tmp.write(json.dumps(record) + "\n")
+    model = StubEncoder(call_overhead=0)
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):
+            match_model.evaluate_dataset(model, tmp.name)
+    run.cleanup = lambda: os.remove(tmp.name)
+    return run
+
+
+@case("rank_end_to_end")
+def rank_end_to_end(workload, n):
+    from ranking import rank_resumes
+    resumes = [(f"resume_{i}.txt", text) for i, text in enumerate(workload.texts[:n])]
+    model = StubEncoder(call_overhead=0)
+    return lambda: rank_resumes(workload.job_desc, resumes, k=10, model=model)
+
+
+# ------------------ Measurement ------------------
+def measure(run):
+    timings = []
+    while len(timings) < MAX_REPEATS and (not timings or sum(timings) < MIN_MEASURE_SECONDS):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings), len(timings)
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit or None,
+    }
+
+
+def run_suite(names, sizes, seed=0):
+    corpus = SyntheticCorpus(seed)
+    largest = max(min(size, CASES[name][1] or size) for name in names for size in sizes)
+    workload = Workload(corpus, largest)
+    print(f"🧪 Generated {largest} synthetic resumes in {workload.generation_seconds:.1f}s (seed {seed})")
+
+    results = []
+    print(f"{'case':>18} {'docs':>8} {'seconds':>10} {'docs/s':>12} {'runs':>5}")
+    for name in names:
+        fn, max_size = CASES[name]
+        for n in sizes:
+            if max_size is not None and n > max_size:
+                continue
+            run = fn(workload, n)
+            try:
+                seconds, repeats = measure(run)
+            finally:
+                getattr(run, "cleanup", lambda: None)()
+            results.append({"case": name, "size": n, "seconds": seconds,
+                            "docs_per_sec": n / seconds if seconds else float("inf"), "repeats": repeats})
+            print(f"{name:>18} {n:>8} {seconds:>10.4f} {n / seconds:>12.0f} {repeats:>5}")
+    return results
+
+
+# ------------------ Baseline ------------------
+def compare(results, baseline, tolerance):
+    """
+    Return the results whose throughput fell more than tolerance below the baseline.
+    """
+    previous = {(r["case"], r["size"]): r for r in baseline["results"]}
+    regressions = []
+    print(f"\n{'case':>18} {'docs':>8} {'baseline/s':>12} {'now/s':>12} {'change':>8}")
+    for result in results:
+        before = previous.get((result["case"], result["size"]))
+        if before is None:
+            continue
+        change = result["docs_per_sec"] / before["docs_per_sec"] - 1
+        gated = max(result["seconds"], before["seconds"]) >= MIN_GATED_SECONDS
+        regressed = gated and change < -tolerance
+        flag = "❌" if regressed else ("  " if gated else " ~")
+        print(f"{result['case']:>18} {result['size']:>8} {before['docs_per_sec']:>12.0f} "
+              f"{result['docs_per_sec']:>12.0f} {change * 100:>+7.1f}% {flag}")
+        if regressed:
+            regressions.append((result, before, change))
+    return regressions
+
+
+def write_json(path, payload):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite and compare against a baseline.")
+    parser.add_argument("--cases", nargs="+", choices=sorted(CASES), default=list(CASES))
+    parser.add_argument("--sizes", default=None, help="comma-separated document counts (default: 10 to 100k)")
+    parser.add_argument("--quick", action="store_true", help="only sizes up to 1,000")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=0.3,
+                        help="allowed throughput drop against the baseline (0.3 = 30%%)")
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",")] if args.sizes else (QUICK_SIZES if args.quick else SIZES)
+    results = run_suite(args.cases, sizes, args.seed)
+    payload = {"created": time.strftime("%Y-%m-%dT%H:%M:%S"), "seed": args.seed,
+               "environment": environment(), "results": results}
+    write_json(args.output, payload)
+    print(f"\n💾 Results written to {args.output}")
+
+    if args.save_baseline:
+        shutil.copyfile(args.output, args.baseline)
+        print(f"📌 Saved as baseline: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"ℹ️ No baseline at {args.baseline}; run with --save-baseline to record one.")
+        return
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("environment", {}).get("platform") != payload["environment"]["platform"]:
+        print("⚠️ Baseline was recorded on a different platform; comparisons may be noisy.")
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} performance regression(s) beyond {args.tolerance:.0%}:")
+        for result, before, change in regressions:
+            print(f"   {result['case']} @ {result['size']}: {before['docs_per_sec']:.0f} -> "
+                  f"{result['docs_per_sec']:.0f} docs/s ({change * 100:+.1f}%)")
+        sys.exit(1)
+    print("\n✅ No regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
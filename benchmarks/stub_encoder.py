@@ -0,0 +1,38 @@
+"""
+Deterministic, offline stand-in for the SBERT model used by the benchmarks.
+"""
+import math
+import time
+import zlib
+
+import numpy as np
+
+
+class StubEncoder:
+    """
+    Hashes tokens into a fixed-size bag-of-words vector. call_overhead seconds are
+    spent per encoder batch to mimic the fixed cost of a transformer forward pass.
+    With max_seq_length set, only the first that many words of a text are read,
+    like the real model truncating its input.
+    """
+
+    def __init__(self, dim=384, call_overhead=0.005, max_seq_length=None):
+        self.dim = dim
+        self.call_overhead = call_overhead
+        self.max_seq_length = max_seq_length
+        self.calls = 0
+        self.texts = 0
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        texts = list(texts)
+        self.calls += 1
+        self.texts += len(texts)
+        if self.call_overhead:
+            time.sleep(self.call_overhead * max(1, math.ceil(len(texts) / batch_size)))
+
+        emb = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            for token in text.lower().split()[:self.max_seq_length]:
+                h = zlib.crc32(token.encode("utf-8"))
+                emb[i, h % self.dim] += 1.0 if h & 0x80000000 else -1.0
+        return emb
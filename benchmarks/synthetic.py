@@ -0,0 +1,137 @@
+"""
+Seeded synthetic resumes and job descriptions for the benchmarks.
+
+Skills come from known_skills and filler words from the UpdatedResumeDataSet.csv
+vocabulary (word frequencies are kept, so texts have a realistic Zipf mix). The
+same seed always produces the same corpus.
+"""
+import csv
+import itertools
+import os
+import random
+import re
+import sys
+import textwrap
+from collections import Counter
+
+from skill_matcher import known_skills
+
+DEFAULT_CSV = "UpdatedResumeDataSet.csv"
+VOCABULARY_SIZE = 5_000
+FALLBACK_CATEGORIES = ["Data Science", "Java Developer", "Testing", "DevOps Engineer", "HR", "Web Designing"]
+
+_WORD = re.compile(r"[a-z]{3,}")
+
+
+def load_vocabulary(csv_path=DEFAULT_CSV, size=VOCABULARY_SIZE):
+    """
+    Return (words, weights, categories) from the resume CSV, or a vocabulary built
+    from the skill list when the CSV is not available.
+    """
+    if not os.path.exists(csv_path):
+        words = sorted({word for skill in known_skills for word in _WORD.findall(skill)})
+        return words, [1] * len(words), FALLBACK_CATEGORIES
+
+    csv.field_size_limit(sys.maxsize)
+    counts, categories = Counter(), set()
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            counts.update(_WORD.findall((row.get("Resume") or "").lower()))
+            if row.get("Category"):
+                categories.add(row["Category"])
+    words, weights = zip(*counts.most_common(size))
+    return list(words), list(weights), sorted(categories) or FALLBACK_CATEGORIES
+
+
+class SyntheticCorpus:
+    """
+    Generator of resumes, job descriptions, labelled pairs and PDF files.
+    """
+
+    def __init__(self, seed=0, csv_path=DEFAULT_CSV):
+        self.seed = seed
+        self.words, self.weights, self.categories = load_vocabulary(csv_path)
+        self._cum_weights = list(itertools.accumulate(self.weights))
+
+    def _rng(self, kind, i):
+        return random.Random(f"{self.seed}:{kind}:{i}")
+
+    def _filler(self, rng, n):
+        return " ".join(rng.choices(self.words, cum_weights=self._cum_weights, k=n))
+
+    def resume(self, i, min_words=150, max_words=450):
+        """
+        Resume number i as (category, skills, text).
+        """
+        rng = self._rng("resume", i)
+        category = rng.choice(self.categories)
+        skills = rng.sample(known_skills, rng.randint(3, 15))
+        n_words = rng.randint(min_words, max_words)
+        sentences = [f"Candidate {i} - {category}.", f"Skills: {', '.join(skills)}."]
+        written = 0
+        while written < n_words:
+            length = rng.randint(6, 18)
+            sentences.append(f"{self._filler(rng, length).capitalize()} using {rng.choice(skills)}.")
+            written += length + 2
+        if rng.random() < 0.5:
+            sentences.append(f"Contact: candidate{i}@example.com {rng.randrange(10**9, 10**10)}")
+        return category, skills, " ".join(sentences)
+
+    def resumes(self, n):
+        return [self.resume(i)[2] for i in range(n)]
+
+    def job_description(self, i=0, skills=None):
+        rng = self._rng("jd", i)
+        skills = skills or rng.sample(known_skills, rng.randint(4, 10))
+        return (f"We are hiring a {rng.choice(self.categories)} professional. "
+                f"Required skills: {', '.join(skills)}. {self._filler(rng, 60).capitalize()}.")
+
+    def pair(self, i, resume=None):
+        """
+        Labelled {'resume_text', 'job_description', 'label'} pair number i: positives
+        get a JD written from the resume's own skills, negatives a random JD. Pass the
+        already generated resume(i) to skip generating it again.
+        """
+        _, skills, text = resume or self.resume(i)
+        label = self._rng("label", i).random() < 0.5
+        jd = self.job_description(i, skills[:6] if label else None)
+        return {"resume_text": text, "job_description": jd, "label": int(label)}
+
+    def pairs(self, n):
+        return [self.pair(i) for i in range(n)]
+
+    def pdf(self, i):
+        return pdf_bytes(self.resume(i)[2])
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def pdf_bytes(text, lines_per_page=60, width=95):
+    """
+    Minimal text-only PDF (Helvetica, one content stream per page).
+    """
+    lines = textwrap.wrap(text, width) or [""]
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)]
+
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    kids = []
+    for page in pages:
+        stream = "BT /F1 10 Tf 12 TL 40 800 Td " + " ".join(f"({_pdf_escape(line)}) Tj T*" for line in page) + " ET"
+        objects.append(f"<< /Length {len(stream.encode('latin-1', 'replace'))} >>\nstream\n{stream}\nendstream")
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+                       f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>")
+        kids.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1", "replace")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    return bytes(out)
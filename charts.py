@@ -0,0 +1,108 @@
+"""
+Result charts for the Streamlit pages.
+
+Charts are rendered once per distinct result data and cached as PNG bytes, so
+reruns and page navigation only re-send an image. Figures are built with the
+pyplot-free matplotlib.figure.Figure API and cleared as soon as they are saved,
+so nothing accumulates in pyplot's global figure registry.
+"""
+import io
+from functools import lru_cache
+
+import streamlit as st
+
+import tracing
+
+# Above this many candidates the bar chart is drawn client-side with Vega-Lite
+NATIVE_CHART_THRESHOLD = 15
+MAX_CACHED_CHARTS = 256
+
+MATCHED_COLOR = "#4CAF50"
+MISSING_COLOR = "#FF6F61"
+
+
+def _figure(**kwargs):
+    from matplotlib.figure import Figure
+    return Figure(**kwargs)
+
+
+def _to_png(fig):
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format="png", bbox_inches="tight")
+        return buf.getvalue()
+    finally:
+        fig.clear()
+
+
+@lru_cache(maxsize=MAX_CACHED_CHARTS)
+def render_bar_chart(names, scores):
+    """
+    PNG bar chart of match scores; names and scores are tuples so the call is cacheable.
+    """
+    with tracing.stage("chart_rendering"):
+        fig = _figure(figsize=(max(6, len(names) * 0.6), 4))
+        ax = fig.subplots()
+        ax.bar(list(names), [score * 100 for score in scores], color=MATCHED_COLOR)
+        ax.set_xlabel("Resume")
+        ax.set_ylabel("Match Score")
+        ax.set_title("Resume Match Comparison")
+        ax.tick_params(axis="x", labelrotation=45 if len(names) > 4 else 0)
+        for container in ax.containers:
+            ax.bar_label(container, fmt='%.1f%%')
+        return _to_png(fig)
+
+
+@lru_cache(maxsize=MAX_CACHED_CHARTS)
+def render_pie_chart(n_matched, n_missing, title):
+    with tracing.stage("chart_rendering"):
+        fig = _figure()
+        ax = fig.subplots()
+        ax.pie(
+            [n_matched, n_missing],
+            labels=[f'Matched ({n_matched})', f'Missing ({n_missing})'],
+            colors=[MATCHED_COLOR, MISSING_COLOR],
+            autopct='%1.1f%%',
+            startangle=90,
+            textprops={'fontsize': 10}
+        )
+        ax.axis('equal')
+        ax.set_title(f"{title} Skill Match")
+        return _to_png(fig)
+
+
+def bar_chart_spec(names, scores):
+    """
+    Vega-Lite spec for a ranked list; the browser draws it, the server renders nothing.
+    """
+    return {
+        "data": {"values": [{"Resume": name, "Match Score": round(score * 100, 1)} for name, score in zip(names, scores)]},
+        "mark": {"type": "bar", "color": MATCHED_COLOR},
+        "encoding": {
+            "y": {"field": "Resume", "type": "nominal", "sort": "-x"},
+            "x": {"field": "Match Score", "type": "quantitative", "scale": {"domain": [0, 100]}},
+            "tooltip": [{"field": "Resume"}, {"field": "Match Score"}],
+        },
+        "title": "Resume Match Comparison",
+        "width": "container",
+    }
+
+
+# ------------------ Streamlit ------------------
+def plot_bar_comparison(names, scores):
+    if len(names) > NATIVE_CHART_THRESHOLD:
+        st.vega_lite_chart(bar_chart_spec(names, scores))
+    else:
+        st.image(render_bar_chart(tuple(names), tuple(scores)))
+
+
+def plot_pie_chart(matched, missing, title):
+    total = len(matched) + len(missing)
+    if total == 0:
+        st.write("No skills available to show chart.")
+        return
+
+    st.markdown(f"**Matched Skills ({len(matched)}):** {', '.join(matched) or 'None'}")
+    st.markdown(f"**Missing Skills ({len(missing)}):** {', '.join(missing) or 'None'}")
+
+    st.image(render_pie_chart(len(matched), len(missing), title))
@@ -0,0 +1,154 @@
+"""
+Chunked encoding of long documents.
+
+all-MiniLM-L6-v2 only reads the first 256 tokens of a text. encode_chunked() splits
+every document into overlapping token windows, packs the windows of many
+documents into full encoder batches and pools the window embeddings back into
+one vector per document. At most chunk_budget windows are held in memory at once.
+"""
+import re
+
+import numpy as np
+
+import tracing
+
+POOLINGS = ("mean", "max", "top_n")
+DEFAULT_WINDOW = 256
+DEFAULT_OVERLAP = 32
+DEFAULT_CHUNK_BUDGET = 4096
+
+_WORD = re.compile(r"\S+")
+
+
+def _normalize(vectors):
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+def window_size(model, window=None):
+    """
+    Tokens per window: the model's max_seq_length minus [CLS]/[SEP] unless given.
+    """
+    if window:
+        return window
+    max_length = getattr(model, "max_seq_length", None) or DEFAULT_WINDOW
+    return max(8, max_length - 2)
+
+
+def token_spans(text, tokenizer=None):
+    """
+    (start, end) character offsets of the tokens of text: the model's subword
+    tokens when a fast tokenizer is available, else whitespace-separated words.
+    """
+    if tokenizer is not None:
+        try:
+            encoding = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)
+            return [tuple(span) for span in encoding["offset_mapping"]]
+        except (TypeError, NotImplementedError, KeyError):
+            pass  # slow tokenizers have no offsets; fall back to words
+    return [m.span() for m in _WORD.finditer(text)]
+
+
+def chunk_text(text, window=DEFAULT_WINDOW - 2, overlap=DEFAULT_OVERLAP, tokenizer=None):
+    """
+    Split text into windows of `window` tokens, each sharing `overlap` tokens with
+    the previous one. Short texts come back as a single chunk.
+    """
+    spans = token_spans(text, tokenizer)
+    if len(spans) <= window:
+        return [text]
+    step = max(1, window - overlap)
+    chunks = []
+    for start in range(0, len(spans), step):
+        stop = min(start + window, len(spans))
+        chunks.append(text[spans[start][0]:spans[stop - 1][1]])
+        if stop == len(spans):
+            break
+    return chunks
+
+
+class _Pool:
+    """
+    Running pooled state of one document, so its chunks can arrive in several flushes.
+    """
+    __slots__ = ("pooling", "top_n", "query", "total", "count", "best")
+
+    def __init__(self, pooling, top_n, query):
+        self.pooling = pooling
+        self.top_n = top_n
+        self.query = query
+        self.total = None
+        self.count = 0
+        self.best = []  # (similarity, vector) of the top_n chunks so far
+
+    def add(self, vectors):
+        vectors = _normalize(vectors)
+        if self.pooling == "mean":
+            self.total = vectors.sum(axis=0) if self.total is None else self.total + vectors.sum(axis=0)
+            self.count += len(vectors)
+        elif self.pooling == "max":
+            block = vectors.max(axis=0)
+            self.total = block if self.total is None else np.maximum(self.total, block)
+        else:
+            self.best.extend(zip((vectors @ self.query).tolist(), vectors))
+            self.best.sort(key=lambda item: -item[0])
+            del self.best[self.top_n:]
+
+    def result(self):
+        if self.pooling == "top_n":
+            return np.mean([vector for _, vector in self.best], axis=0)
+        return self.total / max(self.count, 1) if self.pooling == "mean" else self.total
+
+
+def encode_chunked(model, texts, pooling="mean", window=None, overlap=DEFAULT_OVERLAP, top_n=3,
+                   query=None, batch_size=64, chunk_budget=DEFAULT_CHUNK_BUDGET, cache=None):
+    """
+    One unit vector per text, pooled from the embeddings of its overlapping windows.
+
+    pooling is "mean", "max" or "top_n"; top_n averages the n windows closest to
+    query (one vector for all texts, or one row per text). Windows of consecutive
+    documents share encoder batches; every chunk_budget windows are encoded and
+    pooled before more are cut, so memory does not grow with document length.
+    """
+    if pooling not in POOLINGS:
+        raise ValueError(f"Unknown pooling {pooling!r}; choose one of {', '.join(POOLINGS)}")
+    texts = list(texts)
+    if pooling == "top_n":
+        if query is None:
+            raise ValueError("top_n pooling needs a query vector")
+        query = _normalize(np.asarray(query, dtype=np.float32))
+        queries = np.broadcast_to(query, (len(texts), query.shape[-1])) if query.ndim == 1 else query
+
+    window = window_size(model, window)
+    tokenizer = getattr(model, "tokenizer", None)
+    pools = [_Pool(pooling, top_n, queries[i] if pooling == "top_n" else None) for i in range(len(texts))]
+    pending_chunks, pending_owners = [], []
+
+    def flush():
+        # Identical windows (boilerplate, repeated documents) are encoded once
+        unique = {}
+        rows = [unique.setdefault(chunk, len(unique)) for chunk in pending_chunks]
+        with tracing.stage("model_encoding"):
+            if cache is None:
+                vectors = np.asarray(model.encode(list(unique), batch_size=batch_size), dtype=np.float32)
+            else:
+                vectors = cache.encode(model, list(unique), batch_size=batch_size)
+        vectors = vectors[rows]
+        owners = np.array(pending_owners)
+        bounds = np.flatnonzero(np.diff(owners)) + 1
+        for start, stop in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(owners)]])):
+            pools[owners[start]].add(vectors[start:stop])
+        pending_chunks.clear()
+        pending_owners.clear()
+
+    for i, text in enumerate(texts):
+        for chunk in chunk_text(text, window, overlap, tokenizer):
+            pending_chunks.append(chunk)
+            pending_owners.append(i)
+            if len(pending_chunks) >= chunk_budget:
+                flush()
+    if pending_chunks:
+        flush()
+
+    if not pools:
+        return np.empty((0, 0), dtype=np.float32)
+    return _normalize(np.stack([pool.result() for pool in pools]).astype(np.float32))
@@ -1,37 +1,73 @@
+import codecs
 import json
 import re
 
+# Compiled once at import. The text is pure ASCII by the time these run, so the
+# phone pattern can use the faster ASCII-only \b and \d.
+EMAIL_PATTERN = re.compile(r'\S+@\S+')
+PHONE_PATTERN = re.compile(r'\b\d{10,15}\b', re.ASCII)
+
+# Encoding to ASCII with this handler turns every run of non-ASCII characters into
+# one space in a single C-level pass.
+codecs.register_error('clean_text_space', lambda error: (' ', error.end))
+
+
 def clean_text(text):
-    # Replace line breaks with space
-    text = text.replace('\r\n', ' ').replace('\n', ' ').replace('\r', ' ')
-    
-    # Remove non-ASCII characters (weird unicode)
-    text = re.sub(r'[^\x00-\x7F]+', ' ', text)
-    
+    # Replace runs of non-ASCII characters (weird unicode) with a space
+    if not text.isascii():
+        text = text.encode('ascii', 'clean_text_space').decode('ascii')
+
     # Remove emails
-    text = re.sub(r'\S+@\S+', '', text)
-    
+    if '@' in text:
+        text = EMAIL_PATTERN.sub('', text)
+
     # Remove phone numbers (simple pattern)
-    text = re.sub(r'\b\d{10,15}\b', '', text)
-    
-    # Remove multiple spaces
-    text = re.sub(r'\s+', ' ', text)
-    
-    # Strip leading and trailing spaces
-    return text.strip()
+    text = PHONE_PATTERN.sub('', text)
+
+    # Collapse line breaks and repeated whitespace, strip the ends
+    return ' '.join(text.split())
+
+
+def clean_texts(texts):
+    """
+    Batch version of clean_text.
+
+    A pandas Series is mapped element-wise (missing values stay missing); a pyarrow
+    Array or ChunkedArray is cleaned with vectorized Arrow regex kernels; any other
+    iterable returns a list.
+    """
+    module = type(texts).__module__
+    if module.startswith('pandas'):
+        return texts.map(clean_text, na_action='ignore')
+    if module.startswith('pyarrow'):
+        return _clean_arrow(texts)
+    return [clean_text(text) for text in texts]
+
+
+def _clean_arrow(array):
+    import pyarrow.compute as pc
 
-# Load your JSON file
-with open('small_resume_jd_dataset.json', 'r', encoding='utf-8') as file:
-    data = json.load(file)
+    # RE2's \s is narrower than Python's, so spell out Python's ASCII whitespace
+    space = r'[\t\n\x0b\x0c\r \x1c-\x1f]'
+    non_space = r'[^\t\n\x0b\x0c\r \x1c-\x1f]'
+    array = pc.replace_substring_regex(array, r'[^\x00-\x7F]+', ' ')
+    array = pc.replace_substring_regex(array, rf'{non_space}+@{non_space}+', '')
+    array = pc.replace_substring_regex(array, r'\b[0-9]{10,15}\b', '')
+    array = pc.replace_substring_regex(array, rf'{space}+', ' ')
+    return pc.utf8_trim(array, characters=' ')
 
-# Clean resume_text and job_description fields
-for item in data:
-    item['resume_text'] = clean_text(item['resume_text'])
-    item['job_description'] = clean_text(item['job_description'])
+if __name__ == "__main__":
+    # Load your JSON file
+    with open('small_resume_jd_dataset.json', 'r', encoding='utf-8') as file:
+        data = json.load(file)
 
-# Save cleaned data to a new JSON file
-with open('cleaned_resume_jd_dataset.json', 'w', encoding='utf-8') as file:
-    json.dump(data, file, indent=2, ensure_ascii=False)
+    # Clean resume_text and job_description fields
+    for item in data:
+        item['resume_text'] = clean_text(item['resume_text'])
+        item['job_description'] = clean_text(item['job_description'])
 
-print("Cleaning done! Saved as cleaned_resume_jd_dataset.json")
+    # Save cleaned data to a new JSON file
+    with open('cleaned_resume_jd_dataset.json', 'w', encoding='utf-8') as file:
+        json.dump(data, file, indent=2, ensure_ascii=False)
 
+    print("Cleaning done! Saved as cleaned_resume_jd_dataset.json")
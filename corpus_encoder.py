@@ -0,0 +1,220 @@
+"""
+Multi-core, restartable encoding of a whole resume corpus.    python corpus_encoder.py --csv UpdatedResumeDataSet.csv --output resume_vectors --workers 4
+    python corpus_encoder.py --csv resumes.corpus --output resume_vectors --encoder hashing
+
+The corpus is cut into fixed shards of --shard-size rows. Worker processes each
+load their own encoder once and encode whole shards, with each shard's texts
+sorted by length so a batch holds similarly long texts and little padding.
+Every finished shard is written atomically to <output>/shard_NNNNN.npy. Running the
+same command again skips the shards already on disk, so an interrupted job resumes
+where it stopped. load_vectors() returns the vectors of all shards in corpus order.
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+DEFAULT_OUTPUT_DIR = "resume_vectors"
+SHARD_SIZE = 1024
+BATCH_SIZE = 64
+# Tokens the SBERT model reads per text; longer texts are truncated
+MAX_TOKENS = 256
+
+# ------------------ Worker ------------------
+_encoder = None
+
+
+def _init_worker(backend, threads):
+    global _encoder
+    if backend == "sbert":
+        # One process per core: keep torch from also spreading each process over every core
+        import torch
+        torch.set_num_threads(threads)
+    from encoders import get_encoder
+    _encoder = get_encoder(backend)
+
+
+def padding_efficiency(lengths, batch_size=BATCH_SIZE):
+    """
+    Share of the padded batch tokens that are real tokens, for texts in the given order.
+    """
+    lengths = np.minimum(np.asarray(lengths), MAX_TOKENS)
+    padded = sum(len(batch) * batch.max(initial=0) for batch in np.array_split(lengths, max(1, -(-len(lengths) // batch_size))))
+    return float(lengths.sum() / padded) if padded else 1.0
+
+
+def encode_shard(shard, texts, path, batch_size=BATCH_SIZE):
+    """
+    Encode one shard longest text first, restore corpus order and write the vectors
+    atomically. Returns (shard, documents, encode seconds, padding efficiency unsorted, sorted).
+    """
+    lengths = np.array([len(text.split()) for text in texts])
+    order = np.argsort(-lengths, kind="stable")
+    start = time.perf_counter()
+    vectors = np.empty((len(texts), 0), dtype=np.float32)
+    for begin in range(0, len(texts), batch_size):
+        rows = order[begin:begin + batch_size]
+        batch = np.asarray(_encoder.encode([texts[i] for i in rows], batch_size=batch_size), dtype=np.float32)
+        if vectors.shape[1] == 0:
+            vectors = np.empty((len(texts), batch.shape[1]), dtype=np.float32)
+        vectors[rows] = batch
+    seconds = time.perf_counter() - start
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        np.save(f, vectors)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return shard, len(texts), seconds, padding_efficiency(lengths, batch_size), padding_efficiency(lengths[order], batch_size)
+
+
+# ------------------ Job ------------------
+def shard_path(output_dir, shard):
+    return os.path.join(output_dir, f"shard_{shard:05d}.npy")
+
+
+def encode_corpus(csv_path, output_dir=DEFAULT_OUTPUT_DIR, backend="sbert", workers=None,
+                  shard_size=SHARD_SIZE, batch_size=BATCH_SIZE, text_column="Resume"):
+    """
+    Encode every resume of a CSV into shards under output_dir, skipping shards that a
+    previous run of the same job already finished. Returns a throughput report.
+    """
+    from corpus_store import CorpusStore, is_store, _file_sha256
+    from encoders import encoder_name
+    from vector_index import read_corpus, _write_json_atomic
+
+    # The store stays open until every shard has been read from it
+    with contextlib.ExitStack() as stack:
+        if is_store(csv_path):
+            # Only the shard being submitted is read from the memory-mapped store
+            store = stack.enter_context(CorpusStore(csv_path))
+            field = text_column if text_column in store.fields else store.fields[0]
+            ids = [str(doc_id) for doc_id in store.ids.tolist()]
+            digest = store.manifest["source_sha256"]
+            shard_texts = lambda shard: store.texts(field, shard * shard_size, (shard + 1) * shard_size)
+        else:
+            rows = list(read_corpus(csv_path, text_column))
+            ids = [doc_id for doc_id, _, _ in rows]
+            digest = _file_sha256(csv_path)
+            shard_texts = lambda shard: [text for _, _, text in rows[shard * shard_size:(shard + 1) * shard_size]]
+        manifest = {
+            "csv_sha256": digest,
+            # The model id, not the backend name: vectors of another SBERT checkpoint must not be mixed in
+            "encoder": encoder_name(backend),
+            "text_column": text_column,
+            "shard_size": shard_size,
+            "documents": len(ids),
+            "ids": ids,
+        }
+        os.makedirs(output_dir, exist_ok=True)
+        manifest_path = os.path.join(output_dir, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path, encoding="utf-8") as f:
+                if json.load(f) != manifest:
+                    sys.exit(f"❌ {output_dir} holds vectors of another corpus, encoder or shard size; "
+                             f"choose a new --output or delete it.")
+        else:
+            _write_json_atomic(manifest_path, manifest)
+
+        n_shards = -(-len(ids) // shard_size)
+        todo = [shard for shard in range(n_shards) if not os.path.exists(shard_path(output_dir, shard))]
+        if len(todo) < n_shards:
+            print(f"↩️ Resuming: {n_shards - len(todo)} of {n_shards} shards already encoded")
+
+        workers = max(1, min(workers or os.cpu_count() or 1, len(todo) or 1))
+        threads = max(1, (os.cpu_count() or 1) // workers)
+        documents = encode_seconds = 0
+        efficiency = []
+        start = time.perf_counter()
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_worker, initargs=(backend, threads)) as pool:
+            # A bounded number of shards in flight keeps the parent's memory flat
+            pending = set()
+            queue = iter(todo)
+
+            def submit(shard):
+                pending.add(pool.submit(encode_shard, shard, shard_texts(shard), shard_path(output_dir, shard), batch_size))
+
+            for shard in queue:
+                submit(shard)
+                if len(pending) >= workers * 2:
+                    break
+            while pending:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    _, n, seconds, unsorted, by_length = future.result()
+                    documents += n
+                    encode_seconds += seconds
+                    efficiency.append((n, unsorted, by_length))
+                    next_shard = next(queue, None)
+                    if next_shard is not None:
+                        submit(next_shard)
+                print(f"\r🧮 {n_shards - len(todo) + len(efficiency)}/{n_shards} shards, {documents} resumes "
+                      f"({documents / (time.perf_counter() - start):.1f}/s)", end="", flush=True)
+        if todo:
+            print()
+
+    elapsed = time.perf_counter() - start
+    weights = np.array([n for n, _, _ in efficiency], dtype=np.float64)
+    return {
+        "documents": documents,
+        "shards": len(todo),
+        "workers": workers,
+        "seconds": elapsed,
+        "docs_per_sec": documents / elapsed if documents else 0.0,
+        "docs_per_sec_per_core": documents / elapsed / workers if documents else 0.0,
+        "encode_docs_per_sec_per_worker": documents / encode_seconds if encode_seconds else 0.0,
+        "padding_efficiency_unsorted": float(np.average([e for _, e, _ in efficiency], weights=weights)) if efficiency else None,
+        "padding_efficiency_sorted": float(np.average([e for _, _, e in efficiency], weights=weights)) if efficiency else None,
+    }
+
+
+def load_vectors(output_dir=DEFAULT_OUTPUT_DIR):
+    """
+    (ids, vectors) of a finished job, in corpus order.
+    """
+    with open(os.path.join(output_dir, "manifest.json"), encoding="utf-8") as f:
+        manifest = json.load(f)
+    n_shards = -(-manifest["documents"] // manifest["shard_size"])
+    missing = [shard for shard in range(n_shards) if not os.path.exists(shard_path(output_dir, shard))]
+    if missing:
+        raise FileNotFoundError(f"{len(missing)} of {n_shards} shards are not encoded yet; rerun the job")
+    vectors = np.concatenate([np.load(shard_path(output_dir, shard), mmap_mode="r") for shard in range(n_shards)])
+    return manifest["ids"], vectors
+
+
+def main(argv=None):
+    from encoders import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Encode a resume corpus on all cores, resumably.")
+    parser.add_argument("--csv", default="UpdatedResumeDataSet.csv", help="resume CSV or corpus store")
+    parser.add_argument("--text-column", default="Resume")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument("--encoder", choices=BACKENDS, default="sbert")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes, each with its own encoder (default: all cores)")
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE, help="resumes per shard file")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    args = parser.parse_args(argv)
+
+    report = encode_corpus(args.csv, args.output, args.encoder, args.workers, args.shard_size, args.batch_size,
+                           args.text_column)
+    if not report["shards"]:
+        print(f"✅ All shards of {args.output} are already encoded")
+        return
+    print(f"✅ Encoded {report['documents']} resumes in {report['shards']} shards in {report['seconds']:.1f}s "
+          f"with {report['workers']} worker(s): {report['docs_per_sec']:.1f} docs/s, "
+          f"{report['docs_per_sec_per_core']:.1f} docs/s per core "
+          f"({report['encode_docs_per_sec_per_worker']:.1f} docs/s per worker excluding start-up)")
+    print(f"📏 Padding efficiency: {report['padding_efficiency_unsorted']:.0%} in corpus order, "
+          f"{report['padding_efficiency_sorted']:.0%} sorted by length")
+
+
+if __name__ == "__main__":
+    main()
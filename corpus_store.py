@@ -0,0 +1,296 @@
+"""
+Memory-mapped resume corpus store.
+
+    python corpus_store.py convert UpdatedResumeDataSet.csv resumes.corpus
+    python corpus_store.py convert cleaned_resume_jd_dataset.json pairs.corpus
+    python corpus_store.py show resumes.corpus 17
+
+A store is a directory:
+
+    manifest.json             row count, text fields, category names, source hash
+    <field>.bin               the UTF-8 texts of one field, packed back to back
+    <field>.offsets.npy       int64, count + 1 byte offsets into <field>.bin
+    ids.npy                   int64 source row of every record
+    categories.npy            int32 code into manifest["categories"] (-1: none), optional
+    labels.npy                int8 label (-1: none), optional
+
+Opening a store maps the files instead of reading them, so it takes the same time
+for any corpus size, and row i costs two offset lookups and one slice of the blob.
+Records read like the rows of the JSON datasets ({"resume_text": ..., "label": ...}).
+"""
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import sys
+from array import array
+
+import numpy as np
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+# Text fields of the JSON pair datasets
+PAIR_FIELDS = ("resume_text", "job_description")
+
+
+def is_store(path):
+    return os.path.isfile(os.path.join(path, MANIFEST))
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class CorpusStore:
+    """
+    Read-only view of a store. store[i] is a record dict, store[a:b] a list of them;
+    text() and raw() read a single field without building a record.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, MANIFEST), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.fields = self.manifest["fields"]
+        self.category_names = self.manifest["categories"]
+        self._blobs, self._offsets = {}, {}
+        for field in self.fields:
+            with open(os.path.join(path, f"{field}.bin"), "rb") as f:
+                # A zero-length file cannot be mapped
+                size = os.fstat(f.fileno()).st_size
+                self._blobs[field] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            self._offsets[field] = np.load(os.path.join(path, f"{field}.offsets.npy"), mmap_mode="r")
+        self.ids = np.load(os.path.join(path, "ids.npy"), mmap_mode="r")
+        self._categories = self._optional("categories.npy")
+        self.labels = self._optional("labels.npy")
+
+    def _optional(self, name):
+        path = os.path.join(self.path, name)
+        return np.load(path, mmap_mode="r") if os.path.exists(path) else None
+
+    def __len__(self):
+        return self.manifest["count"]
+
+    def raw(self, i, field=None):
+        """
+        Zero-copy memoryview of the UTF-8 bytes of one field of row i. A view that
+        is still alive at close() keeps its mapping open until the view is released.
+        """
+        field = field or self.fields[0]
+        offsets = self._offsets[field]
+        return memoryview(self._blobs[field])[int(offsets[i]):int(offsets[i + 1])]
+
+    def text(self, i, field=None):
+        return str(self.raw(i, field), "utf-8")
+
+    def texts(self, field=None, start=0, stop=None):
+        """
+        Texts of one field for rows [start, stop), decoded from one contiguous slice.
+        """
+        field = field or self.fields[0]
+        stop = len(self) if stop is None else min(stop, len(self))
+        if stop <= start:
+            return []
+        offsets = self._offsets[field][start:stop + 1].tolist()
+        blob = self._blobs[field][offsets[0]:offsets[-1]]
+        base = offsets[0]
+        return [blob[a - base:b - base].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+    def category(self, i):
+        if self._categories is None or self._categories[i] < 0:
+            return None
+        return self.category_names[self._categories[i]]
+
+    def label(self, i):
+        if self.labels is None or self.labels[i] < 0:
+            return None
+        return int(self.labels[i])
+
+    def record(self, i):
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"row {i} out of range for a store of {len(self)} records")
+        i %= len(self)
+        record = {field: self.text(i, field) for field in self.fields}
+        record["id"] = int(self.ids[i])
+        if self._categories is not None:
+            record["category"] = self.category(i)
+        if self.labels is not None:
+            record["label"] = self.label(i)
+        return record
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self.record(i) for i in range(*key.indices(len(self)))]
+        return self.record(key)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.record(i)
+
+    def column(self, name):
+        """
+        A whole text or metadata column as a list.
+        """
+        if name in self.fields:
+            return self.texts(name)
+        if name == "category":
+            return [self.category(i) for i in range(len(self))]
+        if name == "label":
+            return [self.label(i) for i in range(len(self))]
+        if name == "id":
+            return self.ids.tolist()
+        raise KeyError(name)
+
+    def close(self):
+        for blob in self._blobs.values():
+            if isinstance(blob, mmap.mmap):
+                try:
+                    blob.close()
+                except BufferError:
+                    pass  # raw() views are still exported; the map is unmapped when the last one goes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+
+# ------------------ Writing ------------------
+class StoreWriter:
+    """
+    Append records one at a time; nothing but the offsets and codes is kept in memory.
+    The store is built next to path and moved into place by close(), replacing an
+    older store at path; any other existing file or directory there is refused.
+    """
+
+    def __init__(self, path, fields, source=None, category_column=None):
+        _check_target(path)
+        self.path = path
+        self.fields = list(fields)
+        self.source = source
+        self.category_column = category_column
+        self._tmp = path + ".tmp"
+        shutil.rmtree(self._tmp, ignore_errors=True)
+        os.makedirs(self._tmp)
+        self._files = {field: open(os.path.join(self._tmp, f"{field}.bin"), "wb") for field in self.fields}
+        self._offsets = {field: array("q", [0]) for field in self.fields}
+        self._ids = array("q")
+        self._categories = array("i")
+        self._labels = array("b")
+        self._category_codes = {}
+        self._has_category = self._has_label = False
+
+    def add(self, texts, doc_id, category=None, label=None):
+        for field in self.fields:
+            data = (texts.get(field) or "").encode("utf-8")
+            self._files[field].write(data)
+            self._offsets[field].append(self._offsets[field][-1] + len(data))
+        self._ids.append(int(doc_id))
+        self._has_category |= category is not None
+        self._has_label |= label is not None
+        self._categories.append(-1 if category is None else self._category_codes.setdefault(category, len(self._category_codes)))
+        self._labels.append(-1 if label is None else int(label))
+
+    def close(self):
+        for field, f in self._files.items():
+            f.close()
+            np.save(os.path.join(self._tmp, f"{field}.offsets.npy"), np.frombuffer(self._offsets[field], dtype=np.int64))
+        np.save(os.path.join(self._tmp, "ids.npy"), np.frombuffer(self._ids, dtype=np.int64))
+        if self._has_category:
+            np.save(os.path.join(self._tmp, "categories.npy"), np.frombuffer(self._categories, dtype=np.int32))
+        if self._has_label:
+            np.save(os.path.join(self._tmp, "labels.npy"), np.frombuffer(self._labels, dtype=np.int8))
+        manifest = {
+            "version": FORMAT_VERSION,
+            "count": len(self._ids),
+            "fields": self.fields,
+            "categories": list(self._category_codes),
+            "category_column": self.category_column,
+            "source": None if self.source is None else os.path.basename(self.source),
+            "source_sha256": None if self.source is None else _file_sha256(self.source),
+        }
+        with open(os.path.join(self._tmp, MANIFEST), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        _check_target(self.path)
+        shutil.rmtree(self.path, ignore_errors=True)
+        os.replace(self._tmp, self.path)
+        return len(self._ids)
+
+
+def _check_target(path):
+    if os.path.lexists(path) and not is_store(path):
+        raise FileExistsError(f"{path} exists and is not a corpus store; choose another path or remove it")
+
+
+def _iter_json_records(path):
+    with open(path, encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            # A JSON array has to be parsed whole; this happens once, at conversion
+            yield from json.load(f)
+
+
+def convert(source, path, text_column="Resume", category_column="Category", label_column="label"):
+    """
+    Write a store from a resume CSV (one text field, text_column) or a JSON / JSONL
+    pair dataset (resume_text and job_description). Returns the number of records.
+    """
+    if source.lower().endswith(".csv"):
+        csv.field_size_limit(sys.maxsize)
+        writer = StoreWriter(path, [text_column], source, category_column)
+        with open(source, newline="", encoding="utf-8") as f:
+            for i, row in enumerate(csv.DictReader(f)):
+                text = row.get(text_column) or ""
+                if not text.strip():
+                    continue  # same rows as vector_index.read_corpus
+                label = row.get(label_column)
+                writer.add({text_column: text}, i, row.get(category_column) or None,
+                           int(label) if label not in (None, "") else None)
+        return writer.close()
+
+    writer = StoreWriter(path, PAIR_FIELDS, source, "category")
+    for i, record in enumerate(_iter_json_records(source)):
+        writer.add(record, i, record.get("category"), record.get("label"))
+    return writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert datasets to memory-mapped corpus stores and inspect them.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    command = sub.add_parser("convert", help="build a store from a CSV, JSON or JSONL dataset")
+    command.add_argument("source")
+    command.add_argument("store")
+    command.add_argument("--text-column", default="Resume", help="CSV column holding the resume text")
+    command.add_argument("--category-column", default="Category")
+    command = sub.add_parser("show", help="print one record")
+    command.add_argument("store")
+    command.add_argument("row", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "convert":
+        try:
+            count = convert(args.source, args.store, args.text_column, args.category_column)
+        except FileExistsError as e:
+            sys.exit(f"❌ {e}")
+        size = sum(os.path.getsize(os.path.join(args.store, name)) for name in os.listdir(args.store))
+        print(f"✅ Stored {count} records from {args.source} in {args.store} ({size / 1e6:.1f} MB)")
+        return
+
+    with CorpusStore(args.store) as store:
+        print(json.dumps(store[args.row], indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
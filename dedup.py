@@ -0,0 +1,193 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+    python dedup.py --csv UpdatedResumeDataSet.csv --threshold 0.9
+
+Every text is cleaned with clean_text and cut into word shingles. A MinHash
+signature estimates the Jaccard similarity of two shingle sets, and LSH banding
+only compares a document with the cluster representatives that share one of its
+band buckets, so adding a document costs about the same at any corpus size.
+Each cluster is led by its first document; the others are within `threshold` of it,
+so the representative's embedding similarity can be fanned out to every member.
+"""
+import argparse
+import time
+import zlib
+
+import numpy as np
+
+from clean_resume_dataset import clean_text
+
+NUM_PERM = 128
+SHINGLE_SIZE = 5
+DEFAULT_THRESHOLD = 0.9
+
+_SHIFT = np.uint64(32)
+
+
+def shingle_hashes(text, size=SHINGLE_SIZE):
+    """
+    Distinct 64-bit hashes of the `size`-word shingles of the cleaned, lowercased text.
+    """
+    words = clean_text(text).lower().split()
+    if not words:
+        return np.zeros(1, dtype=np.uint64)
+    tokens = np.fromiter((zlib.crc32(word.encode("utf-8")) for word in words), dtype=np.uint64, count=len(words))
+    if len(tokens) < size:
+        tokens = np.concatenate([tokens, np.zeros(size - len(tokens), dtype=np.uint64)])
+    windows = np.lib.stride_tricks.sliding_window_view(tokens, size)
+    # Polynomial combination of the word hashes; uint64 arithmetic wraps around
+    powers = np.uint64(1_000_003) ** np.arange(size, dtype=np.uint64)
+    return np.unique(windows @ powers)
+
+
+class MinHasher:
+    """
+    num_perm multiply-shift hash functions; the signature keeps the minimum of each.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, seed=0):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, 2**63, num_perm, dtype=np.uint64) | np.uint64(1)
+        self.b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+
+    def signature(self, hashes):
+        return ((np.outer(hashes, self.a) + self.b) >> _SHIFT).min(axis=0).astype(np.uint32)
+
+
+def lsh_params(num_perm, threshold):
+    """
+    (bands, rows) for banding num_perm values, minimizing the false positive plus
+    false negative probability mass around threshold.
+    """
+    similarity = np.linspace(0, 1, 201)
+    best, best_error = (num_perm, 1), float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        collide = 1 - (1 - similarity ** rows) ** bands
+        # Mean over an even grid on [0, 1]: false positives below threshold, misses above
+        error = np.mean(np.where(similarity < threshold, collide, 1 - collide))
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    Incremental near-duplicate clustering. add() returns the position of the
+    cluster representative of each new text (itself if it starts a new cluster).
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE, seed=0):
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.hasher = MinHasher(num_perm, seed)
+        self.bands, self.rows = lsh_params(num_perm, threshold)
+        self.buckets = [{} for _ in range(self.bands)]
+        self.signatures = {}  # representative position -> signature
+        self.representatives = []
+        self.comparisons = 0
+
+    def __len__(self):
+        return len(self.representatives)
+
+    def _band_keys(self, signature):
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def add(self, text):
+        position = len(self.representatives)
+        signature = self.hasher.signature(shingle_hashes(text, self.shingle_size))
+        keys = self._band_keys(signature)
+
+        candidates = {rep for bucket, key in zip(self.buckets, keys) for rep in bucket.get(key, ())}
+        best, best_similarity = position, self.threshold
+        for rep in sorted(candidates):
+            self.comparisons += 1
+            similarity = float(np.mean(self.signatures[rep] == signature))
+            if similarity >= best_similarity and (best == position or similarity > best_similarity):
+                best, best_similarity = rep, similarity
+
+        if best == position:
+            # Only representatives go into the buckets; members are reached through them
+            self.signatures[position] = signature
+            for bucket, key in zip(self.buckets, keys):
+                bucket.setdefault(key, []).append(position)
+        self.representatives.append(best)
+        return best
+
+
+def find_duplicates(texts, threshold=DEFAULT_THRESHOLD, num_perm=NUM_PERM, shingle_size=SHINGLE_SIZE):
+    """
+    Representative position of every text, as an int array (i where i leads its cluster).
+    """
+    index = NearDuplicateIndex(threshold, num_perm, shingle_size)
+    return np.array([index.add(text) for text in texts], dtype=np.int64)
+
+
+def clusters(representatives):
+    """
+    {representative: [member positions]} for the clusters with more than one member.
+    """
+    groups = {}
+    for position, rep in enumerate(representatives):
+        groups.setdefault(int(rep), []).append(position)
+    return {rep: members for rep, members in groups.items() if len(members) > 1}
+
+
+# ------------------ Report ------------------
+def savings_report(texts, representatives):
+    """
+    How many texts, and how many words, an encoder skips by scoring representatives only.
+    """
+    representatives = np.asarray(representatives)
+    unique = np.flatnonzero(representatives == np.arange(len(representatives)))
+    words = np.array([len(text.split()) for text in texts])
+    exact = len(texts) - len(set(texts))
+    return {
+        "documents": len(texts),
+        "representatives": len(unique),
+        "exact_duplicates": exact,
+        "near_duplicates": len(texts) - len(unique) - exact,
+        "clusters": len(clusters(representatives)),
+        "encodes_saved": len(texts) - len(unique),
+        "words_saved": int(words.sum() - words[unique].sum()),
+        "words_total": int(words.sum()),
+    }
+
+
+def main(argv=None):
+    from vector_index import read_corpus
+
+    parser = argparse.ArgumentParser(description="Find near-duplicate resumes and report the encode work they cost.")
+    parser.add_argument("--csv", default="UpdatedResumeDataSet.csv")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="minimum estimated Jaccard similarity")
+    parser.add_argument("--num-perm", type=int, default=NUM_PERM)
+    parser.add_argument("--shingle-size", type=int, default=SHINGLE_SIZE)
+    parser.add_argument("--show", type=int, default=5, help="largest clusters to list")
+    args = parser.parse_args(argv)
+
+    rows = list(read_corpus(args.csv))
+    texts = [text for _, _, text in rows]
+    start = time.perf_counter()
+    index = NearDuplicateIndex(args.threshold, args.num_perm, args.shingle_size)
+    representatives = [index.add(text) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    report = savings_report(texts, representatives)
+    print(f"🔎 {report['documents']} resumes -> {report['representatives']} to score "
+          f"({report['exact_duplicates']} exact and {report['near_duplicates']} near duplicates "
+          f"in {report['clusters']} clusters), {elapsed:.2f}s")
+    print(f"   LSH: {index.bands} bands x {index.rows} rows, {index.comparisons} signature comparisons "
+          f"({index.comparisons / max(len(texts), 1):.1f} per resume)")
+    print(f"⚡ Encode work saved: {report['encodes_saved']} of {report['documents']} texts "
+          f"({report['encodes_saved'] / max(report['documents'], 1):.0%}), "
+          f"{report['words_saved']} of {report['words_total']} words "
+          f"({report['words_saved'] / max(report['words_total'], 1):.0%})")
+    for rep, members in sorted(clusters(representatives).items(), key=lambda item: -len(item[1]))[:args.show]:
+        doc_id, category, _ = rows[rep]
+        print(f"   row {doc_id} ({category}): {len(members)} copies")
+
+
+if __name__ == "__main__":
+    main()
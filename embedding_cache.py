@@ -0,0 +1,196 @@
+import contextlib
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+
+import numpy as np
+
+from quantization import check_dtype, quantize, dequantize
+
+DEFAULT_CACHE_DIR = ".embedding_cache"
+
+
+def normalize_text(text):
+    return " ".join(text.split())
+
+
+def text_key(text, model_name):
+    """
+    Content address of a text for one model: sha256 of the model name and the
+    whitespace-normalized text.
+    """
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding cache for one model.
+
+    Vectors live in a memory-mapped .npy block of max_entries rows; a small SQLite
+    table maps each text key to its row and last-use tick. When the block is full the
+    least recently used rows are overwritten.
+
+    dtype="float16" or "int8" stores the vectors quantized (see quantization.py) in
+    a separate cache directory; encode() always returns float32 vectors.
+
+    Several processes may share a cache directory: every lookup and every store runs
+    in one SQLite BEGIN IMMEDIATE transaction, so slot allocation, the vector write
+    and the index update of one process never interleave with another's.
+    """
+
+    def __init__(self, model_name, cache_dir=DEFAULT_CACHE_DIR, max_entries=50_000, dtype="float32"):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self.dtype = check_dtype(dtype)
+        self.hits = 0
+        self.misses = 0
+
+        self.path = os.path.join(cache_dir, re.sub(r"[^\w.-]+", "_", model_name))
+        if dtype != "float32":
+            self.path = os.path.join(self.path, dtype)
+        os.makedirs(self.path, exist_ok=True)
+        self._vectors_path = os.path.join(self.path, "vectors.npy")
+        self._scales_path = os.path.join(self.path, "scales.npy")
+        self._vectors = None
+        self._scales = None
+        self._open_vectors()
+
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly by _transaction()
+        self._db = sqlite3.connect(os.path.join(self.path, "index.sqlite"), timeout=30,
+                                   check_same_thread=False, isolation_level=None)
+        with self._transaction():
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, slot INTEGER UNIQUE, last_used INTEGER)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS embeddings_last_used ON embeddings (last_used)")
+
+    def _open_vectors(self):
+        # The vector block may have been created by another process since this one started
+        if self._vectors is None and os.path.exists(self._vectors_path):
+            self._vectors = np.load(self._vectors_path, mmap_mode="r+")
+            self.max_entries = self._vectors.shape[0]
+            if self.dtype == "int8":
+                self._scales = np.load(self._scales_path, mmap_mode="r+")
+
+    @contextlib.contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE takes the database write lock up front; other processes wait (up to timeout)
+        self._db.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._db.execute("ROLLBACK")
+            raise
+        self._db.execute("COMMIT")
+
+    def _next_tick(self):
+        # Ticks order uses across every process sharing the cache
+        return self._db.execute("SELECT COALESCE(MAX(last_used), 0) + 1 FROM embeddings").fetchone()[0]
+
+    def __len__(self):
+        return self._db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": len(self),
+            "max_entries": self.max_entries,
+        }
+
+    def _lookup(self, keys):
+        found = {}
+        unique = list(dict.fromkeys(keys))
+        for start in range(0, len(unique), 500):
+            chunk = unique[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT key, slot FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            ).fetchall()
+            found.update(rows)
+        return found
+
+    def _allocate(self, n):
+        # Hand out never-used rows first, then evict the least recently used ones
+        used = len(self)
+        slots = list(range(used, min(used + n, self.max_entries)))
+        if len(slots) < n:
+            evicted = self._db.execute(
+                "SELECT key, slot FROM embeddings ORDER BY last_used LIMIT ?", (n - len(slots),)
+            ).fetchall()
+            self._db.executemany("DELETE FROM embeddings WHERE key = ?", [(key,) for key, _ in evicted])
+            slots += [slot for _, slot in evicted]
+        return slots
+
+    def _store(self, keys, codes, scales):
+        self._open_vectors()
+        if self._vectors is None:
+            if self.dtype == "int8":
+                self._scales = np.lib.format.open_memmap(
+                    self._scales_path, mode="w+", dtype=np.float32, shape=(self.max_entries,)
+                )
+            self._vectors = np.lib.format.open_memmap(
+                self._vectors_path, mode="w+", dtype=self.dtype, shape=(self.max_entries, codes.shape[1])
+            )
+        # A single batch larger than the cache only keeps its tail
+        keys, codes = keys[-self.max_entries:], codes[-self.max_entries:]
+        slots = self._allocate(len(keys))
+        self._vectors[slots] = codes
+        self._vectors.flush()
+        if scales is not None:
+            self._scales[slots] = scales[-self.max_entries:]
+            self._scales.flush()
+        tick = self._next_tick()
+        self._db.executemany(
+            "INSERT OR REPLACE INTO embeddings (key, slot, last_used) VALUES (?, ?, ?)",
+            [(key, slot, tick) for key, slot in zip(keys, slots)],
+        )
+
+    def _read(self, slots):
+        # Marks the slots used and returns {key: float32 vector}
+        if not slots:
+            return {}
+        self._open_vectors()
+        tick = self._next_tick()
+        self._db.executemany("UPDATE embeddings SET last_used = ? WHERE key = ?", [(tick, key) for key in slots])
+        cached = np.fromiter(slots.values(), dtype=np.int64, count=len(slots))
+        order = np.argsort(cached)  # memmap reads in file order
+        vectors = dequantize(self._vectors[cached[order]],
+                             None if self._scales is None else self._scales[cached[order]])
+        keys_in_order = list(slots)
+        return {keys_in_order[i]: vector for i, vector in zip(order, vectors)}
+
+    def encode(self, model, texts, batch_size=32):
+        """
+        Return embeddings for texts, running the model only on texts not cached yet.
+        """
+        texts = list(texts)
+        keys = [text_key(text, self.model_name) for text in texts]
+
+        with self._lock:
+            with self._transaction():
+                slots = self._lookup(keys)
+                rows = self._read(slots)
+            missing = {}
+            for key, text in zip(keys, texts):
+                if key not in slots:
+                    missing.setdefault(key, text)
+            self.hits += len(keys) - sum(1 for key in keys if key in missing)
+            self.misses += sum(1 for key in keys if key in missing)
+
+            if missing:
+                # The model runs outside the transaction; another process may store the same texts meanwhile
+                new_vectors = np.asarray(model.encode(list(missing.values()), batch_size=batch_size), dtype=np.float32)
+                codes, scales = quantize(new_vectors, self.dtype)
+                # Return what a later cache hit will return, not the unquantized vectors
+                rows.update(zip(missing, dequantize(codes, scales)))
+                with self._transaction():
+                    stored = self._lookup(list(missing))
+                    new = [i for i, key in enumerate(missing) if key not in stored]
+                    if new:
+                        self._store([key for key in missing if key not in stored], codes[new],
+                                    None if scales is None else scales[new])
+
+        return np.stack([rows[key] for key in keys]) if keys else np.empty((0, 0), dtype=np.float32)
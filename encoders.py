@@ -0,0 +1,106 @@
+"""
+Embedding backends.
+
+An encoder is any object with encode(texts, batch_size=32) returning one vector
+per text, like the SentenceTransformer model itself. Two backends are built in:
+
+    sbert    all-MiniLM-L6-v2 (downloaded on first use, tens of ms per text on CPU)
+    hashing  word and bigram counts hashed into 2**18 buckets and projected to 384
+             dimensions by a fixed sparse random matrix; offline, no model files,
+             about 100x faster on CPU, but lexical only
+
+Functions that take a model also accept a backend name, so the tier can be chosen
+per call: a cheap first pass over many resumes, SBERT for the shortlist.
+"""
+import os
+import threading
+
+import numpy as np
+
+BACKENDS = ("sbert", "hashing")
+# Backend used when none is chosen explicitly
+DEFAULT_BACKEND = os.environ.get("RESUME_SCREENING_ENCODER", "sbert")
+
+
+class HashingEncoder:
+    """
+    Hashed, sublinear-tf bag of words and bigrams times a fixed random projection.
+    Every input bucket adds ±1/sqrt(nnz) to nnz output dimensions, so the projection
+    is a sparse matrix of n_features * nnz entries and needs no training.
+    """
+
+    def __init__(self, dim=384, n_features=2**18, nnz=4, seed=0):
+        from sklearn.feature_extraction.text import HashingVectorizer
+        import scipy.sparse as sp
+
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features, ngram_range=(1, 2), stop_words="english", alternate_sign=False, norm=None,
+            token_pattern=r"(?u)\b\w[\w+#]*",
+        )
+        rng = np.random.default_rng(seed)
+        cols = rng.integers(0, dim, (n_features, nnz))
+        signs = rng.choice(np.array([-1.0, 1.0], dtype=np.float32), (n_features, nnz)) / np.sqrt(nnz)
+        self.projection = sp.csr_matrix(
+            (signs.ravel(), cols.ravel(), np.arange(0, n_features * nnz + 1, nnz)), shape=(n_features, dim),
+        )
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        from sklearn.preprocessing import normalize
+
+        counts = self.vectorizer.transform(list(texts))
+        counts.data = np.log1p(counts.data)
+        return np.asarray((normalize(counts) @ self.projection).toarray(), dtype=np.float32)
+
+
+_encoders = {}
+_lock = threading.Lock()
+
+
+def get_encoder(backend=DEFAULT_BACKEND):
+    """
+    Process-wide encoder for a backend name, created on first use.
+    """
+    if backend == "sbert":
+        import match_model
+        return match_model.get_model()
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown encoder backend {backend!r}; choose one of {', '.join(BACKENDS)}")
+    encoder = _encoders.get(backend)
+    if encoder is None:
+        with _lock:
+            encoder = _encoders.get(backend)
+            if encoder is None:
+                encoder = _encoders[backend] = HashingEncoder()
+    return encoder
+
+
+def resolve(model):
+    """
+    The encoder for a backend name; any other model is returned unchanged.
+    """
+    return get_encoder(model) if isinstance(model, str) else model
+
+
+def encoder_name(model):
+    """
+    Name identifying the vectors of a backend name or an encoder object, used to key
+    embedding caches and results.
+    """
+    if isinstance(model, str):
+        if model == "sbert":
+            from match_model import MODEL_NAME
+            return MODEL_NAME
+        return get_encoder(model).name
+    name = getattr(model, "name", None)
+    if name:
+        return name
+    import match_model
+    if model is match_model._model:
+        return match_model.MODEL_NAME
+    # Any other SentenceTransformer: the checkpoint its tokenizer was loaded from
+    path = getattr(getattr(model, "tokenizer", None), "name_or_path", None)
+    if path:
+        return os.path.basename(path.rstrip("/\\"))
+    return type(model).__name__
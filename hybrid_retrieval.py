@@ -0,0 +1,297 @@
+"""
+Two-stage retrieval: a sparse BM25 shortlist, then a dense SBERT rerank.
+
+    python hybrid_retrieval.py build --csv UpdatedResumeDataSet.csv
+    python hybrid_retrieval.py query --jd job_description.txt -k 10 --shortlist 300
+    python hybrid_retrieval.py evaluate --jds job_descriptions.txt -k 10
+
+BM25 runs over the cleaned corpus on a scipy sparse matrix, with every multi-word
+skill from the taxonomy ("spring boot", "ci/cd") indexed as one extra term, so exact
+skill mentions weigh in. Single-word skills ("python") already are one word term and
+get no extra term, which would count them twice. Only the shortlisted resumes are
+encoded and scored by the model.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import scipy.sparse as sp
+
+import tracing
+from clean_resume_dataset import clean_text
+from skill_matcher import default_matcher
+from vector_index import _top_k, _normalize as _unit
+
+DEFAULT_INDEX_DIR = "resume_bm25"
+SHORTLIST_SIZE = 300
+SPARSE_WEIGHT = 0.3
+DENSE_WEIGHT = 0.7
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+# Bumped whenever tokenize() changes, so indexes built by an older version are rejected
+TOKENIZER_VERSION = 2
+_multi_word = {}
+
+
+def _words(text):
+    return [token.rstrip(".") for token in _TOKEN.findall(text)]
+
+
+def _is_multi_word(skill):
+    if skill not in _multi_word:
+        _multi_word[skill] = _words(skill) != [skill]
+    return _multi_word[skill]
+
+
+def tokenize(text):
+    """
+    Lowercased word tokens plus one "skill:<name>" term per mention of a multi-word
+    taxonomy skill.
+    """
+    text = text.lower()
+    tokens = _words(text)
+    _, _, offsets = default_matcher.match(text)
+    tokens.extend(f"skill:{skill}" for skill, spans in offsets.items() if _is_multi_word(skill) for _ in spans)
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over a document-term matrix. The per-document term weights are
+    precomputed into a CSC matrix, so scoring a query only sums its terms' columns.
+    """
+
+    def __init__(self, weights, vocabulary, ids, categories=None):
+        self.weights = weights.tocsc()
+        self.vocabulary = vocabulary
+        self.ids = ids
+        self.categories = categories or [None] * len(ids)
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def build(cls, texts, ids, categories=None, k1=1.5, b=0.75):
+        vocabulary = {}
+        indptr, indices = [0], []
+        for text in texts:
+            indices.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(text))
+            indptr.append(len(indices))
+        counts = sp.csr_matrix(
+            (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr)),
+            shape=(len(indptr) - 1, len(vocabulary)),
+        )
+        counts.sum_duplicates()
+
+        lengths = np.diff(indptr).astype(np.float32)
+        doc_freq = np.bincount(counts.indices, minlength=len(vocabulary))
+        idf = np.log1p((len(lengths) - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+        norm = k1 * (1 - b + b * lengths / max(lengths.mean(), 1e-9))
+        row_norm = np.repeat(norm, np.diff(counts.indptr))
+        tf = counts.data
+        counts.data = idf[counts.indices] * tf * (k1 + 1) / (tf + row_norm)
+        return cls(counts, vocabulary, list(ids), categories)
+
+    def score(self, query):
+        """
+        BM25 score of every document for a query text.
+        """
+        terms = [self.vocabulary[token] for token in set(tokenize(query)) if token in self.vocabulary]
+        if not terms:
+            return np.zeros(len(self), dtype=np.float32)
+        return np.asarray(self.weights[:, terms].sum(axis=1)).ravel()
+
+    def shortlist(self, query, k=SHORTLIST_SIZE):
+        """
+        Rows of the k best BM25 matches and their scores.
+        """
+        scores = self.score(query)
+        rows = _top_k(scores, k)
+        return rows, scores[rows]
+
+    def save(self, path=DEFAULT_INDEX_DIR):
+        os.makedirs(path, exist_ok=True)
+        sp.save_npz(os.path.join(path, "weights.npz"), self.weights.tocsr())
+        tmp = os.path.join(path, "meta.json.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"tokenizer_version": TOKENIZER_VERSION, "vocabulary": self.vocabulary, "ids": self.ids,
+                       "categories": self.categories}, f)
+        os.replace(tmp, os.path.join(path, "meta.json"))
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_DIR):
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("tokenizer_version") != TOKENIZER_VERSION:
+            raise ValueError(f"{path} was built by another version of the tokenizer; rebuild it")
+        return cls(sp.load_npz(os.path.join(path, "weights.npz")), meta["vocabulary"], meta["ids"], meta["categories"])
+
+
+class HybridRetriever:
+    """
+    BM25 shortlist of shortlist_size resumes, reranked by a blend of the normalized
+    BM25 score and the SBERT cosine similarity:
+
+        score = sparse_weight * bm25 / max(bm25 of the shortlist) + dense_weight * cosine
+    """
+
+    def __init__(self, bm25, texts, model, cache=None, shortlist_size=SHORTLIST_SIZE,
+                 sparse_weight=SPARSE_WEIGHT, dense_weight=DENSE_WEIGHT):
+        self.bm25 = bm25
+        self.texts = texts
+        self.model = model
+        self.cache = cache
+        self.shortlist_size = shortlist_size
+        self.sparse_weight = sparse_weight
+        self.dense_weight = dense_weight
+
+    def _encode(self, texts):
+        import match_model
+        return _unit(match_model.encode(self.model, texts, self.cache, batch_size=64))
+
+    def search(self, job_desc, k=10):
+        """
+        Return up to k (id, category, score, bm25, cosine) tuples, best first.
+        """
+        return self.rerank(job_desc, *self.shortlist(job_desc), k)
+
+    def shortlist(self, job_desc):
+        """
+        (rows, bm25 scores) of the shortlist_size best BM25 matches.
+        """
+        with tracing.stage("bm25_shortlist"):
+            return self.bm25.shortlist(job_desc, self.shortlist_size)
+
+    def rerank(self, job_desc, rows, sparse, k=10):
+        if len(rows) == 0:
+            return []
+        with tracing.stage("dense_rerank"):
+            emb = self._encode([job_desc] + [self.texts[row] for row in rows])
+            dense = emb[1:] @ emb[0]
+        sparse_norm = sparse / sparse.max() if sparse.max() > 0 else sparse
+        blended = self.sparse_weight * sparse_norm + self.dense_weight * dense
+        best = _top_k(blended, k)
+        return [(self.bm25.ids[rows[i]], self.bm25.categories[rows[i]], float(blended[i]),
+                 float(sparse[i]), float(dense[i])) for i in best]
+
+
+def dense_top_k(model, texts, job_descs, k=10, cache=None):
+    """
+    Exhaustive baseline: cosine of every resume against every JD, top k ids per JD.
+    """
+    import match_model
+    corpus = _unit(match_model.encode(model, texts, cache, batch_size=64))
+    queries = _unit(match_model.encode(model, job_descs, cache, batch_size=64))
+    return [_top_k(corpus @ query, k) for query in queries]
+
+
+def recall_against_dense(retriever, job_descs, k=10):
+    """
+    Share of the exhaustive dense top-k that the hybrid top-k and the BM25 shortlist
+    recover, averaged over the job descriptions, plus the mean latency of each stage.
+    """
+    start = time.perf_counter()
+    exact = dense_top_k(retriever.model, retriever.texts, job_descs, k, retriever.cache)
+    dense_seconds = time.perf_counter() - start
+
+    ids = retriever.bm25.ids
+    hybrid_recall, shortlist_recall = [], []
+    shortlist_seconds = rerank_seconds = 0.0
+    for job_desc, rows in zip(job_descs, exact):
+        start = time.perf_counter()
+        candidates, sparse = retriever.shortlist(job_desc)
+        shortlisted = time.perf_counter()
+        found = {doc_id for doc_id, *_ in retriever.rerank(job_desc, candidates, sparse, k)}
+        rerank_seconds += time.perf_counter() - shortlisted
+        shortlist_seconds += shortlisted - start
+
+        expected = {ids[row] for row in rows}
+        shortlist = {ids[row] for row in candidates}
+        hybrid_recall.append(len(expected & found) / max(len(expected), 1))
+        shortlist_recall.append(len(expected & shortlist) / max(len(expected), 1))
+    return {
+        "recall": float(np.mean(hybrid_recall)),
+        "shortlist_recall": float(np.mean(shortlist_recall)),
+        "dense_ms_per_jd": dense_seconds / len(job_descs) * 1000,
+        "shortlist_ms_per_jd": shortlist_seconds / len(job_descs) * 1000,
+        "rerank_ms_per_jd": rerank_seconds / len(job_descs) * 1000,
+        "hybrid_ms_per_jd": (shortlist_seconds + rerank_seconds) / len(job_descs) * 1000,
+    }
+
+
+# ------------------ Build & Query ------------------
+def load_corpus(csv_path):
+    from vector_index import read_corpus
+
+    rows = list(read_corpus(csv_path))
+    return ([doc_id for doc_id, _, _ in rows], [category for _, category, _ in rows],
+            [clean_text(text) for _, _, text in rows])
+
+
+def read_job_descriptions(path):
+    """
+    Job descriptions from a text file, separated by blank lines.
+    """
+    with open(path, encoding="utf-8") as f:
+        return [block.strip() for block in re.split(r"\n\s*\n", f.read()) if block.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="BM25 shortlist + SBERT rerank over the resume corpus.")
+    parser.add_argument("--csv", default="UpdatedResumeDataSet.csv")
+    parser.add_argument("--index", default=DEFAULT_INDEX_DIR)
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="build the BM25 index over the cleaned corpus")
+    for name, help_text in (("query", "top-k resumes for one job description"),
+                            ("evaluate", "recall of the hybrid top-k against exhaustive dense scoring")):
+        command = sub.add_parser(name, help=help_text)
+        command.add_argument("--jd" if name == "query" else "--jds", required=True,
+                             help="text file with one job description" if name == "query"
+                             else "text file with job descriptions separated by blank lines")
+        command.add_argument("-k", type=int, default=10)
+        command.add_argument("--shortlist", type=int, default=SHORTLIST_SIZE, help="BM25 candidates to rerank")
+        command.add_argument("--sparse-weight", type=float, default=SPARSE_WEIGHT)
+        command.add_argument("--dense-weight", type=float, default=DENSE_WEIGHT)
+    args = parser.parse_args(argv)
+
+    ids, categories, texts = load_corpus(args.csv)
+    if args.command == "build":
+        start = time.perf_counter()
+        index = BM25Index.build(texts, ids, categories)
+        index.save(args.index)
+        print(f"✅ BM25 index over {len(index)} resumes ({len(index.vocabulary)} terms) "
+              f"built in {time.perf_counter() - start:.1f}s: {args.index}")
+        return
+
+    import match_model
+    from embedding_cache import EmbeddingCache
+
+    bm25 = BM25Index.load(args.index) if os.path.exists(args.index) else BM25Index.build(texts, ids, categories)
+    if bm25.ids != ids:
+        sys.exit("❌ The index does not match the corpus; rebuild it.")
+    retriever = HybridRetriever(bm25, texts, match_model.get_model(), EmbeddingCache(match_model.MODEL_NAME),
+                                args.shortlist, args.sparse_weight, args.dense_weight)
+
+    if args.command == "query":
+        job_desc = clean_text(read_job_descriptions(args.jd)[0])
+        start = time.perf_counter()
+        results = retriever.search(job_desc, args.k)
+        elapsed = (time.perf_counter() - start) * 1000
+        for rank, (doc_id, category, score, sparse, dense) in enumerate(results, 1):
+            print(f"#{rank:<3} row {doc_id:<6} {score:.3f} (bm25 {sparse:.1f}, cosine {dense:.3f})  {category}")
+        print(f"⚡ Reranked {min(args.shortlist, len(bm25))} of {len(bm25)} resumes in {elapsed:.1f} ms")
+    else:
+        job_descs = [clean_text(jd) for jd in read_job_descriptions(args.jds)]
+        report = recall_against_dense(retriever, job_descs, args.k)
+        print(f"🎯 Recall@{args.k} vs dense: {report['recall']:.3f} "
+              f"(BM25 shortlist of {args.shortlist} alone: {report['shortlist_recall']:.3f})")
+        print(f"⚡ {report['hybrid_ms_per_jd']:.1f} ms per JD (shortlist {report['shortlist_ms_per_jd']:.1f} + "
+              f"rerank {report['rerank_ms_per_jd']:.1f}) vs {report['dense_ms_per_jd']:.1f} ms for full dense scoring")
+
+
+if __name__ == "__main__":
+    main()
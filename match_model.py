@@ -1,19 +1,110 @@
 import json
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
-from sklearn.metrics import precision_score, recall_score, f1_score
+import os
+import threading
+import time
+import numpy as np
+import tracing
+from embedding_cache import EmbeddingCache
+from corpus_store import CorpusStore, is_store, _file_sha256
+from encoders import resolve, encoder_name
+from quantization import quantize, row_dot, bytes_per_vector
 
-# Load SBERT model once
-model = SentenceTransformer('all-MiniLM-L6-v2')
+MODEL_NAME = 'all-MiniLM-L6-v2'
+# Storage format of the shared embedding cache: float32, float16 or int8
+EMBEDDING_DTYPE = os.environ.get("RESUME_SCREENING_EMBEDDING_DTYPE", "float32")
 
+# The SBERT model (and torch behind it) is only loaded on first use, once per process
+_model = None
+_model_lock = threading.Lock()
 
-def compare_resumes(resume1, resume2, job_desc, model, threshold=0.05):
+
+def get_model():
+    """
+    Return the process-wide SBERT model, loading it on the first call.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                with tracing.stage("model_loading"):
+                    from sentence_transformers import SentenceTransformer
+                    _model = SentenceTransformer(MODEL_NAME)
+    return _model
+
+
+_service = None
+
+
+def get_scoring_service():
+    """
+    Return the process-wide micro-batching scoring service in front of the model.
+    Callers share its batches instead of each encoding their own few texts.
+    """
+    global _service
+    if _service is None:
+        with _model_lock:
+            if _service is None:
+                from scoring_service import ScoringService
+                _service = ScoringService(get_model, cache=EmbeddingCache(MODEL_NAME, dtype=EMBEDDING_DTYPE),
+                                          name=MODEL_NAME)
+    return _service
+
+
+def warm_up():
+    """
+    Load the model on a daemon thread so the first score does not pay for it.
+    """
+    thread = threading.Thread(target=get_model, name="sbert-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+def __getattr__(name):
+    # Keeps `match_model.model` working without loading the model at import time
+    if name == "model":
+        return get_model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def encode(model, texts, cache=None, batch_size=32):
+    """
+    Encode texts, going through the on-disk embedding cache when one is given.
+    """
+    with tracing.stage("model_encoding"):
+        if cache is None:
+            return np.asarray(model.encode(list(texts), batch_size=batch_size))
+        return cache.encode(model, texts, batch_size=batch_size)
+
+
+def encode_documents(model, texts, cache=None, batch_size=32, chunked=False, pooling="mean", query=None):
+    """
+    Unit vectors for texts. model is an encoder or a backend name (see encoders.py).
+    chunked=True reads the whole of long texts in overlapping windows (see
+    chunking.py) instead of letting the model truncate them.
+    """
+    model = resolve(model)
+    if chunked:
+        from chunking import encode_chunked
+        return encode_chunked(model, texts, pooling=pooling, query=query, batch_size=batch_size, cache=cache)
+    emb = np.asarray(encode(model, texts, cache, batch_size=batch_size), dtype=np.float32)
+    return emb / np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+
+
+def compare_resumes(resume1, resume2, job_desc, model=None, threshold=0.05, cache=None, chunked=False, pooling="mean"):
     """
     Compare two resumes against a job description and return which one is a better match.
+    model is an encoder or a backend name ("sbert", "hashing"); without one the
+    shared SBERT scoring service is used.
     """
-    emb = model.encode([resume1, resume2, job_desc])
-    score1 = cosine_similarity([emb[0]], [emb[2]])[0][0]
-    score2 = cosine_similarity([emb[1]], [emb[2]])[0][0]
+    if model is None:
+        model = get_scoring_service()
+    if chunked:
+        jd_emb = encode_documents(model, [job_desc], cache, chunked=True)
+        resume_emb = encode_documents(model, [resume1, resume2], cache, chunked=True, pooling=pooling, query=jd_emb[0])
+        emb = np.vstack([resume_emb, jd_emb])
+    else:
+        emb = encode_documents(model, [resume1, resume2, job_desc], cache)
+    score1, score2 = emb[:2] @ emb[2]
 
     print(f"\n🔍 Resume 1 score: {score1:.3f}")
     print(f"🔍 Resume 2 score: {score2:.3f}")
@@ -27,56 +118,330 @@ def compare_resumes(resume1, resume2, job_desc, model, threshold=0.05):
     return better, match1, match2
 
 
-def evaluate_dataset(model, data_path, threshold=0.05, debug=False):
+def load_dataset(data_path):
     """
-    Evaluate the SBERT model on a labeled dataset.
+    Load labeled pairs from a JSON array, a JSONL file (one pair per line) or a
+    corpus store directory, which is memory-mapped instead of read.
     """
+    if is_store(data_path):
+        return CorpusStore(data_path)
     with open(data_path, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+        if data_path.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
 
-    y_true = []
-    y_pred = []
 
-    print("📊 Evaluating dataset...\n")
+def pair_columns(data):
+    """
+    (resumes, jds, labels, categories) lists of a loaded dataset.
+    """
+    if isinstance(data, CorpusStore):
+        return (data.column('resume_text'), data.column('job_description'), data.column('label'),
+                data.column('category') if data.category_names else [None] * len(data))
+    return ([s['resume_text'] for s in data], [s['job_description'] for s in data],
+            [s['label'] for s in data], [s.get('category') for s in data])
+
+
+def dataset_digest(data_path):
+    """
+    sha256 identifying a dataset file, or a store by its manifest (which holds the source hash).
+    """
+    if is_store(data_path):
+        data_path = os.path.join(data_path, "manifest.json")
+    return _file_sha256(data_path)
+
+
+def pair_embeddings(model, resumes, jds, cache=None, batch_size=64, chunked=False, pooling="mean"):
+    """
+    Encode every distinct text once, in a single batched call. Returns the unit
+    vectors and, per pair, the row of its resume and of its job description.
+
+    With chunked=True and pooling="top_n", a resume's vector depends on its JD, so
+    every distinct (resume, jd) pair gets its own resume row.
+    """
+    if not (chunked and pooling == "top_n"):
+        index = {}
+        resume_idx = np.array([index.setdefault(text, len(index)) for text in resumes], dtype=np.int64)
+        jd_idx = np.array([index.setdefault(text, len(index)) for text in jds], dtype=np.int64)
+        emb = encode_documents(model, list(index), cache, batch_size, chunked=chunked, pooling=pooling)
+        return emb, resume_idx, jd_idx
+
+    jd_index, pair_index = {}, {}
+    jd_rows = np.array([jd_index.setdefault(text, len(jd_index)) for text in jds], dtype=np.int64)
+    pair_rows = np.array([pair_index.setdefault((resume, row), len(pair_index)) for resume, row in zip(resumes, jd_rows)],
+                         dtype=np.int64)
+    jd_emb = encode_documents(model, list(jd_index), cache, batch_size, chunked=True)
+    resume_emb = encode_documents(model, [resume for resume, _ in pair_index], cache, batch_size, chunked=True,
+                                  pooling="top_n", query=jd_emb[[row for _, row in pair_index]])
+    return np.vstack([resume_emb, jd_emb]), pair_rows, len(resume_emb) + jd_rows
+
+
+def pair_scores(model, resumes, jds, cache=None, batch_size=64, chunked=False, pooling="mean"):
+    """
+    Cosine similarity of each (resume, jd) pair, scored with one row-wise dot product.
+    """
+    emb, resume_idx, jd_idx = pair_embeddings(model, resumes, jds, cache, batch_size, chunked, pooling)
+    return np.einsum("ij,ij->i", emb[resume_idx], emb[jd_idx])
+
+
+def classification_metrics(y_true, y_pred):
+    from sklearn.metrics import precision_score, recall_score, f1_score
 
-    for sample in data:
-        resume = sample['resume_text']
-        jd = sample['job_description']
-        true_label = int(sample['label'])
+    return {
+        "accuracy": float(np.mean(y_true == y_pred)),
+        "precision": precision_score(y_true, y_pred, zero_division=0),
+        "recall": recall_score(y_true, y_pred, zero_division=0),
+        "f1": f1_score(y_true, y_pred, zero_division=0),
+    }
 
-        embeddings = model.encode([resume, jd])
-        score = cosine_similarity([embeddings[0]], [embeddings[1]])[0][0]
-        predicted_label = 1 if score > threshold else 0
 
-        y_true.append(true_label)
-        y_pred.append(predicted_label)
+def quantization_report(emb, resume_idx, jd_idx, y_true, threshold, dtypes, baseline):
+    """
+    Score the pairs on each quantized copy of the embeddings and report the metrics
+    and their change against float32.
+    """
+    report = {}
+    for dtype in dtypes:
+        codes, scales = quantize(emb, dtype)
+        scores = row_dot(codes[resume_idx], None if scales is None else scales[resume_idx],
+                         codes[jd_idx], None if scales is None else scales[jd_idx])
+        metrics = classification_metrics(y_true, (scores > threshold).astype(int))
+        report[dtype] = {
+            **metrics,
+            "delta": {name: metrics[name] - baseline[name] for name in ("precision", "recall", "f1")},
+            "max_score_error": float(np.abs(scores - np.einsum("ij,ij->i", emb[resume_idx], emb[jd_idx])).max(initial=0)),
+            "bytes_per_vector": bytes_per_vector(emb.shape[1], dtype),
+        }
+    return report
+
+
+def backend_report(resumes, jds, y_true, threshold, backends, batch_size=64):
+    """
+    Encode the pairs with every backend, uncached, and report its throughput, its
+    metrics at threshold and its best-F1 operating point (score scales differ
+    between backends, so one fixed threshold does not compare them fairly).
+    """
+    from encoders import get_encoder
+
+    n_texts = len(set(resumes) | set(jds))
+    report = {}
+    for backend in backends:
+        try:
+            model = get_encoder(backend)
+        except Exception as e:
+            report[backend] = {"error": f"{type(e).__name__}: {(str(e).splitlines() or [''])[0]}"}
+            continue
+        start = time.perf_counter()
+        scores = pair_scores(model, resumes, jds, batch_size=batch_size)
+        seconds = time.perf_counter() - start
+        best = best_threshold(threshold_sweep(scores, y_true), "f1")
+        report[backend] = {
+            **classification_metrics(y_true, (scores > threshold).astype(int)),
+            "best_f1": best["f1"],
+            "best_threshold": best["threshold"],
+            "seconds": seconds,
+            "texts_per_sec": n_texts / seconds if seconds else float("inf"),
+        }
+    return report
+
+
+def evaluate_dataset(model, data_path, threshold=0.05, debug=False, cache=None, batch_size=64, verbose=False,
+                     quantization=None, chunked=False, pooling="mean", backends=None):
+    """
+    Evaluate an encoder (the SBERT model, or a backend name) on a labeled dataset.
+    Set verbose=True to print the score of every sample.
+    quantization=["float16", "int8"] also scores the pairs on quantized embeddings and
+    reports the precision/recall/F1 change against float32 under metrics["quantization"].
+    chunked=True encodes long texts in pooled windows instead of truncating them.
+    backends=["sbert", "hashing"] also reports every backend's speed and quality side
+    by side under metrics["backends"].
+    """
+    with tracing.stage("dataset_loading"):
+        data = load_dataset(data_path)
 
-        print(f"Similarity Score: {score:.3f}, Predicted Label: {predicted_label}, True Label: {true_label}")
+    resumes, jds, labels, _ = pair_columns(data)
+    y_true = np.array([int(label) for label in labels])
 
-        if debug and score < threshold and true_label == 1:
+    print("📊 Evaluating dataset...\n")
+
+    emb, resume_idx, jd_idx = pair_embeddings(model, resumes, jds, cache, batch_size, chunked, pooling)
+    scores = np.einsum("ij,ij->i", emb[resume_idx], emb[jd_idx])
+    y_pred = (scores > threshold).astype(int)
+
+    for i, score in enumerate(scores):
+        if verbose:
+            print(f"Similarity Score: {score:.3f}, Predicted Label: {y_pred[i]}, True Label: {y_true[i]}")
+
+        if debug and score < threshold and y_true[i] == 1:
             print("\n⚠️ Low score but labeled as match:")
-            print("Resume Snippet:", resume[:200].replace("\n", " "), "...")
-            print("JD Snippet:", jd[:200].replace("\n", " "), "...\n")
+            print("Resume Snippet:", resumes[i][:200].replace("\n", " "), "...")
+            print("JD Snippet:", jds[i][:200].replace("\n", " "), "...\n")
 
     # Calculate metrics
-    accuracy = sum([yt == yp for yt, yp in zip(y_true, y_pred)]) / len(y_true)
-    precision = precision_score(y_true, y_pred, zero_division=0)
-    recall = recall_score(y_true, y_pred, zero_division=0)
-    f1 = f1_score(y_true, y_pred, zero_division=0)
+    metrics = classification_metrics(y_true, y_pred)
+
+    print(f"\n✅ Accuracy on test set with threshold {threshold}: {metrics['accuracy']:.2f}")
+    print(f"🎯 Precision: {metrics['precision']:.2f}")
+    print(f"🔁 Recall:    {metrics['recall']:.2f}")
+    print(f"📊 F1 Score:  {metrics['f1']:.2f}")
+
+    if cache is not None:
+        stats = cache.stats()
+        print(f"🗄️ Embedding cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.0%} hit rate)")
+
+    if quantization:
+        metrics["quantization"] = quantization_report(emb, resume_idx, jd_idx, y_true, threshold, quantization, metrics)
+        print(f"\n🗜️ Quantized embeddings vs float32 ({bytes_per_vector(emb.shape[1], 'float32')} bytes/vector):")
+        for dtype, result in metrics["quantization"].items():
+            delta = result["delta"]
+            print(f"   {dtype:<8} {result['bytes_per_vector']:>5} bytes/vector  "
+                  f"precision {delta['precision']:+.4f}  recall {delta['recall']:+.4f}  F1 {delta['f1']:+.4f}  "
+                  f"(max score error {result['max_score_error']:.4f})")
+
+    if backends:
+        metrics["backends"] = backend_report(resumes, jds, y_true, threshold, backends, batch_size)
+        print(f"\n⚖️ Encoder backends (uncached, {len(set(resumes) | set(jds))} distinct texts):")
+        print(f"   {'backend':<8} {'texts/s':>9}  {'P':>5} {'R':>5} {'F1':>5}  {'best F1':>7} @ threshold")
+        for backend, result in metrics["backends"].items():
+            if "error" in result:
+                print(f"   {backend:<8} unavailable: {result['error']}")
+                continue
+            print(f"   {backend:<8} {result['texts_per_sec']:>9.0f}  {result['precision']:>5.2f} {result['recall']:>5.2f} "
+                  f"{result['f1']:>5.2f}  {result['best_f1']:>7.2f} @ {result['best_threshold']:.3f}")
+
+    return metrics
+
+
+# ------------------ Threshold Calibration ------------------
+def score_dataset(model, data_path, cache=None, batch_size=64, scores_path=None, model_name=None):
+    """
+    Similarity score, label and category of every pair, computed once and saved to
+    scores_path (default: next to the dataset). Later calls with the same dataset
+    file and model load the saved scores instead of encoding anything. model_name
+    defaults to the name of the encoder actually used (see encoders.encoder_name).
+    """
+    model = resolve(model)
+    model_name = model_name or encoder_name(model)
+    digest = dataset_digest(data_path)
+    scores_path = scores_path or f"{os.path.splitext(data_path)[0]}.{model_name}.scores.npz"
+    if os.path.exists(scores_path):
+        with np.load(scores_path, allow_pickle=True) as saved:
+            if str(saved["dataset_sha256"]) == digest and str(saved["model_name"]) == model_name:
+                return {"scores": saved["scores"], "labels": saved["labels"], "categories": saved["categories"]}
+
+    resumes, jds, labels, categories = pair_columns(load_dataset(data_path))
+    scores = pair_scores(model, resumes, jds, cache, batch_size=batch_size)
+    result = {
+        "scores": scores.astype(np.float32),
+        "labels": np.array([int(label) for label in labels], dtype=np.int8),
+        "categories": np.array(categories, dtype=object),
+    }
+    tmp = scores_path + ".tmp.npz"
+    np.savez(tmp, dataset_sha256=digest, model_name=model_name, **result)
+    os.replace(tmp, scores_path)
+    return result
+
+
+def threshold_sweep(scores, labels):
+    """
+    Precision, recall, F1 and accuracy of `score > threshold` at every distinct
+    threshold, in one vectorized pass. The first threshold lies below every score
+    (everything predicted as a match).
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels).astype(bool)
+    order = np.argsort(scores, kind="stable")
+    sorted_scores, sorted_labels = scores[order], labels[order]
+
+    thresholds = np.unique(sorted_scores)
+    thresholds = np.concatenate([[thresholds[0] - 1e-6] if len(thresholds) else [0.0], thresholds])
+    # Pairs at or below each threshold are predicted as non-matches
+    below = np.searchsorted(sorted_scores, thresholds, side="right")
+    pos_below = np.concatenate([[0], np.cumsum(sorted_labels)])[below]
+    n_pos = int(labels.sum())
+    tp = n_pos - pos_below
+    fp = (len(scores) - below) - tp
+    tn = below - pos_below
+
+    predicted = tp + fp
+    precision = np.divide(tp, predicted, out=np.zeros(len(thresholds)), where=predicted > 0)
+    recall = tp / n_pos if n_pos else np.zeros(len(thresholds))
+    denominator = precision + recall
+    f1 = np.divide(2 * precision * recall, denominator, out=np.zeros(len(thresholds)), where=denominator > 0)
+    accuracy = (tp + tn) / max(len(scores), 1)
+    return {"thresholds": thresholds, "precision": precision, "recall": recall, "f1": f1, "accuracy": accuracy}
+
+
+def best_threshold(curves, metric="f1"):
+    """
+    Operating point that maximizes metric; ties go to the highest threshold.
+    """
+    values = curves[metric]
+    i = len(values) - 1 - int(np.argmax(values[::-1]))
+    return {name: float(curve[i]) for name, curve in curves.items()} | {"threshold": float(curves["thresholds"][i])}
+
+
+def calibrate(model, data_path, cache=None, batch_size=64, metric="f1", by_category=False, scores_path=None,
+              model_name=None):
+    """
+    Score the dataset once and sweep every threshold. Returns the curves and the
+    best operating point, plus one best point per category when by_category=True.
+    """
+    scored = score_dataset(model, data_path, cache, batch_size, scores_path, model_name)
+    curves = threshold_sweep(scored["scores"], scored["labels"])
+    best = best_threshold(curves, metric)
+    print(f"🎚️ Best {metric} threshold over {len(scored['scores'])} pairs: {best['threshold']:.3f} "
+          f"(precision {best['precision']:.2f}, recall {best['recall']:.2f}, F1 {best['f1']:.2f}, "
+          f"accuracy {best['accuracy']:.2f})")
+    if scored["labels"].min() == scored["labels"].max():
+        print("⚠️ The dataset has only one label, so the sweep cannot separate matches from non-matches.")
 
-    print(f"\n✅ Accuracy on test set with threshold {threshold}: {accuracy:.2f}")
-    print(f"🎯 Precision: {precision:.2f}")
-    print(f"🔁 Recall:    {recall:.2f}")
-    print(f"📊 F1 Score:  {f1:.2f}")
+    result = {"curves": curves, "best": best}
+    if by_category:
+        result["by_category"] = {}
+        categories = np.array(["" if c is None else str(c) for c in scored["categories"]])
+        for category in np.unique(categories):
+            rows = categories == category
+            point = best_threshold(threshold_sweep(scored["scores"][rows], scored["labels"][rows]), metric)
+            result["by_category"][category] = point | {"pairs": int(rows.sum())}
+            print(f"   {category or 'Uncategorized':<28} {int(rows.sum()):>6} pairs  threshold {point['threshold']:.3f}  "
+                  f"{metric} {point[metric]:.2f}")
+    return result
 
 
 if __name__ == "__main__":
+    import argparse
+
+    from encoders import BACKENDS, DEFAULT_BACKEND, get_encoder
+
+    parser = argparse.ArgumentParser(description="Evaluate or calibrate the resume matcher on a labeled dataset.")
+    parser.add_argument("--data", default="cleaned_resume_jd_dataset.json")
+    parser.add_argument("--threshold", type=float, default=0.05)
+    parser.add_argument("--calibrate", action="store_true", help="sweep every threshold on scores computed once")
+    parser.add_argument("--by-category", action="store_true", help="also calibrate one threshold per category")
+    parser.add_argument("--metric", choices=["f1", "accuracy", "precision", "recall"], default="f1")
+    parser.add_argument("--chunked", action="store_true", help="encode long texts in overlapping windows")
+    parser.add_argument("--pooling", choices=["mean", "max", "top_n"], default="mean")
+    parser.add_argument("--encoder", choices=BACKENDS, default=DEFAULT_BACKEND, help="embedding backend to evaluate")
+    parser.add_argument("--compare-backends", action="store_true", help="also report every backend side by side")
+    args = parser.parse_args()
+
+    model = get_encoder(args.encoder)
+    embedding_cache = EmbeddingCache(encoder_name(args.encoder))
+
+    if args.calibrate:
+        calibrate(model, args.data, cache=embedding_cache, metric=args.metric, by_category=args.by_category)
+        raise SystemExit
+
     # Evaluate on dataset
-    evaluate_dataset(model, 'cleaned_resume_jd_dataset.json', threshold=0.05, debug=True)
+    evaluate_dataset(model, args.data, threshold=args.threshold, debug=True, cache=embedding_cache,
+                     quantization=["float16", "int8"], chunked=args.chunked, pooling=args.pooling,
+                     backends=BACKENDS if args.compare_backends else None)
 
     # Optional sample test
     sample_resume1 = "Experienced Python developer with knowledge of machine learning and web development."
     sample_resume2 = "Graduate with project experience in AI-based resume screening systems and front-end development."
     sample_jd = "Looking for a front-end developer with experience in React and good understanding of machine learning."
 
-    compare_resumes(sample_resume1, sample_resume2, sample_jd, model, threshold=0.05)
+    compare_resumes(sample_resume1, sample_resume2, sample_jd, model, threshold=args.threshold, cache=embedding_cache,
+                    chunked=args.chunked, pooling=args.pooling)
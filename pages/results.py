@@ -1,135 +1,49 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 import io
+import report_export
+from charts import plot_bar_comparison, plot_pie_chart
+from ranking import generate_recommendations
 
-def display_results(results):
+def display_results(screening, page_size=10):
     st.subheader("📊 Results")
 
-    col1, col2 = st.columns(2)
-    with col1:
-        st.metric("Resume 1 Match", f"{results['score1'] * 100:.1f}%")
-        st.success(f"Matched Skills: {', '.join(results['matched_skills_1']) or 'None'}")
-        st.error(f"Missing Skills: {', '.join(results['missing_skills_1']) or 'None'}")
-        st.write(f"Resume 1 - {len(results['matched_skills_1'])} matched, {len(results['missing_skills_1'])} missing")
-    with col2:
-        st.metric("Resume 2 Match", f"{results['score2'] * 100:.1f}%")
-        st.success(f"Matched Skills: {', '.join(results['matched_skills_2']) or 'None'}")
-        st.error(f"Missing Skills: {', '.join(results['missing_skills_2']) or 'None'}")
-        st.write(f"Resume 2 - {len(results['matched_skills_2'])} matched, {len(results['missing_skills_2'])} missing")
-
     st.markdown("### 📌 Summary")
-    st.info(results['summary'])
+    st.info(screening.summary)
+
+    # Paginate so the browser only renders one page of candidates
+    n_pages = max(1, -(-len(screening) // page_size))
+    page = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, step=1)
+    page_results = screening.ranking((page - 1) * page_size, page * page_size)
+
+    for result in page_results:
+        st.metric(f"#{result['rank']} {result['name']} Match", f"{result['score'] * 100:.1f}%")
+        st.success(f"Matched Skills: {', '.join(result['matched_skills']) or 'None'}")
+        st.error(f"Missing Skills: {', '.join(result['missing_skills']) or 'None'}")
+        st.write(f"{result['name']} - {len(result['matched_skills'])} matched, {len(result['missing_skills'])} missing")
 
     st.markdown("### 📈 Bar Chart Comparison")
-    plot_bar_comparison(results['score1'], results['score2'])
+    plot_bar_comparison([r["name"] for r in page_results], [r["score"] for r in page_results])
 
     st.markdown("### 🧠 Skill Match Pie Charts")
-    skill_col1, skill_col2 = st.columns(2)
-    with skill_col1:
-        st.markdown("#### Resume 1")
-        plot_pie_chart(results['matched_skills_1'], results['missing_skills_1'], "Resume 1")
-    with skill_col2:
-        st.markdown("#### Resume 2")
-        plot_pie_chart(results['matched_skills_2'], results['missing_skills_2'], "Resume 2")
+    for result in page_results:
+        with st.expander(f"#{result['rank']} {result['name']}"):
+            plot_pie_chart(result['matched_skills'], result['missing_skills'], result['name'])
 
     st.markdown("### 💡 Recommendations")
-    st.markdown(generate_recommendations(results))
+    st.markdown(generate_recommendations(page_results, best=screening.ranking(0, 1)[0]))
 
     
 
-def plot_bar_comparison(score1, score2):
-    df = pd.DataFrame({"Resume": ["Resume 1", "Resume 2"], "Match Score": [score1 * 100, score2 * 100]})
-    fig, ax = plt.subplots(figsize=(6, 4))
-    sns.barplot(data=df, x="Resume", y="Match Score", palette=["#4CAF50", "#1976D2"], ax=ax)
-    ax.set_title("Resume Match Comparison")
-    for container in ax.containers:
-        ax.bar_label(container, fmt='%.1f%%')
-    st.pyplot(fig)
-
-def plot_pie_chart(matched, missing, title):
-    total = len(matched) + len(missing)
-    if total == 0:
-        st.write("No skills available to show chart.")
-        return
-
-    labels = [f'Matched ({len(matched)})', f'Missing ({len(missing)})']
-    sizes = [len(matched), len(missing)]
-    colors = ['#4CAF50', '#FF6F61']
-
-    fig, ax = plt.subplots()
-    _, _, _ = ax.pie(
-        sizes,
-        labels=labels,
-        colors=colors,
-        autopct='%1.1f%%',
-        startangle=90,
-        textprops={'fontsize': 10}
-    )
-    ax.axis('equal')
-    ax.set_title(f"{title} Skill Match")
-
-    st.markdown(f"**Matched Skills ({len(matched)}):** {', '.join(matched) or 'None'}")
-    st.markdown(f"**Missing Skills ({len(missing)}):** {', '.join(missing) or 'None'}")
-
-    st.pyplot(fig)
-
-def generate_recommendations(results):
-    recommendations = []
-
-    for i in [1, 2]:
-        missing = results[f'missing_skills_{i}']
-        if missing:
-            recommendations.append(f"**Resume {i}:** Consider adding these missing skills: *{', '.join(missing)}*.")
-        else:
-            recommendations.append(f"**Resume {i}:** All key job skills are covered. Great job!")
-
-    if results['score1'] > results['score2']:
-        recommendations.append("✅ **Resume 1 is a better match based on skills and similarity.**")
-    elif results['score2'] > results['score1']:
-        recommendations.append("✅ **Resume 2 is a better match based on skills and similarity.**")
-    else:
-        recommendations.append("🔄 **Both resumes have similar match scores.**")
-
-    return "\n\n".join(recommendations)
-
-def create_downloadable_report(results):
-    report = f"""
-📊 Resume Screening Report
-
-Resume 1 Match: {results['score1'] * 100:.1f}%
-Matched Skills: {', '.join(results['matched_skills_1']) or 'None'}
-Missing Skills: {', '.join(results['missing_skills_1']) or 'None'}
-
-Resume 2 Match: {results['score2'] * 100:.1f}%
-Matched Skills: {', '.join(results['matched_skills_2']) or 'None'}
-Missing Skills: {', '.join(results['missing_skills_2']) or 'None'}
-
-📌 Summary:
-{results['summary']}
-
-
-💡 Recommendations:
-{generate_recommendations(results)}
-"""
-    return report
-
 # ------------------ Main ------------------
-if "score1" in st.session_state and "score2" in st.session_state:
-    results_data = {
-        "score1": st.session_state["score1"],
-        "score2": st.session_state["score2"],
-        "matched_skills_1": st.session_state.get("matched_skills_1", []),
-        "missing_skills_1": st.session_state.get("missing_skills_1", []),
-        "matched_skills_2": st.session_state.get("matched_skills_2", []),
-        "missing_skills_2": st.session_state.get("missing_skills_2", []),
-        "summary": st.session_state.get("summary", "No summary available.")
-    }
-    display_results(results_data)
-
-    report_txt = create_downloadable_report(results_data)
-    st.download_button("📥 Download Report as TXT", data=report_txt, file_name="resume_comparison.txt")
+# The Home page stores the screening as one shared ScreeningResult
+if "screening" in st.session_state and len(st.session_state["screening"]):
+    screening = st.session_state["screening"]
+    display_results(screening)
+
+    report_format = st.selectbox("Report format", report_export.FORMATS, format_func=str.upper)
+    st.download_button(f"📥 Download Report as {report_format.upper()}",
+                       data=lambda: report_export.to_bytes(screening.candidates, report_format, screening.summary),
+                       file_name=f"resume_comparison.{report_format}", mime=report_export.MIME_TYPES[report_format])
 
 else:
     st.error("🚫 No results to display. Please compare resumes from the Home page first.")
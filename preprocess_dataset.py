@@ -1,47 +1,157 @@
-import pandas as pd
+"""
+Build a cleaned resume/JD pair dataset as JSONL with bounded memory.
+
+    python preprocess_dataset.py --resumes UpdatedResumeDataSet.csv --jds job_descriptions.csv
+
+The CSVs are read in chunks, filtered, paired, cleaned with clean_text and written
+line by line, so memory stays flat regardless of the number of rows.
+"""
+import argparse
 import json
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from clean_resume_dataset import clean_text
+from corpus_store import CorpusStore, is_store
+
+MIN_TEXT_LENGTH = 100
+
+
+# === Read ===
+def iter_texts(csv_path, column, chunksize=10_000, min_length=MIN_TEXT_LENGTH, category_column=None):
+    """
+    Yield the non-empty texts of one CSV column longer than min_length, chunk by chunk.
+    With category_column, yield (text, category) pairs instead. csv_path may also be
+    a corpus store, which is read in slices of chunksize rows.
+    """
+    if is_store(csv_path):
+        yield from _iter_store_texts(csv_path, column, chunksize, min_length, category_column)
+        return
+    import pandas as pd
+
+    columns = [column] if category_column is None else [column, category_column]
+    for chunk in pd.read_csv(csv_path, usecols=columns, chunksize=chunksize, dtype=str):
+        chunk = chunk.dropna(subset=[column])
+        texts = chunk[column]
+        if category_column is None:
+            rows = texts
+        else:
+            categories = chunk[category_column]
+            rows = zip(texts, categories.astype(object).where(categories.notna(), None))
+        for row, text in zip(rows, texts):
+            if len(text) > min_length:
+                yield row
+
+
+def _iter_store_texts(path, column, chunksize, min_length, category_column):
+    with CorpusStore(path) as store:
+        for start in range(0, len(store), chunksize):
+            for i, text in enumerate(store.texts(column, start, start + chunksize), start):
+                if len(text) > min_length:
+                    yield text if category_column is None else (text, store.category(i))
+
+
+def has_column(csv_path, column):
+    if is_store(csv_path):
+        with CorpusStore(csv_path) as store:
+            return column in store.fields or (column == store.manifest.get("category_column") and bool(store.category_names))
+    import pandas as pd
+
+    return column in pd.read_csv(csv_path, nrows=0).columns
+
+
+# === Pair ===
+def make_pair(resume, jd):
+    # resume is a text or a (text, category) pair
+    if isinstance(resume, tuple):
+        text, category = resume
+        return {'resume_text': text, 'job_description': jd, 'label': 1, 'category': category}
+    return {'resume_text': resume, 'job_description': jd, 'label': 1}  # Assume matched for initial testing
+
+
+def iter_pairs(resumes, jds, limit=None):
+    pairs = (make_pair(resume, jd) for resume, jd in zip(resumes, jds))
+    return islice(pairs, limit) if limit else pairs
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+# === Clean ===
+def clean_records(records):
+    return [{
+        **record,
+        'resume_text': clean_text(record['resume_text']),
+        'job_description': clean_text(record['job_description']),
+    } for record in records]
+
 
-# === Load CSVs ===
-resume_file = 'UpdatedResumeDataSet.csv'
-jd_file = 'job_descriptions.csv'
+def iter_cleaned(records, batch_size=1_000, workers=1):
+    """
+    Clean records in batches, optionally on a process pool. At most 2 * workers
+    batches are in flight, so a fast reader cannot outrun the cleaners.
+    """
+    batches = batched(records, batch_size)
+    if workers <= 1:
+        for batch in batches:
+            yield from clean_records(batch)
+        return
 
-try:
-    resume_df = pd.read_csv(resume_file)
-    jd_df = pd.read_csv(jd_file)
-except FileNotFoundError as e:
-    print(f"❌ File not found: {e.filename}")
-    exit()
+    with ProcessPoolExecutor(workers) as pool:
+        in_flight = deque()
+        for batch in batches:
+            in_flight.append(pool.submit(clean_records, batch))
+            if len(in_flight) >= 2 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
 
-# === Preview column names ===
-print("Resume Columns:", resume_df.columns)
-print("JD Columns:", jd_df.columns)
 
-# === Adjust column names as needed ===
-resume_column = 'Resume'
-jd_column = 'Job Description'  # <-- corrected this
+# === Write ===
+def write_jsonl(records, output_path):
+    tmp = output_path + ".tmp"
+    count = 0
+    with open(tmp, 'w', encoding='utf-8') as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    os.replace(tmp, output_path)
+    return count
 
 
-# === Drop NaNs and trim ===
-resumes = resume_df[resume_column].dropna().tolist()[:100]
-jds = jd_df[jd_column].dropna().tolist()[:100]
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--resumes', default='UpdatedResumeDataSet.csv')
+    parser.add_argument('--jds', default='job_descriptions.csv')
+    parser.add_argument('--resume-column', default='Resume')
+    parser.add_argument('--jd-column', default='Job Description')
+    parser.add_argument('--category-column', default='Category',
+                        help='resume column copied into each pair as "category" when present')
+    parser.add_argument('--output', default='cleaned_resume_jd_dataset.jsonl')
+    parser.add_argument('--limit', type=int, default=None, help='stop after this many pairs')
+    parser.add_argument('--chunksize', type=int, default=10_000, help='CSV rows read per chunk')
+    parser.add_argument('--workers', type=int, default=1, help='processes used for cleaning')
+    args = parser.parse_args(argv)
 
-# === Clean too-short entries ===
-resumes = [r for r in resumes if len(r) > 100]
-jds = [jd for jd in jds if len(jd) > 100]
+    for path in (args.resumes, args.jds):
+        if not os.path.exists(path):
+            print(f"❌ File not found: {path}")
+            sys.exit(1)
 
-# === Pair and create mock dataset ===
-min_len = min(len(resumes), len(jds), 50)
-mock_data = []
+    category_column = args.category_column if has_column(args.resumes, args.category_column) else None
+    resumes = iter_texts(args.resumes, args.resume_column, args.chunksize, category_column=category_column)
+    jds = iter_texts(args.jds, args.jd_column, args.chunksize)
+    pairs = iter_pairs(resumes, jds, args.limit)
+    count = write_jsonl(iter_cleaned(pairs, workers=args.workers), args.output)
 
-for i in range(min_len):
-    mock_data.append({
-        'resume_text': resumes[i],
-        'job_description': jds[i],
-        'label': 1  # Assume matched for initial testing
-    })
+    print(f"✅ Dataset saved with {count} pairs to {args.output}.")
 
-# === Save to JSON ===
-with open('small_resume_jd_dataset.json', 'w', encoding='utf-8') as f:
-    json.dump(mock_data, f, indent=2)
 
-print(f"✅ Dataset saved with {len(mock_data)} pairs.")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Scalar quantization of stored embeddings.
+
+    float32  4 bytes per value (no quantization)
+    float16  2 bytes per value
+    int8     1 byte per value plus one float32 scale per vector (symmetric, per vector)
+
+Scores are computed directly on the stored codes, one block at a time, so a
+quantized matrix is never expanded back to float32 as a whole.
+"""
+import numpy as np
+
+DTYPES = ("float32", "float16", "int8")
+SCORE_BLOCK_ROWS = 65_536
+
+
+def check_dtype(dtype):
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported embedding dtype {dtype!r}; choose one of {', '.join(DTYPES)}")
+    return dtype
+
+
+def bytes_per_vector(dim, dtype):
+    return dim * np.dtype(check_dtype(dtype)).itemsize + (4 if dtype == "int8" else 0)
+
+
+def quantize(vectors, dtype):
+    """
+    Return (codes, scales) for float vectors; scales is None unless dtype is int8.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if check_dtype(dtype) != "int8":
+        return vectors.astype(dtype), None
+    scales = np.abs(vectors).max(axis=-1) / 127
+    scales[scales == 0] = 1.0
+    codes = np.rint(vectors / scales[..., None]).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def dequantize(codes, scales=None):
+    vectors = np.asarray(codes, dtype=np.float32)
+    if scales is not None:
+        vectors = vectors * np.asarray(scales, dtype=np.float32)[..., None]
+    return vectors
+
+
+def dot_scores(codes, scales, query, block_rows=SCORE_BLOCK_ROWS):
+    """
+    codes @ query for a stored (n, dim) matrix and one float query vector. Only one
+    block of codes is converted at a time; int8 rows are rescaled after the product.
+    """
+    query = np.asarray(query, dtype=np.float32)
+    scores = np.empty(len(codes), dtype=np.float32)
+    for start in range(0, len(codes), block_rows):
+        stop = min(start + block_rows, len(codes))
+        block = codes[start:stop]
+        scores[start:stop] = block @ query if block.dtype == np.float32 else block.astype(np.float32) @ query
+        if scales is not None:
+            scores[start:stop] *= scales[start:stop]
+    return scores
+
+
+def row_dot(a_codes, a_scales, b_codes, b_scales):
+    """
+    Row-wise dot products of two equally shaped stored matrices.
+    """
+    scores = np.einsum("ij,ij->i", np.asarray(a_codes, dtype=np.float32), np.asarray(b_codes, dtype=np.float32))
+    if a_scales is not None:
+        scores *= a_scales
+    if b_scales is not None:
+        scores *= b_scales
+    return scores
@@ -0,0 +1,128 @@
+import heapq
+
+import numpy as np
+
+import tracing
+from skill_matcher import known_skills, extract_skills_from_jd, default_matcher, get_matcher
+
+
+def skill_match_matrix(resume_texts, jd_skills):
+    """
+    Build a (resumes x JD skills) boolean matrix with one matcher pass per resume.
+    """
+    matcher = default_matcher
+    if not all(skill in matcher._order for skill in jd_skills):
+        matcher = get_matcher(tuple(jd_skills))
+
+    matrix = np.zeros((len(resume_texts), len(jd_skills)), dtype=bool)
+    for i, text in enumerate(resume_texts):
+        _, _, offsets = matcher.match(text)
+        matrix[i] = [skill in offsets for skill in jd_skills]
+    return matrix
+
+
+def semantic_scores(model, resume_texts, job_desc, cache=None):
+    """
+    Cosine similarity of every resume to the job description as one matrix-vector product.
+    """
+    texts = list(resume_texts) + [job_desc]
+    with tracing.stage("model_encoding"):
+        emb = np.asarray(model.encode(texts) if cache is None else cache.encode(model, texts), dtype=np.float32)
+    emb /= np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+    return emb[:-1] @ emb[-1]
+
+
+def top_k(scores, k=None):
+    """
+    Indices of the k highest scores, best first. Ties keep upload order.
+    """
+    scores = list(scores)
+    k = len(scores) if k is None else min(k, len(scores))
+    return heapq.nlargest(k, range(len(scores)), key=scores.__getitem__)
+
+
+def rank_resumes(job_desc, resumes, k=None, model=None, semantic_weight=0.5, skills=known_skills, cache=None,
+                 dedup_threshold=None):
+    """
+    Rank any number of resumes against one job description.
+
+    resumes is a list of (name, text) pairs. The score is the share of JD skills a
+    resume covers; when a model is given it is blended with the SBERT similarity.
+    With a dedup_threshold and a model, only one resume per near-duplicate cluster is
+    encoded and its similarity is shared with the others, whose "duplicate_of" names
+    it; every resume is still skill-matched on its own text.
+    Returns (jd_skills, ranked) where ranked holds one result dict per candidate.
+    """
+    names = [name for name, _ in resumes]
+    texts = [text for _, text in resumes]
+    representatives = np.arange(len(texts))
+    if dedup_threshold is not None and model is not None and len(texts) > 1:
+        from dedup import find_duplicates
+        with tracing.stage("deduplication"):
+            representatives = find_duplicates(texts, dedup_threshold)
+
+    with tracing.stage("skill_extraction"):
+        jd_skills = extract_skills_from_jd(job_desc, skills)
+        matrix = skill_match_matrix(texts, jd_skills)
+    if jd_skills:
+        skill_scores = np.round(matrix.sum(axis=1) / len(jd_skills), 2)
+    else:
+        skill_scores = np.zeros(len(texts))
+
+    scores = skill_scores
+    similarity = None
+    if model is not None and texts:
+        unique, members = np.unique(representatives, return_inverse=True)
+        similarity = semantic_scores(model, [texts[i] for i in unique], job_desc, cache)[members]
+        scores = np.round((1 - semantic_weight) * skill_scores + semantic_weight * similarity, 2)
+
+    ranked = []
+    for rank, i in enumerate(top_k(scores, k), 1):
+        ranked.append({
+            "rank": rank,
+            "name": names[i],
+            "score": float(scores[i]),
+            "skill_score": float(skill_scores[i]),
+            "semantic_score": None if similarity is None else float(similarity[i]),
+            "matched_skills": [skill for skill, hit in zip(jd_skills, matrix[i]) if hit],
+            "missing_skills": [skill for skill, hit in zip(jd_skills, matrix[i]) if not hit],
+            "duplicate_of": None if representatives[i] == i else names[representatives[i]],
+        })
+    return jd_skills, ranked
+
+
+def summarize_ranking(ranked):
+    if not ranked:
+        return "No resumes were ranked."
+    best = ranked[0]
+    tied = [r for r in ranked if r["score"] == best["score"]]
+    if len(ranked) > 1 and len(tied) == len(ranked):
+        return f"All {len(ranked)} resumes are similarly aligned ({best['score']*100:.0f}%)."
+    if len(tied) > 1:
+        return f"{len(tied)} resumes share the best skill alignment ({best['score']*100:.0f}%), led by {best['name']}."
+    return f"{best['name']} has the best skill alignment ({best['score']*100:.0f}%) out of {len(ranked)} resumes."
+
+
+def recommendation(result):
+    missing = result["missing_skills"]
+    if missing:
+        return f"**#{result['rank']} {result['name']}:** Consider adding these missing skills: *{', '.join(missing)}*."
+    return f"**#{result['rank']} {result['name']}:** All key job skills are covered. Great job!"
+
+
+def best_match_line(best):
+    return f"✅ **{best['name']} is the best match based on skills and similarity.**"
+
+
+def generate_recommendations(ranked, best=None):
+    """
+    Recommendations for the given candidates; best is the overall top result when
+    ranked is only one page of a larger ranking.
+    """
+    recommendations = [recommendation(result) for result in ranked]
+
+    best = best or (ranked[0] if ranked else None)
+    if best is not None:
+        recommendations.append(best_match_line(best))
+
+    return "\n\n".join(recommendations)
@@ -0,0 +1,225 @@
+"""
+Streaming exports of a ranked screening as TXT, CSV, JSONL or XLSX.
+
+    for chunk in export(screening.candidates, "csv"):
+        out.write(chunk)
+    write_report(screening.candidates, "ranking.xlsx", summary=screening.summary)
+
+Every format is a generator of byte chunks. Candidates (result dicts or
+CandidateResult objects) are formatted one row at a time and handed out every
+CHUNK_ROWS rows, so write_report() keeps memory flat however many candidates there
+are. XLSX is written as a streamed zip of inline-string sheet XML, without an Excel
+library. Downloads from the app use to_bytes(): st.download_button holds the whole
+file in memory whatever its callable returns.
+"""
+import csv
+import io
+import json
+import os
+import re
+import zipfile
+from xml.sax.saxutils import escape
+
+from ranking import recommendation, best_match_line
+
+FORMATS = ("txt", "csv", "jsonl", "xlsx")
+MIME_TYPES = {
+    "txt": "text/plain",
+    "csv": "text/csv",
+    "jsonl": "application/jsonl",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+COLUMNS = ("rank", "name", "score", "skill_score", "semantic_score", "matched_skills", "missing_skills", "duplicate_of")
+CHUNK_ROWS = 1000
+
+
+def iter_records(candidates):
+    for candidate in candidates:
+        result = candidate.as_dict() if hasattr(candidate, "as_dict") else candidate
+        yield {column: result.get(column) for column in COLUMNS}
+
+
+def _flat(record):
+    # Spreadsheet rows: skill lists become "; "-separated cells
+    return [("; ".join(value) if isinstance(value, (list, tuple)) else value) for value in record.values()]
+
+
+def _drain(buffer):
+    data = buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+# ------------------ Formats ------------------
+def iter_csv(candidates):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for i, record in enumerate(iter_records(candidates), 1):
+        writer.writerow(_flat(record))
+        if i % CHUNK_ROWS == 0:
+            yield _drain(buffer)
+    yield _drain(buffer)
+
+
+def iter_jsonl(candidates):
+    lines = []
+    for record in iter_records(candidates):
+        lines.append(json.dumps(record, ensure_ascii=False))
+        if len(lines) == CHUNK_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def iter_txt(candidates, summary=""):
+    """
+    The plain-text report: one section per candidate, the summary, then one
+    recommendation per candidate. candidates is read twice, so pass a sequence.
+    """
+    parts, best = ["\n📊 Resume Screening Report\n\n"], None
+    for result in iter_records(candidates):
+        if best is not None:
+            parts.append("\n\n")
+        best = best or result
+        parts.append(f"""#{result['rank']} {result['name']} Match: {result['score'] * 100:.1f}%
+Matched Skills: {', '.join(result['matched_skills']) or 'None'}
+Missing Skills: {', '.join(result['missing_skills']) or 'None'}""")
+        if len(parts) >= 2 * CHUNK_ROWS:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+    parts.append(f"\n\n📌 Summary:\n{summary}\n\n💡 Recommendations:\n")
+
+    for i, result in enumerate(iter_records(candidates)):
+        if i:
+            parts.append("\n\n")
+        parts.append(recommendation(result))
+        if len(parts) >= 2 * CHUNK_ROWS:
+            yield "".join(parts).encode("utf-8")
+            parts = []
+    if best is not None:
+        parts.append("\n\n" + best_match_line(best))
+    parts.append("\n")
+    yield "".join(parts).encode("utf-8")
+
+
+class _ChunkSink:
+    """
+    Write-only, unseekable file object collecting what zipfile writes, so the
+    archive can be handed out piece by piece.
+    """
+
+    def __init__(self):
+        self._buffer = io.BytesIO()
+
+    def write(self, data):
+        return self._buffer.write(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        return _drain(self._buffer)
+
+
+_XML_HEADER = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+_DOC_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_XLSX_PARTS = {
+    "[Content_Types].xml": (
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        f'<workbook xmlns="{_MAIN_NS}" xmlns:r="{_DOC_REL}">'
+        '<sheets><sheet name="Ranking" sheetId="1" r:id="rId1"/></sheets></workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        f'<Relationships xmlns="{_REL_NS}">'
+        f'<Relationship Id="rId1" Type="{_DOC_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+# Control characters are not allowed in XML 1.0
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append("<c/>")
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f"<c><v>{value}</v></c>")
+        else:
+            text = escape(_XML_ILLEGAL.sub("", str(value)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def iter_xlsx(candidates):
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_DEFLATED) as archive:
+        for name, xml in _XLSX_PARTS.items():
+            archive.writestr(name, _XML_HEADER + xml)
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(f'{_XML_HEADER}<worksheet xmlns="{_MAIN_NS}"><sheetData>'.encode("utf-8"))
+            sheet.write(_xlsx_row(COLUMNS).encode("utf-8"))
+            for i, record in enumerate(iter_records(candidates), 1):
+                sheet.write(_xlsx_row(_flat(record)).encode("utf-8"))
+                if i % CHUNK_ROWS == 0:
+                    yield sink.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield sink.drain()
+
+
+# ------------------ Entry Points ------------------
+def export(candidates, fmt, summary=""):
+    """
+    Byte chunks of the report in one of FORMATS.
+    """
+    if fmt == "txt":
+        return iter_txt(candidates, summary)
+    if fmt == "csv":
+        return iter_csv(candidates)
+    if fmt == "jsonl":
+        return iter_jsonl(candidates)
+    if fmt == "xlsx":
+        return iter_xlsx(candidates)
+    raise ValueError(f"Unknown report format {fmt!r}; choose one of {', '.join(FORMATS)}")
+
+
+def write_report(candidates, path, fmt=None, summary=""):
+    """
+    Stream the report to path (format from the extension unless given); returns the bytes written.
+    """
+    fmt = fmt or os.path.splitext(path)[1].lstrip(".").lower()
+    tmp = path + ".tmp"
+    size = 0
+    with open(tmp, "wb") as f:
+        for chunk in export(candidates, fmt, summary):
+            f.write(chunk)
+            size += len(chunk)
+    os.replace(tmp, path)
+    return size
+
+
+def to_bytes(candidates, fmt, summary=""):
+    """
+    The whole report as bytes, for st.download_button's deferred data callable.
+    """
+    return b"".join(export(candidates, fmt, summary))
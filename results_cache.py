@@ -0,0 +1,136 @@
+"""
+Screening results shared across Streamlit sessions.
+
+A screening is keyed by the content of its inputs (job description text, resume
+names and bytes, scoring options and the skill taxonomy version), so submitting
+the same comparison again, from any session, is served from memory.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from skill_matcher import SKILL_TAXONOMY_VERSION
+
+MAX_CACHED_RESULTS = 128
+
+
+@dataclass(frozen=True, slots=True)
+class CandidateResult:
+    rank: int
+    name: str
+    score: float
+    skill_score: float
+    semantic_score: float | None
+    matched_skills: tuple
+    missing_skills: tuple
+    duplicate_of: str | None = None
+
+    @classmethod
+    def from_dict(cls, result):
+        return cls(
+            rank=result["rank"],
+            name=result["name"],
+            score=float(result["score"]),
+            skill_score=float(result["skill_score"]),
+            semantic_score=None if result["semantic_score"] is None else float(result["semantic_score"]),
+            matched_skills=tuple(result["matched_skills"]),
+            missing_skills=tuple(result["missing_skills"]),
+            duplicate_of=result.get("duplicate_of"),
+        )
+
+    def as_dict(self):
+        return {
+            "rank": self.rank,
+            "name": self.name,
+            "score": self.score,
+            "skill_score": self.skill_score,
+            "semantic_score": self.semantic_score,
+            "matched_skills": list(self.matched_skills),
+            "missing_skills": list(self.missing_skills),
+            "duplicate_of": self.duplicate_of,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class ScreeningResult:
+    """
+    One ranked screening: the JD skills, the candidates best first, the summary
+    line and the names of files that could not be read.
+    """
+    jd_skills: tuple
+    candidates: tuple
+    summary: str
+    skipped: tuple = ()
+
+    @classmethod
+    def from_ranking(cls, jd_skills, ranked, summary, skipped=()):
+        return cls(tuple(jd_skills), tuple(CandidateResult.from_dict(r) for r in ranked), summary, tuple(skipped))
+
+    def __len__(self):
+        return len(self.candidates)
+
+    def ranking(self, start=0, stop=None):
+        """
+        Candidates in [start, stop) as the ranking dicts returned by rank_resumes.
+        """
+        return [candidate.as_dict() for candidate in self.candidates[start:stop]]
+
+
+def screening_key(job_desc, resumes, semantic=False, semantic_weight=0.5, model_name=None, dedup_threshold=None):
+    """
+    Content hash of a screening request; resumes is a list of (name, bytes).
+    """
+    h = hashlib.sha256()
+    for part in (SKILL_TAXONOMY_VERSION, job_desc, f"{semantic}:{semantic_weight}:{model_name}:{dedup_threshold}"):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    for name, data in resumes:
+        h.update(name.encode("utf-8"))
+        h.update(b"\0")
+        h.update(hashlib.sha256(data).digest())
+    return h.hexdigest()
+
+
+class ResultCache:
+    """
+    Thread-safe LRU of ScreeningResult by screening_key, with hit/miss counters.
+    """
+
+    def __init__(self, max_entries=MAX_CACHED_RESULTS):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key, result):
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,196 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+
+class _Request:
+    __slots__ = ("texts", "future", "submitted")
+
+    def __init__(self, texts):
+        self.texts = texts
+        self.future = Future()
+        self.submitted = time.perf_counter()
+
+
+class ScoringService:
+    """
+    Local micro-batching front end for one encoder.
+
+    Concurrent encode() calls from any thread are queued on an asyncio loop running
+    in a background thread and coalesced into one encoder batch of up to
+    max_batch_size texts, waiting at most max_wait_ms for a batch to fill. The queue
+    holds at most max_queue_size requests; beyond that callers block (backpressure)
+    and get a TimeoutError after submit_timeout seconds.
+
+    The service has the same encode(texts, batch_size=...) method as the model, so it
+    can be passed anywhere a model is expected. name identifies the encoder's vectors
+    (see encoders.encoder_name).
+    """
+
+    def __init__(self, load_encoder, max_batch_size=64, max_wait_ms=10, max_queue_size=1024,
+                 submit_timeout=30, cache=None, latency_window=1000, name=None):
+        self._load_encoder = load_encoder
+        self._encoder = None
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.max_queue_size = max_queue_size
+        self.submit_timeout = submit_timeout
+        self.cache = cache
+
+        self.requests = 0
+        self.batches = 0
+        self.batched_texts = 0
+        self.latencies_ms = deque(maxlen=latency_window)
+
+        self._loop = None
+        self._queue = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # ------------------ Lifecycle ------------------
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                ready = threading.Event()
+                self._thread = threading.Thread(target=self._serve, args=(ready,), name="scoring-service", daemon=True)
+                self._thread.start()
+                ready.wait()
+        return self
+
+    def stop(self):
+        with self._lock:
+            if self._thread is not None:
+                asyncio.run_coroutine_threadsafe(self._queue.put(None), self._loop).result()
+                self._thread.join()
+                self._thread = None
+
+    def _serve(self, ready):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._queue = asyncio.Queue(self.max_queue_size)
+        ready.set()
+        try:
+            self._loop.run_until_complete(self._batch_forever())
+        finally:
+            self._loop.close()
+
+    # ------------------ Batching ------------------
+    async def _batch_forever(self):
+        loop = asyncio.get_running_loop()
+        carry = None
+        while True:
+            first = carry or await self._queue.get()
+            carry = None
+            if first is None:
+                return
+            batch, size = [first], len(first.texts)
+            deadline = loop.time() + self.max_wait
+            stopping = False
+            while size < self.max_batch_size:
+                try:
+                    request = await asyncio.wait_for(self._queue.get(), max(0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                if size + len(request.texts) > self.max_batch_size:
+                    carry = request  # starts the next batch instead of overfilling this one
+                    break
+                batch.append(request)
+                size += len(request.texts)
+
+            texts = [text for request in batch for text in request.texts]
+            try:
+                vectors = await loop.run_in_executor(None, self._encode_batch, texts)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+            else:
+                self.batches += 1
+                self.batched_texts += len(texts)
+                done = time.perf_counter()
+                start = 0
+                for request in batch:
+                    stop = start + len(request.texts)
+                    request.future.latency_ms = (done - request.submitted) * 1000
+                    self.latencies_ms.append(request.future.latency_ms)
+                    request.future.set_result(vectors[start:stop])
+                    start = stop
+            if stopping:
+                return
+
+    def _encode_batch(self, texts):
+        if self.cache is not None:
+            return self.cache.encode(self.encoder, texts, batch_size=self.max_batch_size)
+        return np.asarray(self.encoder.encode(texts, batch_size=self.max_batch_size))
+
+    # ------------------ Encoder ------------------
+    @property
+    def encoder(self):
+        """
+        The wrapped encoder, loaded on first use.
+        """
+        if self._encoder is None:
+            self._encoder = self._load_encoder()
+        return self._encoder
+
+    @property
+    def max_seq_length(self):
+        # Chunking sizes its windows from these, as for the bare SentenceTransformer
+        return getattr(self.encoder, "max_seq_length", None)
+
+    @property
+    def tokenizer(self):
+        return getattr(self.encoder, "tokenizer", None)
+
+    # ------------------ Client API ------------------
+    def submit(self, texts):
+        """
+        Queue texts for encoding and return a concurrent.futures.Future of their vectors.
+        Once done, the future's latency_ms holds the request's queueing + encode time.
+        """
+        self.start()
+        request = _Request(list(texts))
+        self.requests += 1
+        queued = asyncio.run_coroutine_threadsafe(self._queue.put(request), self._loop)
+        try:
+            queued.result(self.submit_timeout)
+        except BaseException:
+            queued.cancel()
+            raise
+        return request.future
+
+    async def encode_async(self, texts):
+        # submit() may block on a full queue, so keep it off the caller's event loop
+        future = await asyncio.get_running_loop().run_in_executor(None, self.submit, texts)
+        return await asyncio.wrap_future(future)
+
+    def encode(self, texts, batch_size=None, **kwargs):
+        if isinstance(texts, str):
+            return self.submit([texts]).result()[0]
+        return self.submit(texts).result()
+
+    def score(self, resume_texts, job_desc):
+        """
+        Cosine similarity of each resume to the job description.
+        """
+        emb = np.asarray(self.encode(list(resume_texts) + [job_desc]), dtype=np.float32)
+        emb /= np.maximum(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12)
+        return emb[:-1] @ emb[-1]
+
+    def stats(self):
+        latencies = np.array(self.latencies_ms) if self.latencies_ms else np.zeros(1)
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": self.batched_texts / self.batches if self.batches else 0.0,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "latency_p50_ms": float(np.percentile(latencies, 50)),
+            "latency_p95_ms": float(np.percentile(latencies, 95)),
+        }
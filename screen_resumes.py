@@ -0,0 +1,265 @@
+"""
+Headless bulk screening of a folder or zip archive of PDF/TXT resumes.
+
+    python screen_resumes.py --jd job_description.txt resumes/ --output results.jsonl
+    python screen_resumes.py --jd job_description.txt resumes.zip --output results.csv --semantic
+
+Parsing, skill matching and embedding run on a process pool and results are
+streamed to the output as batches finish. Re-running the same command after an
+interruption resumes from the checkpoint file next to the output.
+"""
+import argparse
+import csv
+import hashlib
+import heapq
+import json
+import os
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+import numpy as np
+
+from skill_matcher import known_skills, extract_skills_from_jd, SKILL_TAXONOMY_VERSION
+from text_extraction import extract_text
+from ranking import skill_match_matrix, semantic_scores
+
+RESUME_EXTENSIONS = (".pdf", ".txt")
+CSV_FIELDS = ["id", "score", "skill_score", "semantic_score", "matched_skills", "missing_skills", "error"]
+
+
+# ------------------ Input ------------------
+def iter_documents(source):
+    """
+    Yield (doc_id, location) for every resume in a directory or zip archive.
+    location is what a worker needs to read the bytes itself.
+    """
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for name in sorted(archive.namelist()):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    yield name, (source, name)
+    else:
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(RESUME_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, source), (None, path)
+
+
+def read_document(location):
+    archive_path, name = location
+    if archive_path is None:
+        with open(name, "rb") as f:
+            return f.read()
+    with zipfile.ZipFile(archive_path) as archive:
+        return archive.read(name)
+
+
+def batched(iterable, size):
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# ------------------ Worker ------------------
+def screen_batch(batch, job_desc, jd_skills, semantic_weight, use_model, encoder="sbert"):
+    """
+    Parse, skill-match and optionally embed one batch of documents in a worker process.
+    """
+    results, texts = [], []
+    for doc_id, location in batch:
+        try:
+            data = read_document(location)
+            text = extract_text(data, is_pdf=doc_id.lower().endswith(".pdf"), parallel=False)
+            texts.append(text)
+            results.append({"id": doc_id, "error": None})
+        except Exception as e:
+            results.append({"id": doc_id, "error": f"{type(e).__name__}: {e}"})
+
+    ok = [result for result in results if result["error"] is None]
+    matrix = skill_match_matrix(texts, jd_skills)
+    skill_scores = matrix.sum(axis=1) / len(jd_skills) if jd_skills else np.zeros(len(texts))
+    similarity = None
+    if use_model and texts:
+        from encoders import get_encoder
+        similarity = semantic_scores(get_encoder(encoder), texts, job_desc)
+
+    for i, result in enumerate(ok):
+        score = skill_scores[i]
+        if similarity is not None:
+            score = (1 - semantic_weight) * score + semantic_weight * similarity[i]
+        result.update({
+            "score": round(float(score), 4),
+            "skill_score": round(float(skill_scores[i]), 4),
+            "semantic_score": None if similarity is None else round(float(similarity[i]), 4),
+            "matched_skills": [skill for skill, hit in zip(jd_skills, matrix[i]) if hit],
+            "missing_skills": [skill for skill, hit in zip(jd_skills, matrix[i]) if not hit],
+        })
+    return results
+
+
+# ------------------ Output & Checkpoint ------------------
+class ResultWriter:
+    """
+    Appends results to a JSONL or CSV file and records finished ids in a checkpoint
+    file, whose first line holds the run's config_key. Output is synced before the
+    checkpoint, so a crash can at worst repeat the rows of the batch that was being written.
+    """
+
+    def __init__(self, output_path, checkpoint_path, config_key):
+        self.format = "csv" if output_path.lower().endswith(".csv") else "jsonl"
+        new_file = not os.path.exists(output_path) or os.path.getsize(output_path) == 0
+        self._out = open(output_path, "a", encoding="utf-8", newline="")
+        new_checkpoint = not os.path.exists(checkpoint_path) or os.path.getsize(checkpoint_path) == 0
+        self._checkpoint = open(checkpoint_path, "a", encoding="utf-8")
+        if new_checkpoint:
+            self._checkpoint.write(f"config {config_key}\n")
+        if self.format == "csv":
+            self._csv = csv.DictWriter(self._out, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            if new_file:
+                self._csv.writeheader()
+
+    def write(self, results):
+        for result in results:
+            if self.format == "csv":
+                row = dict(result)
+                row["matched_skills"] = "; ".join(result.get("matched_skills", []))
+                row["missing_skills"] = "; ".join(result.get("missing_skills", []))
+                self._csv.writerow(row)
+            else:
+                self._out.write(json.dumps(result) + "\n")
+        self._out.flush()
+        os.fsync(self._out.fileno())
+
+        self._checkpoint.write("".join(result["id"] + "\n" for result in results))
+        self._checkpoint.flush()
+        os.fsync(self._checkpoint.fileno())
+
+    def close(self):
+        self._out.close()
+        self._checkpoint.close()
+
+
+def config_key(job_desc, use_model=False, semantic_weight=0.5, encoder="sbert"):
+    """
+    Hash of everything that decides a result: the job description, the skill
+    taxonomy and the scoring options.
+    """
+    options = "skills"
+    if use_model:
+        from encoders import encoder_name
+        options = f"semantic:{semantic_weight}:{encoder_name(encoder)}"
+    h = hashlib.sha256()
+    for part in (SKILL_TAXONOMY_VERSION, job_desc, options):
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def load_checkpoint(checkpoint_path, key):
+    """
+    Ids already screened by a run with the same config_key. A checkpoint of another
+    job description or other scoring options is refused rather than resumed.
+    """
+    if not os.path.exists(checkpoint_path) or os.path.getsize(checkpoint_path) == 0:
+        return set()
+    with open(checkpoint_path, encoding="utf-8") as f:
+        if f.readline().rstrip("\n") != f"config {key}":
+            sys.exit(f"❌ {checkpoint_path} belongs to a run with another job description or scoring options; "
+                     f"choose a new --output or delete the output and its checkpoint.")
+        return {line.rstrip("\n") for line in f if line.strip()}
+
+
+# ------------------ Pipeline ------------------
+def screen(job_desc, source, output_path, workers=None, batch_size=32, use_model=False,
+           semantic_weight=0.5, top=10, checkpoint_path=None, encoder="sbert"):
+    checkpoint_path = checkpoint_path or output_path + ".checkpoint"
+    key = config_key(job_desc, use_model, semantic_weight, encoder)
+    done = load_checkpoint(checkpoint_path, key)
+    if done:
+        print(f"↩️ Resuming: {len(done)} resumes already screened")
+
+    jd_skills = extract_skills_from_jd(job_desc, known_skills)
+    print(f"📋 Job description skills ({len(jd_skills)}): {', '.join(jd_skills) or 'None'}")
+
+    todo = ((doc_id, location) for doc_id, location in iter_documents(source) if doc_id not in done)
+    batches = batched(todo, batch_size)
+    writer = ResultWriter(output_path, checkpoint_path, key)
+    best = []
+    screened = failed = 0
+    start = time.perf_counter()
+
+    def collect(results):
+        nonlocal screened, failed
+        writer.write(results)
+        screened += len(results)
+        for result in results:
+            if result["error"]:
+                failed += 1
+                continue
+            heapq.heappush(best, (result["score"], result["id"]))
+            if len(best) > top:
+                heapq.heappop(best)
+        print(f"\r⏳ {screened} screened ({screened / (time.perf_counter() - start):.1f}/s)", end="", flush=True)
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers) as pool:
+        # Keep a bounded number of batches in flight so memory stays flat
+        pending = set()
+        try:
+            for batch in batches:
+                pending.add(pool.submit(screen_batch, batch, job_desc, jd_skills, semantic_weight, use_model, encoder))
+                if len(pending) >= workers * 2:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        collect(future.result())
+            for future in wait(pending).done:
+                collect(future.result())
+        finally:
+            writer.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✅ Screened {screened} resumes in {elapsed:.1f}s ({failed} failed). Results: {output_path}")
+    if best:
+        print(f"🏆 Top {len(best)} of this run:")
+        for rank, (score, doc_id) in enumerate(sorted(best, reverse=True), 1):
+            print(f"  #{rank} {doc_id}: {score * 100:.1f}%")
+
+
+def main(argv=None):
+    from encoders import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Screen a folder or zip archive of resumes against a job description.")
+    parser.add_argument("source", help="directory or .zip of PDF/TXT resumes")
+    parser.add_argument("--jd", required=True, help="path to a text file holding the job description")
+    parser.add_argument("--output", required=True, help="results file (.jsonl or .csv)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--batch-size", type=int, default=32, help="resumes per worker task")
+    parser.add_argument("--semantic", action="store_true", help="blend in embedding similarity (each worker loads the encoder)")
+    parser.add_argument("--encoder", choices=BACKENDS, default="sbert",
+                        help="embedding backend for --semantic; hashing is an offline first-pass tier")
+    parser.add_argument("--semantic-weight", type=float, default=0.5)
+    parser.add_argument("--top", type=int, default=10, help="how many best matches to print at the end")
+    parser.add_argument("--checkpoint", default=None, help="checkpoint file (default: <output>.checkpoint)")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.source):
+        sys.exit(f"❌ Not found: {args.source}")
+    with open(args.jd, encoding="utf-8") as f:
+        job_desc = f.read()
+
+    screen(job_desc, args.source, args.output, workers=args.workers, batch_size=args.batch_size,
+           use_model=args.semantic, semantic_weight=args.semantic_weight, top=args.top,
+           checkpoint_path=args.checkpoint, encoder=args.encoder)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,338 @@
+"""
+Precomputed skill bitset index over the resume corpus.
+
+    python skill_index.py build --csv UpdatedResumeDataSet.csv
+    python skill_index.py query "docker AND kubernetes AND NOT java"
+    python skill_index.py coverage --jd job_description.txt
+    python skill_index.py histogram --category "Data Science"
+
+Each resume's skills from the taxonomy are stored as one row of packed uint64
+words, so skill filters, JD coverage and per-category counts are vectorized
+bitwise operations over the whole corpus instead of a skill scan per resume.
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+import numpy as np
+
+from skill_matcher import known_skills, get_matcher, extract_skills_from_jd
+
+DEFAULT_INDEX_PATH = "resume_skills.npz"
+WORD_BITS = 64
+
+
+# ------------------ Popcount ------------------
+if hasattr(np, "bitwise_count"):  # NumPy >= 2.0
+    def popcount(words):
+        return np.bitwise_count(words)
+else:
+    _BYTE_COUNTS = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+    def popcount(words):
+        words = np.ascontiguousarray(words, dtype=np.uint64)
+        counts = _BYTE_COUNTS[words.view(np.uint8)].reshape(words.shape + (8,))
+        return counts.sum(axis=-1, dtype=np.uint8)
+
+
+# ------------------ Query Parsing ------------------
+_TOKEN = re.compile(r'\s*(?:(\()|(\))|"([^"]*)"|\b(AND|OR|NOT)\b|((?:(?!\b(?:AND|OR|NOT)\b)[^()"])+))', re.IGNORECASE)
+
+
+def tokenize(query):
+    """
+    Split a query into ("(", ")", "AND", "OR", "NOT", ("skill", name)) tokens.
+    Skills may contain spaces ("machine learning") or be quoted.
+    """
+    tokens, pos = [], 0
+    query = query.strip()
+    while pos < len(query):
+        m = _TOKEN.match(query, pos)
+        if m is None or m.end() == pos:
+            raise ValueError(f"Cannot parse skill query at: {query[pos:]!r}")
+        pos = m.end()
+        lparen, rparen, quoted, operator, bare = m.groups()
+        if lparen or rparen:
+            tokens.append(lparen or rparen)
+        elif operator:
+            tokens.append(operator.upper())
+        else:
+            name = (quoted if quoted is not None else bare).strip().lower()
+            if name:
+                tokens.append(("skill", name))
+    return tokens
+
+
+def parse_query(query):
+    """
+    Parse a boolean skill query into a nested tuple tree:
+    ("skill", name) | ("not", node) | ("and", left, right) | ("or", left, right).
+    NOT binds tighter than AND, which binds tighter than OR.
+    """
+    tokens = tokenize(query)
+    pos = 0
+
+    def peek():
+        return tokens[pos] if pos < len(tokens) else None
+
+    def take(expected=None):
+        nonlocal pos
+        token = peek()
+        if token is None or (expected is not None and token != expected):
+            raise ValueError(f"Expected {expected or 'a skill'} in skill query: {query!r}")
+        pos += 1
+        return token
+
+    def parse_or():
+        node = parse_and()
+        while peek() == "OR":
+            take()
+            node = ("or", node, parse_and())
+        return node
+
+    def parse_and():
+        node = parse_not()
+        while peek() == "AND":
+            take()
+            node = ("and", node, parse_not())
+        return node
+
+    def parse_not():
+        if peek() == "NOT":
+            take()
+            return ("not", parse_not())
+        if peek() == "(":
+            take()
+            node = parse_or()
+            take(")")
+            return node
+        token = take()
+        if not isinstance(token, tuple):
+            raise ValueError(f"Unexpected {token!r} in skill query: {query!r}")
+        return token
+
+    tree = parse_or()
+    if peek() is not None:
+        raise ValueError(f"Unexpected {peek()!r} in skill query: {query!r}")
+    return tree
+
+
+# ------------------ Index ------------------
+class SkillIndex:
+    """
+    Rows of packed skill bits (one bit per taxonomy skill) for every indexed resume.
+
+    Rows are appended with add(); adding an id that is already indexed overwrites
+    its row in place. The bit matrix grows by doubling, like a list.
+    """
+
+    def __init__(self, skills=None, capacity=1024):
+        self.matcher = get_matcher(tuple(skills or known_skills))
+        self.skills = self.matcher.skills
+        self.n_words = max(1, -(-len(self.skills) // WORD_BITS))
+        self.bits = np.zeros((capacity, self.n_words), dtype=np.uint64)
+        self.size = 0
+        self.ids = []
+        self.categories = []
+        self._rows = {}
+
+    def __len__(self):
+        return self.size
+
+    def skill_bit(self, skill):
+        try:
+            i = self.matcher._order[skill.lower()]
+        except KeyError:
+            raise ValueError(f"Unknown skill: {skill!r}") from None
+        return i // WORD_BITS, np.uint64(1 << (i % WORD_BITS))
+
+    def skill_mask(self, skills):
+        """
+        Packed word vector with the bits of the given skills set.
+        """
+        mask = np.zeros(self.n_words, dtype=np.uint64)
+        for skill in skills:
+            word, bit = self.skill_bit(skill)
+            mask[word] |= bit
+        return mask
+
+    def encode(self, text):
+        _, _, offsets = self.matcher.match(text)
+        return self.skill_mask(offsets)
+
+    def add(self, texts, ids, categories=None):
+        """
+        Match and index texts; an id that is already indexed is re-indexed in place.
+        """
+        categories = categories or [None] * len(ids)
+        for text, doc_id, category in zip(texts, ids, categories):
+            row = self._rows.get(doc_id)
+            if row is None:
+                row = self.size
+                if row == len(self.bits):
+                    self.bits = np.concatenate([self.bits, np.zeros_like(self.bits)])
+                self.size += 1
+                self.ids.append(doc_id)
+                self.categories.append(category)
+                self._rows[doc_id] = row
+            else:
+                self.categories[row] = category
+            self.bits[row] = self.encode(text)
+
+    # === Queries ===
+    def _column(self, skill):
+        word, bit = self.skill_bit(skill)
+        return (self.bits[:self.size, word] & bit) != 0
+
+    def _evaluate(self, node):
+        kind = node[0]
+        if kind == "skill":
+            return self._column(node[1])
+        if kind == "not":
+            return ~self._evaluate(node[1])
+        left, right = self._evaluate(node[1]), self._evaluate(node[2])
+        return left & right if kind == "and" else left | right
+
+    def query(self, query):
+        """
+        Boolean mask over the indexed rows for a query such as
+        "docker AND kubernetes AND NOT java" or "(aws OR azure) AND terraform".
+        """
+        return self._evaluate(parse_query(query))
+
+    def search(self, query):
+        return [self.ids[row] for row in np.flatnonzero(self.query(query))]
+
+    def has_all(self, skills):
+        """
+        Rows that have every given skill, as one AND over the packed words.
+        """
+        mask = self.skill_mask(skills)
+        return np.all((self.bits[:self.size] & mask) == mask, axis=1)
+
+    def coverage(self, jd_skills):
+        """
+        Fraction of the JD skills each indexed resume covers.
+        """
+        mask = self.skill_mask(jd_skills)
+        total = int(popcount(mask).sum())
+        if total == 0:
+            return np.zeros(self.size)
+        return popcount(self.bits[:self.size] & mask).sum(axis=1) / total
+
+    def skill_counts(self, rows=None):
+        """
+        Number of resumes having each skill, in taxonomy order.
+        """
+        bits = self.bits[:self.size] if rows is None else self.bits[:self.size][rows]
+        unpacked = np.unpackbits(bits.view(np.uint8), axis=1, bitorder="little")
+        return unpacked[:, :len(self.skills)].sum(axis=0, dtype=np.int64)
+
+    def category_histograms(self):
+        """
+        {category: per-skill resume counts} for every category in the index.
+        """
+        categories = np.array(["" if c is None else c for c in self.categories], dtype=object)
+        names, codes = np.unique(categories, return_inverse=True)
+        return {name: self.skill_counts(codes == i) for i, name in enumerate(names)}
+
+    # === Persistence ===
+    def save(self, path=DEFAULT_INDEX_PATH):
+        tmp = path + ".tmp.npz"
+        np.savez(
+            tmp, bits=self.bits[:self.size], skills=np.array(self.skills),
+            ids=np.array(self.ids, dtype=object), categories=np.array(self.categories, dtype=object),
+        )
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        with np.load(path, allow_pickle=True) as data:
+            skills = data["skills"].tolist()
+            index = cls(skills, capacity=max(1, len(data["ids"])))
+            index.size = len(data["ids"])
+            index.bits[:index.size] = data["bits"]
+            index.ids = data["ids"].tolist()
+            index.categories = data["categories"].tolist()
+        index._rows = {doc_id: row for row, doc_id in enumerate(index.ids)}
+        return index
+
+
+# ------------------ Build & Query ------------------
+def build_index(csv_path, index_path=DEFAULT_INDEX_PATH, update=False):
+    """
+    Index the skills of every resume of a CSV. With update=True only resumes whose
+    id is not in the existing index yet are matched and appended.
+    """
+    from vector_index import read_corpus
+
+    index = SkillIndex.load(index_path) if update and os.path.exists(index_path) else SkillIndex()
+    if index.skills != get_matcher(tuple(known_skills)).skills:
+        sys.exit("❌ The skill list changed since the index was built; rebuild it without --update.")
+    rows = [row for row in read_corpus(csv_path) if row[0] not in index._rows]
+    if len(index):
+        print(f"↩️ {len(index)} resumes already indexed, matching {len(rows)} new ones")
+    index.add([text for _, _, text in rows], [doc_id for doc_id, _, _ in rows], [category for _, category, _ in rows])
+    index.save(index_path)
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the resume skill index.")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="index the skills of every resume in a CSV")
+    build.add_argument("--csv", default="UpdatedResumeDataSet.csv")
+    build.add_argument("--update", action="store_true", help="match only resumes not in the existing index yet and append them")
+    query = sub.add_parser("query", help='resumes matching a query such as "docker AND NOT java"')
+    query.add_argument("expression")
+    query.add_argument("--limit", type=int, default=20)
+    coverage = sub.add_parser("coverage", help="resumes ranked by coverage of a job description's skills")
+    coverage.add_argument("--jd", required=True, help="path to a text file holding the job description")
+    coverage.add_argument("-k", type=int, default=10)
+    histogram = sub.add_parser("histogram", help="most common skills per category")
+    histogram.add_argument("--category", default=None)
+    histogram.add_argument("--top", type=int, default=10)
+    args = parser.parse_args(argv)
+
+    if args.command == "build":
+        start = time.perf_counter()
+        index = build_index(args.csv, args.index, update=args.update)
+        print(f"✅ Indexed skills of {len(index)} resumes into {args.index} in {time.perf_counter() - start:.1f}s")
+        return
+
+    index = SkillIndex.load(args.index)
+    start = time.perf_counter()
+    if args.command == "query":
+        try:
+            matches = index.search(args.expression)
+        except ValueError as e:
+            sys.exit(f"❌ {e}")
+        elapsed = (time.perf_counter() - start) * 1000
+        for doc_id in matches[:args.limit]:
+            print(f"row {doc_id:<6} {index.categories[index._rows[doc_id]]}")
+        print(f"⚡ {len(matches)} of {len(index)} resumes match ({elapsed:.2f} ms)")
+
+    elif args.command == "coverage":
+        with open(args.jd, encoding="utf-8") as f:
+            jd_skills = extract_skills_from_jd(f.read(), known_skills)
+        scores = index.coverage(jd_skills)
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"📋 Job description skills ({len(jd_skills)}): {', '.join(jd_skills) or 'None'}")
+        for rank, row in enumerate(np.argsort(-scores, kind="stable")[:args.k], 1):
+            print(f"#{rank:<3} row {index.ids[row]:<6} {scores[row] * 100:5.1f}%  {index.categories[row]}")
+        print(f"⚡ Scored {len(index)} resumes in {elapsed:.2f} ms")
+
+    else:
+        histograms = index.category_histograms()
+        if args.category is not None:
+            histograms = {args.category: histograms.get(args.category, np.zeros(len(index.skills), dtype=np.int64))}
+        for category, counts in histograms.items():
+            top = [(index.skills[i], int(counts[i])) for i in np.argsort(-counts, kind="stable")[:args.top] if counts[i]]
+            print(f"📊 {category or 'Uncategorized'}: " + ", ".join(f"{skill} ({n})" for skill, n in top))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+import hashlib
+import re
+from functools import lru_cache
+
+# ------------------ Known Skills List ------------------
+known_skills = [
+    # Frontend & Web
+    "html", "css", "scss", "sass", "javascript", "typescript", "react", "redux",
+    "next.js", "vue.js", "angular", "bootstrap", "tailwind css", "jquery",
+    "responsive design", "web accessibility", "ui/ux", "figma", "adobe xd",
+
+    # Backend & Core Programming
+    "java", "spring", "spring boot", "hibernate", "rest api", "restful apis",
+    "microservices", "servlets", "jsp", "sql", "mysql", "postgresql", "mongodb",
+    "oracle", "node.js", "express.js", "php", "c", "c++", "c#", ".net", "flask", "django",
+
+    # Android Development
+    "android", "kotlin", "java for android", "android studio", "xml", "firebase",
+    "retrofit", "room", "jetpack", "mvvm", "mvp", "jetpack compose", "google maps api",
+    "material design", "rest", "json", "application design", "application development",
+    "play store deployment", "android sdk", "lifecycle management",
+
+    # DevOps & Cloud
+    "git", "github", "gitlab", "bitbucket", "jenkins", "docker", "kubernetes",
+    "aws", "gcp", "azure", "ci/cd", "terraform", "ansible", "helm", "monitoring",
+    "grafana", "prometheus", "logstash", "devops tools",
+
+    # Data Science & Machine Learning
+    "python", "r", "pandas", "numpy", "scikit-learn", "matplotlib", "seaborn",
+    "tensorflow", "pytorch", "keras", "xgboost", "lightgbm", "mlops", "mlflow",
+    "airflow", "data preprocessing", "model evaluation", "feature engineering",
+
+    # NLP
+    "nlp", "text preprocessing", "nltk", "spacy", "transformers", "bert", "gpt",
+    "hugging face", "langchain", "text classification", "sentiment analysis",
+    "topic modeling", "ner", "text summarization",
+
+    # Tools & Platforms
+    "jupyter", "colab", "vs code", "pycharm", "eclipse", "intellij",
+    "postman", "swagger", "docker hub", "heroku", "netlify", "streamlit",
+
+    # BI & Analytics
+    "power bi", "tableau", "excel", "data visualization", "data analysis",
+    "dash", "looker", "metabase", "superset",
+
+    # Software Engineering Practices
+    "agile", "scrum", "jira", "confluence", "uml", "software development lifecycle",
+    "system design", "api design", "unit testing", "integration testing", "test cases",
+
+    # Soft Skills / Misc
+    "problem solving", "communication", "teamwork", "critical thinking",
+    "debugging", "adaptability", "leadership", "collaboration",
+    "time management", "presentation", "analytical thinking", "creativity"
+]
+
+# Changes whenever the skill list does, so results cached under an older list are not reused
+SKILL_TAXONOMY_VERSION = hashlib.sha256("\n".join(known_skills).encode("utf-8")).hexdigest()[:12]
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == "_"
+
+
+def _trie_to_regex(node, last_char):
+    """
+    Turn a character trie into a regex fragment. Shared prefixes are emitted once,
+    so the regex engine walks the trie instead of trying every skill in turn.
+    """
+    branches = [re.escape(ch) + _trie_to_regex(child, ch) for ch, child in sorted(node.items()) if ch != ""]
+    if "" in node:
+        # A skill ends here. Skills ending in a letter/digit need a word boundary
+        # ("r" must not match inside "react"); ones ending in "+", "#", ... don't.
+        branches.append(r"(?!\w)" if _is_word_char(last_char) else "")
+
+    if len(branches) == 1:
+        return branches[0]
+    return "(?:" + "|".join(branches) + ")"
+
+
+class SkillMatcher:
+    """
+    Finds every skill of a taxonomy in a text with one compiled regex pass.
+
+    A skill matches wherever it occurs as a whole word: "r" no longer matches inside
+    "react" and "java" no longer matches inside "javascript". Overlapping skills are
+    all reported ("spring boot" also yields "spring").
+    """
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(skill.lower() for skill in skills))
+        self._order = {skill: i for i, skill in enumerate(self.skills)}
+
+        word_start, other_start = {}, {}
+        for skill in self.skills:
+            node = word_start if _is_word_char(skill[0]) else other_start
+            for ch in skill:
+                node = node.setdefault(ch, {})
+            node[""] = True
+
+        alternatives = []
+        if word_start:
+            alternatives.append(r"(?<!\w)" + _trie_to_regex(word_start, ""))
+        if other_start:
+            alternatives.append(_trie_to_regex(other_start, ""))
+        # The lookahead makes every match zero-width, so matches starting inside a
+        # longer skill ("android" in "java for android") are still found.
+        self.pattern = re.compile("(?=(" + "|".join(alternatives or ["(?!)"]) + "))")
+
+        # The regex reports the longest skill at each start offset; shorter skills
+        # that are whole-word prefixes of it ("spring" in "spring boot") are implied.
+        self._implied = {}
+        for skill in self.skills:
+            node = word_start if _is_word_char(skill[0]) else other_start
+            implied = []
+            for i, ch in enumerate(skill[:-1], 1):
+                node = node[ch]
+                if "" in node and (not _is_word_char(ch) or not _is_word_char(skill[i])):
+                    implied.append(skill[:i])
+            self._implied[skill] = implied
+
+    def match(self, text):
+        """
+        Scan the text once and return (matched, missing, offsets).
+
+        matched and missing keep the taxonomy order; offsets maps each matched skill to
+        its (start, end) positions in the lowercased text.
+        """
+        offsets = {}
+        for m in self.pattern.finditer(text.lower()):
+            start = m.start()
+            skill = m.group(1)
+            for hit in [skill] + self._implied[skill]:
+                offsets.setdefault(hit, []).append((start, start + len(hit)))
+
+        matched = sorted(offsets, key=self._order.__getitem__)
+        missing = [skill for skill in self.skills if skill not in offsets]
+        return matched, missing, offsets
+
+
+@lru_cache(maxsize=64)
+def get_matcher(skills):
+    """
+    Return a compiled matcher for a tuple of skills, reusing earlier compilations.
+    """
+    return SkillMatcher(skills)
+
+
+default_matcher = get_matcher(tuple(known_skills))
+
+
+def extract_skills_from_jd(jd_text, known_skills):
+    jd_skills, _, _ = get_matcher(tuple(known_skills)).match(jd_text)
+    return jd_skills
+
+
+def extract_skills(text, skill_list):
+    skill_list = [skill.lower() for skill in skill_list]
+    # JD skills always come from the full taxonomy, so the startup matcher can be
+    # reused and filtered instead of compiling one per job description.
+    if all(skill in default_matcher._order for skill in skill_list):
+        _, _, offsets = default_matcher.match(text)
+    else:
+        _, _, offsets = get_matcher(tuple(skill_list)).match(text)
+    found = [skill for skill in skill_list if skill in offsets]
+    missing = [skill for skill in skill_list if skill not in offsets]
+    return found, missing
@@ -0,0 +1,32 @@
+from functools import lru_cache
+
+import pytest
+
+import charts
+from benchmarks.bench_charts import measure
+
+# RSS growth allowed after warm-up, beyond the bounded chart cache itself
+MAX_GROWTH_MB = 20.0
+CACHE_SIZE = 8
+
+
+@pytest.fixture
+def small_chart_cache(monkeypatch):
+    # The same renderers behind a small cache, so evictions start after a few renders
+    for name in ("render_bar_chart", "render_pie_chart"):
+        monkeypatch.setattr(charts, name, lru_cache(maxsize=CACHE_SIZE)(getattr(charts, name).__wrapped__))
+    monkeypatch.setattr(charts, "MAX_CACHED_CHARTS", CACHE_SIZE)
+
+
+@pytest.mark.parametrize("distinct,renders", [(4, 1_000), (10**9, 100)], ids=["cache hits", "cache misses"])
+def test_chart_memory_stays_flat(small_chart_cache, distinct, renders):
+    _, growth = measure(renders, distinct)
+    assert growth <= MAX_GROWTH_MB
+    assert charts.render_bar_chart.cache_info().currsize <= CACHE_SIZE
+
+
+def test_charts_leave_no_pyplot_figures(small_chart_cache):
+    import matplotlib.pyplot as plt
+
+    measure(20, 10**9)
+    assert plt.get_fignums() == []
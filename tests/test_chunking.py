@@ -0,0 +1,52 @@
+import re
+
+import numpy as np
+
+import match_model
+
+
+class SubwordTokenizer:
+    """
+    Fast-tokenizer stand-in: every word is split into pieces of at most 3 characters,
+    so a text has more tokens than words, as with WordPiece.
+    """
+
+    def __call__(self, text, add_special_tokens=False, return_offsets_mapping=True, verbose=False):
+        spans = [(m.start() + i, min(m.start() + i + 3, m.end()))
+                 for m in re.finditer(r"\S+", text) for i in range(0, m.end() - m.start(), 3)]
+        return {"offset_mapping": spans}
+
+
+class SmallModel:
+    """
+    SentenceTransformer stand-in that reads at most max_seq_length tokens per text.
+    """
+    max_seq_length = 16
+
+    def __init__(self):
+        self.tokenizer = SubwordTokenizer()
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.encoded.extend(texts)
+        return np.array([[len(text), text.count("a") + 1.0, 1.0] for text in texts], dtype=np.float32)
+
+
+def test_default_service_chunks_fit_the_model(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # the service's embedding cache is created in the working directory
+    model = SmallModel()
+    monkeypatch.setattr(match_model, "_model", model)
+    monkeypatch.setattr(match_model, "_service", None)
+    try:
+        long_resume = " ".join(f"skill{i} banana" for i in range(200))
+        match_model.compare_resumes(long_resume, "short python resume", "python developer", chunked=True)
+        service = match_model._service
+        assert service is not None and service.max_seq_length == model.max_seq_length
+    finally:
+        if match_model._service is not None:
+            match_model._service.stop()
+
+    window = model.max_seq_length - 2
+    lengths = [len(model.tokenizer(text)["offset_mapping"]) for text in model.encoded]
+    assert len(model.encoded) > 3  # the long resume was split
+    assert max(lengths) <= window
@@ -0,0 +1,33 @@
+import csv
+import json
+import os
+
+import pytest
+
+from benchmarks.bench_clean_text import legacy_clean_text, edge_cases
+from clean_resume_dataset import clean_text, clean_texts
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def cases():
+    with open(os.path.join(ROOT, "small_resume_jd_dataset.json"), encoding="utf-8") as f:
+        texts = [item[field] for item in json.load(f) for field in ("resume_text", "job_description")]
+    with open(os.path.join(ROOT, "UpdatedResumeDataSet.csv"), newline="", encoding="utf-8") as f:
+        texts += [row["Resume"] for row in csv.DictReader(f)]
+    return texts + edge_cases(5_000)
+
+
+def test_clean_text_matches_original(cases):
+    assert [clean_text(text) for text in cases] == [legacy_clean_text(text) for text in cases]
+
+
+def test_clean_texts_pandas_matches_original(cases):
+    pd = pytest.importorskip("pandas")
+    assert clean_texts(pd.Series(cases)).tolist() == [legacy_clean_text(text) for text in cases]
+
+
+def test_clean_texts_arrow_matches_original(cases):
+    pa = pytest.importorskip("pyarrow")
+    assert clean_texts(pa.array(cases)).to_pylist() == [legacy_clean_text(text) for text in cases]
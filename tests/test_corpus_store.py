@@ -0,0 +1,31 @@
+import pytest
+
+from corpus_store import CorpusStore, convert
+
+
+@pytest.fixture
+def resume_csv(tmp_path):
+    path = tmp_path / "resumes.csv"
+    path.write_text("Category,Resume\nData,python sql\nWeb,java spring\n", encoding="utf-8")
+    return str(path)
+
+
+def test_convert_replaces_a_store_but_not_other_directories(tmp_path, resume_csv):
+    store = str(tmp_path / "resumes.corpus")
+    assert convert(resume_csv, store) == 2
+    assert convert(resume_csv, store) == 2
+
+    other = tmp_path / "results"
+    other.mkdir()
+    (other / "keep.txt").write_text("keep", encoding="utf-8")
+    with pytest.raises(FileExistsError):
+        convert(resume_csv, str(other))
+    assert (other / "keep.txt").read_text(encoding="utf-8") == "keep"
+
+
+def test_close_with_live_raw_views(tmp_path, resume_csv):
+    store = str(tmp_path / "resumes.corpus")
+    convert(resume_csv, store)
+    with CorpusStore(store) as corpus:
+        view = corpus.raw(1)
+    assert bytes(view) == b"java spring"
@@ -0,0 +1,36 @@
+import numpy as np
+
+from ranking import rank_resumes
+
+
+class CountingModel:
+    """
+    Encoder stand-in that records every text it is asked to encode.
+    """
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        return np.array([[len(text), 1.0] for text in texts], dtype=np.float32)
+
+
+def test_near_duplicates_keep_their_own_skills():
+    base = "Software engineer with python, sql and aws. " + " ".join(
+        f"Project {i} was delivered on time together with the platform team." for i in range(40))
+    extended = base + " Also kubernetes and docker."
+    model = CountingModel()
+    jd = "We need python, sql, aws, kubernetes and docker."
+
+    jd_skills, ranked = rank_resumes(jd, [("a.pdf", base), ("b.pdf", extended)], model=model, dedup_threshold=0.9)
+    results = {result["name"]: result for result in ranked}
+
+    assert results["b.pdf"]["duplicate_of"] == "a.pdf"
+    assert extended not in model.encoded  # the duplicate shares its representative's similarity
+    assert results["b.pdf"]["semantic_score"] == results["a.pdf"]["semantic_score"]
+    assert set(results["b.pdf"]["matched_skills"]) == set(jd_skills)
+    assert {"kubernetes", "docker"} <= set(results["a.pdf"]["missing_skills"])
+    assert results["b.pdf"]["skill_score"] > results["a.pdf"]["skill_score"]
+    assert results["b.pdf"]["score"] > results["a.pdf"]["score"]
+    assert ranked[0]["name"] == "b.pdf"
@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+import os
+import zipfile
+
+import pytest
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1 import app_test
+
+from ranking import rank_resumes, summarize_ranking
+from results_cache import ScreeningResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PAGES = {
+    "home": (os.path.join(ROOT, "app.py"), {"logged_in": True, "user": "tejal", "nav_choice": "📊 Results"}),
+    "results": (os.path.join(ROOT, "pages", "results.py"), {}),
+}
+
+
+@pytest.fixture
+def screening():
+    resumes = [(f"resume_{i}.txt", "python docker sql " * (i % 4)) for i in range(25)]
+    jd_skills, ranked = rank_resumes("python docker react sql", resumes)
+    return ScreeningResult.from_ranking(jd_skills, ranked, summarize_ranking(ranked))
+
+
+@pytest.fixture
+def media_managers(monkeypatch):
+    # AppTest drops its mock runtime after each run; keep its media file managers
+    managers, manager_class = [], app_test.MediaFileManager
+
+    def recording_manager(storage):
+        managers.append((manager_class(storage), storage))
+        return managers[-1][0]
+
+    monkeypatch.setattr(app_test, "MediaFileManager", recording_manager)
+    return managers
+
+
+def download(at, managers):
+    """
+    Click the report download button and return the bytes the browser would receive.
+    """
+    (button,) = at.get("download_button")
+    manager, storage = managers[-1]
+    url = manager.execute_deferred(button.proto.deferred_file_id)
+    return storage.get_file(url.rsplit("/", 1)[-1]).content
+
+
+@pytest.mark.parametrize("page", sorted(PAGES))
+@pytest.mark.parametrize("fmt", ["txt", "csv", "jsonl", "xlsx"])
+def test_report_download(page, fmt, screening, media_managers):
+    path, state = PAGES[page]
+    at = AppTest.from_file(path, default_timeout=60)
+    for key, value in {**state, "screening": screening}.items():
+        at.session_state[key] = value
+    at.run()
+    assert not at.exception
+    (report_format,) = [box for box in at.selectbox if box.label == "Report format"]
+    report_format.set_value(fmt).run()
+    assert not at.exception
+
+    data = download(at, media_managers)
+    if fmt == "txt":
+        assert data.decode("utf-8").startswith("\n📊 Resume Screening Report")
+    elif fmt == "csv":
+        rows = list(csv.reader(io.StringIO(data.decode("utf-8"))))
+        assert rows[0][:2] == ["rank", "name"] and len(rows) == len(screening) + 1
+    elif fmt == "jsonl":
+        records = [json.loads(line) for line in data.decode("utf-8").splitlines()]
+        assert [r["name"] for r in records] == [c.name for c in screening.candidates]
+    else:
+        with zipfile.ZipFile(io.BytesIO(data)) as archive:
+            sheet = archive.read("xl/worksheets/sheet1.xml").decode("utf-8")
+        assert sheet.count("<row>") == len(screening) + 1
@@ -0,0 +1,20 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from ranking import rank_resumes, summarize_ranking
+from results_cache import ScreeningResult
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_results_view_with_every_upload_skipped():
+    jd_skills, ranked = rank_resumes("python docker", [])
+    screening = ScreeningResult.from_ranking(jd_skills, ranked, summarize_ranking(ranked), ["broken.pdf"])
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+    for key, value in {"logged_in": True, "user": "tejal", "nav_choice": "📊 Results", "screening": screening}.items():
+        at.session_state[key] = value
+    at.run()
+    assert not at.exception
+    assert any("broken.pdf" in warning.value for warning in at.warning)
+    assert any("could be read" in warning.value for warning in at.warning)
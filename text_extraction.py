@@ -0,0 +1,237 @@
+import hashlib
+import io
+import os
+import pickle
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from multiprocessing.connection import wait
+
+# ------------------ Limits ------------------
+MAX_PAGES = 300            # pages past this are ignored
+TIMEOUT_SECONDS = 60       # wall-clock budget per document
+PAGES_PER_TASK = 8         # pages parsed per worker task
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+MAX_CACHED_DOCUMENTS = 256
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+_idle_workers = []
+_workers_lock = threading.Lock()
+_worker_slots = threading.BoundedSemaphore(MAX_WORKERS)
+
+
+def content_hash(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+# ------------------ Workers ------------------
+def _serve():
+    """
+    Worker process loop: read pickled (function, args) requests from stdin and write
+    (ok, result) back to stdout until stdin closes.
+    """
+    requests = sys.stdin.buffer
+    replies = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)  # stray prints from PDF libraries must not corrupt the replies
+    while True:
+        try:
+            function, args = pickle.load(requests)
+        except EOFError:
+            return
+        try:
+            reply = pickle.dumps((True, function(*args)))
+        except Exception as e:
+            try:
+                reply = pickle.dumps((False, e))
+            except Exception:
+                reply = pickle.dumps((False, RuntimeError(f"{type(e).__name__}: {e}")))
+        replies.write(reply)
+        replies.flush()
+
+
+class _Worker:
+    """
+    One extraction process, used by one document at a time. A worker whose document
+    overruns its budget is killed on its own, so no other document's extraction is
+    affected. Workers are plain subprocesses rather than multiprocessing children:
+    under Streamlit, __main__ is the app script, which spawn would re-run in each child.
+    """
+
+    def __init__(self):
+        self.process = subprocess.Popen(
+            [sys.executable, "-c", "import text_extraction; text_extraction._serve()"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+        self.conn = self.process.stdout
+
+    def submit(self, function, *args):
+        pickle.dump((function, args), self.process.stdin)
+        self.process.stdin.flush()
+
+    def result(self):
+        ok, value = pickle.load(self.conn)
+        if not ok:
+            raise value
+        return value
+
+    def alive(self):
+        return self.process.poll() is None
+
+    def kill(self):
+        self.process.kill()
+        self.process.wait()
+        self.process.stdin.close()
+        self.process.stdout.close()
+
+
+def _checkout(deadline=None):
+    """
+    An idle worker, or a new one while fewer than MAX_WORKERS are in use. Waits for
+    a free slot until deadline; with deadline=None returns None instead of waiting.
+    """
+    if deadline is None:
+        acquired = _worker_slots.acquire(blocking=False)
+    else:
+        acquired = _worker_slots.acquire(timeout=max(0, deadline - time.monotonic()))
+    if not acquired:
+        return None
+    with _workers_lock:
+        while _idle_workers:
+            worker = _idle_workers.pop()
+            if worker.alive():
+                return worker
+            worker.kill()
+    try:
+        return _Worker()
+    except BaseException:
+        _worker_slots.release()
+        raise
+
+
+def _checkin(worker, reusable):
+    if reusable:
+        with _workers_lock:
+            _idle_workers.append(worker)
+    else:
+        worker.kill()
+    _worker_slots.release()
+
+
+def _extract_pages(data, start, stop, max_pages):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    n_pages = min(len(reader.pages), max_pages)
+    return n_pages, start, [reader.pages[i].extract_text() or "" for i in range(start, min(stop, n_pages))]
+
+
+def _cache_get(key):
+    with _cache_lock:
+        pages = _cache.get(key)
+        if pages is not None:
+            _cache.move_to_end(key)
+        return pages
+
+
+def _cache_put(key, pages):
+    with _cache_lock:
+        _cache[key] = pages
+        _cache.move_to_end(key)
+        while len(_cache) > MAX_CACHED_DOCUMENTS:
+            _cache.popitem(last=False)
+
+
+def _iter_pages_inline(data, max_pages, deadline, timeout):
+    import PyPDF2
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    for i in range(min(len(reader.pages), max_pages)):
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"PDF text extraction exceeded {timeout}s after {i} pages")
+        yield reader.pages[i].extract_text() or ""
+
+
+def _iter_pages_in_workers(data, max_pages, deadline, timeout):
+    worker = _checkout(deadline)
+    if worker is None:
+        raise TimeoutError(f"No PDF extraction worker became free within {timeout}s")
+    workers, idle, busy = [worker], [], {}
+    worker.submit(_extract_pages, data, 0, PAGES_PER_TASK, max_pages)
+    busy[worker.conn] = worker
+    todo, finished, n_pages, next_page = None, {}, None, 0
+    try:
+        while busy:
+            ready = wait(list(busy), timeout=max(0, deadline - time.monotonic()))
+            if not ready:
+                raise TimeoutError(f"PDF text extraction exceeded {timeout}s after {next_page} of {n_pages or '?'} pages")
+            for conn in ready:
+                worker = busy.pop(conn)
+                try:
+                    n_pages, start, texts = worker.result()
+                except (EOFError, OSError, pickle.UnpicklingError):
+                    # The worker process died; it is killed and replaced below
+                    busy[conn] = worker
+                    raise RuntimeError("PDF extraction worker exited unexpectedly")
+                finished[start] = texts
+                idle.append(worker)
+                if todo is None:
+                    # The first range tells the page count; spread the rest over free workers, never waiting for one
+                    todo = list(range(PAGES_PER_TASK, n_pages, PAGES_PER_TASK))
+                    while len(workers) < len(todo):
+                        extra = _checkout()
+                        if extra is None:
+                            break
+                        workers.append(extra)
+                        idle.append(extra)
+            while idle and todo:
+                worker, start = idle.pop(), todo.pop(0)
+                worker.submit(_extract_pages, data, start, start + PAGES_PER_TASK, max_pages)
+                busy[worker.conn] = worker
+            # Hand pages out in order as soon as the next range is complete
+            while next_page in finished:
+                texts = finished.pop(next_page)
+                next_page += PAGES_PER_TASK
+                yield from texts
+    finally:
+        # Workers still busy are stuck, or their result would be read by the next document
+        for worker in workers:
+            _checkin(worker, reusable=worker not in busy.values())
+
+
+def iter_pdf_pages(data, max_pages=MAX_PAGES, timeout=TIMEOUT_SECONDS, parallel=True):
+    """
+    Yield the text of each PDF page in order, as soon as it is available.
+
+    Every document, including opening it, is parsed in worker processes: the first
+    PAGES_PER_TASK pages on one worker, the rest in page ranges on whichever workers
+    are free, so one long document uses several cores. Raises TimeoutError when the
+    document exceeds its time budget; only that document's workers are terminated.
+    Finished documents are cached by content hash. Pass parallel=False when already
+    running inside a worker process; pages are then parsed in-process and the budget
+    is checked between pages.
+    """
+    key = f"{content_hash(data)}:{max_pages}"
+    cached = _cache_get(key)
+    if cached is not None:
+        yield from cached
+        return
+
+    deadline = time.monotonic() + timeout
+    pages = []
+    iterate = _iter_pages_in_workers if parallel else _iter_pages_inline
+    for text in iterate(data, max_pages, deadline, timeout):
+        pages.append(text)
+        yield text
+    _cache_put(key, pages)
+
+
+def extract_text(data, is_pdf=None, max_pages=MAX_PAGES, timeout=TIMEOUT_SECONDS, parallel=True):
+    """
+    Return the text of an uploaded PDF or plain-text file given its raw bytes.
+    """
+    if is_pdf is None:
+        is_pdf = data[:5] == b"%PDF-"
+    if not is_pdf:
+        return data.decode("utf-8")
+    return " ".join(iter_pdf_pages(data, max_pages=max_pages, timeout=timeout, parallel=parallel))
@@ -0,0 +1,145 @@
+"""
+Lightweight per-stage latency tracing.
+
+    with tracing.stage("pdf_parsing"):
+        text = extract_text(data)
+
+Every stage keeps a rolling window of its latest durations, from which p50/p95/p99
+are computed on demand. Stats can be exported as Prometheus text or JSON for a
+local scraper. With tracing disabled (RESUME_SCREENING_TRACING=0), stage() returns
+a shared no-op context manager, so instrumented code pays one function call.
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+ENABLED = os.environ.get("RESUME_SCREENING_TRACING", "1") == "1"
+# When set, the app rewrites this file after every screening (".json" for JSON, else Prometheus text)
+METRICS_FILE = os.environ.get("RESUME_SCREENING_METRICS_FILE")
+WINDOW = 1000
+METRIC_NAME = "resume_screening_stage_seconds"
+
+_stages = {}
+_lock = threading.Lock()
+
+
+class StageStats:
+    __slots__ = ("durations", "count", "total")
+
+    def __init__(self, window=WINDOW):
+        self.durations = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+
+
+class _Timer:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def stage(name):
+    """
+    Context manager timing one execution of a named stage.
+    """
+    return _Timer(name) if ENABLED else _NULL_TIMER
+
+
+def record(name, seconds):
+    with _lock:
+        stats = _stages.get(name)
+        if stats is None:
+            stats = _stages[name] = StageStats()
+        stats.durations.append(seconds)
+        stats.count += 1
+        stats.total += seconds
+
+
+def set_enabled(enabled):
+    global ENABLED
+    ENABLED = enabled
+
+
+def reset():
+    with _lock:
+        _stages.clear()
+
+
+# ------------------ Reporting ------------------
+def snapshot():
+    """
+    {stage: {count, total_s, mean_ms, p50_ms, p95_ms, p99_ms}}; counts and totals are
+    since start-up, percentiles over the last WINDOW executions.
+    """
+    with _lock:
+        stages = {name: (np.array(stats.durations), stats.count, stats.total) for name, stats in _stages.items()}
+    report = {}
+    for name, (durations, count, total) in sorted(stages.items()):
+        p50, p95, p99 = np.percentile(durations, [50, 95, 99]) * 1000
+        report[name] = {
+            "count": count,
+            "total_s": total,
+            "mean_ms": total / count * 1000,
+            "p50_ms": float(p50),
+            "p95_ms": float(p95),
+            "p99_ms": float(p99),
+        }
+    return report
+
+
+def to_json():
+    return json.dumps({"timestamp": time.time(), "stages": snapshot()}, indent=2)
+
+
+def to_prometheus():
+    """
+    Prometheus text exposition format: one summary per stage.
+    """
+    lines = [
+        f"# HELP {METRIC_NAME} Latency of resume screening stages (quantiles over the last {WINDOW} runs).",
+        f"# TYPE {METRIC_NAME} summary",
+    ]
+    for name, stats in snapshot().items():
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        for quantile, key in (("0.5", "p50_ms"), ("0.95", "p95_ms"), ("0.99", "p99_ms")):
+            lines.append(f'{METRIC_NAME}{{stage="{label}",quantile="{quantile}"}} {stats[key] / 1000:.6f}')
+        lines.append(f'{METRIC_NAME}_sum{{stage="{label}"}} {stats["total_s"]:.6f}')
+        lines.append(f'{METRIC_NAME}_count{{stage="{label}"}} {stats["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def export(path):
+    """
+    Atomically write the stats to path, as JSON for *.json and Prometheus text otherwise.
+    """
+    payload = to_json() if path.endswith(".json") else to_prometheus()
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(payload)
+    os.replace(tmp, path)
@@ -0,0 +1,330 @@
+"""
+Persisted vector index over the resume corpus for job description -> top-k retrieval.
+
+    python vector_index.py build --csv UpdatedResumeDataSet.csv --index resume_index --ivf
+    python vector_index.py query --index resume_index --jd job_description.txt -k 10
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+from quantization import DTYPES, check_dtype, quantize, dequantize, dot_scores
+
+DEFAULT_INDEX_DIR = "resume_index"
+SEARCH_BLOCK_ROWS = 65_536
+
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / np.maximum(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12)
+
+
+def _write_json_atomic(path, payload):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f)
+    os.replace(tmp, path)
+
+
+def _top_k(scores, k):
+    k = min(k, len(scores))
+    if k == 0:
+        return np.empty(0, dtype=np.int64)
+    top = np.argpartition(-scores, k - 1)[:k]
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def kmeans(vectors, n_clusters, iterations=10, seed=0):
+    """
+    Spherical k-means on unit vectors; returns unit-length centroids.
+    """
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_clusters, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        empty = ~sums.any(axis=1)
+        # Re-seed empty clusters with random points instead of dropping them
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+class VectorIndex:
+    """
+    Unit-normalized embeddings in a memory-mapped matrix plus row metadata.
+
+    search() is exact brute force by default; after train_ivf() it can instead probe
+    the nprobe closest inverted lists. Rows can be added and deleted in place.
+    Vectors are stored as float32, float16 or int8 codes (see quantization.py) and
+    scored without expanding the whole matrix.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        self.model_name = meta["model_name"]
+        self.dim = meta["dim"]
+        self.size = meta["size"]
+        self.dtype = meta.get("dtype", "float32")
+        self.ids = meta["ids"]
+        self.categories = meta["categories"]
+        self.deleted = np.zeros(self.size, dtype=bool)
+        self.deleted[meta["deleted"]] = True
+        self._rows = {doc_id: row for row, doc_id in enumerate(self.ids) if not self.deleted[row]}
+        self.vectors = np.load(os.path.join(path, "vectors.npy"), mmap_mode="r+")
+        self.scales = None
+        if self.dtype == "int8":
+            self.scales = np.load(os.path.join(path, "scales.npy"), mmap_mode="r+")
+
+        self.centroids = None
+        self.assignments = None
+        self._lists = None
+        if os.path.exists(os.path.join(path, "centroids.npy")):
+            self.centroids = np.load(os.path.join(path, "centroids.npy"))
+            self.assignments = np.load(os.path.join(path, "assignments.npy"))[:self.size]
+
+    @classmethod
+    def create(cls, path, dim, model_name, capacity=1024, dtype="float32"):
+        check_dtype(dtype)
+        os.makedirs(path, exist_ok=True)
+        for name in ("centroids.npy", "assignments.npy", "scales.npy"):
+            if os.path.exists(os.path.join(path, name)):
+                os.remove(os.path.join(path, name))
+        np.lib.format.open_memmap(os.path.join(path, "vectors.npy"), mode="w+", dtype=dtype,
+                                  shape=(capacity, dim)).flush()
+        if dtype == "int8":
+            np.lib.format.open_memmap(os.path.join(path, "scales.npy"), mode="w+", dtype=np.float32,
+                                      shape=(capacity,)).flush()
+        _write_json_atomic(os.path.join(path, "meta.json"), {
+            "model_name": model_name, "dim": dim, "dtype": dtype, "size": 0, "ids": [], "categories": [],
+            "deleted": [],
+        })
+        return cls(path)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def save(self):
+        self.vectors.flush()
+        if self.scales is not None:
+            self.scales.flush()
+        _write_json_atomic(os.path.join(self.path, "meta.json"), {
+            "model_name": self.model_name, "dim": self.dim, "dtype": self.dtype, "size": self.size, "ids": self.ids,
+            "categories": self.categories, "deleted": np.flatnonzero(self.deleted).tolist(),
+        })
+        if self.centroids is not None:
+            np.save(os.path.join(self.path, "centroids.npy"), self.centroids)
+            np.save(os.path.join(self.path, "assignments.npy"), self.assignments)
+
+    def _grow(self, needed):
+        capacity = self.vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._grow_file("vectors", (capacity, self.dim))
+        if self.scales is not None:
+            self._grow_file("scales", (capacity,))
+
+    def _grow_file(self, attr, shape):
+        tmp = os.path.join(self.path, f"{attr}.npy.tmp")
+        grown = np.lib.format.open_memmap(tmp, mode="w+", dtype=getattr(self, attr).dtype, shape=shape)
+        grown[:self.size] = getattr(self, attr)[:self.size]
+        grown.flush()
+        del grown
+        setattr(self, attr, None)
+        os.replace(tmp, os.path.join(self.path, f"{attr}.npy"))
+        setattr(self, attr, np.load(os.path.join(self.path, f"{attr}.npy"), mmap_mode="r+"))
+
+    def _scales(self, rows):
+        return None if self.scales is None else self.scales[rows]
+
+    def _block(self, start, stop):
+        # Float32 copy of a block of rows, for clustering
+        return dequantize(self.vectors[start:stop], self._scales(slice(start, stop)))
+
+    def add(self, vectors, ids, categories=None):
+        """
+        Append embeddings; an id that is already indexed is replaced.
+        """
+        vectors = _normalize(vectors)
+        categories = categories or [None] * len(ids)
+        self.delete([doc_id for doc_id in ids if doc_id in self._rows])
+
+        start = self.size
+        self._grow(start + len(ids))
+        codes, scales = quantize(vectors, self.dtype)
+        self.vectors[start:start + len(ids)] = codes
+        if scales is not None:
+            self.scales[start:start + len(ids)] = scales
+        self.size += len(ids)
+        self.ids.extend(ids)
+        self.categories.extend(categories)
+        self.deleted = np.concatenate([self.deleted, np.zeros(len(ids), dtype=bool)])
+        self._rows.update((doc_id, start + i) for i, doc_id in enumerate(ids))
+
+        if self.centroids is not None:
+            new_assignments = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+            self.assignments = np.concatenate([self.assignments, new_assignments])
+            if self._lists is not None:
+                for offset, cluster in enumerate(new_assignments):
+                    self._lists[cluster].append(start + offset)
+
+    def delete(self, ids):
+        """
+        Tombstone rows by id; they are skipped by search.
+        """
+        for doc_id in ids:
+            row = self._rows.pop(doc_id, None)
+            if row is not None:
+                self.deleted[row] = True
+
+    def train_ivf(self, n_lists=None, iterations=10, sample_size=50_000, seed=0):
+        """
+        Cluster the live rows into n_lists inverted lists (default: sqrt of the size).
+        """
+        live = np.flatnonzero(~self.deleted)
+        n_lists = n_lists or max(1, int(np.sqrt(len(live))))
+        rng = np.random.default_rng(seed)
+        sample = live if len(live) <= sample_size else np.sort(rng.choice(live, sample_size, replace=False))
+        sample_vectors = _normalize(dequantize(self.vectors[sample], self._scales(sample)))
+        self.centroids = kmeans(sample_vectors, min(n_lists, len(sample)), iterations, seed)
+
+        self.assignments = np.empty(self.size, dtype=np.int32)
+        for start in range(0, self.size, SEARCH_BLOCK_ROWS):
+            block = self._block(start, min(start + SEARCH_BLOCK_ROWS, self.size))
+            self.assignments[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        self._lists = None
+
+    def _inverted_lists(self):
+        if self._lists is None:
+            order = np.argsort(self.assignments, kind="stable")
+            bounds = np.searchsorted(self.assignments[order], np.arange(len(self.centroids) + 1))
+            self._lists = [order[bounds[c]:bounds[c + 1]].tolist() for c in range(len(self.centroids))]
+        return self._lists
+
+    def search(self, query, k=10, nprobe=None):
+        """
+        Return up to k (id, category, score) tuples, best first.
+
+        nprobe=None scans every row exactly; with a trained IVF, nprobe > 0 only scores
+        rows in the nprobe lists whose centroids are closest to the query.
+        """
+        query = _normalize(query).reshape(-1)
+        if nprobe and self.centroids is not None:
+            lists = self._inverted_lists()
+            probe = _top_k(self.centroids @ query, nprobe)
+            rows = np.array(sorted(row for c in probe for row in lists[c]), dtype=np.int64)
+            rows = rows[~self.deleted[rows]]
+            scores = dot_scores(self.vectors[rows], self._scales(rows), query)
+            best = _top_k(scores, k)
+            return [(self.ids[rows[i]], self.categories[rows[i]], float(scores[i])) for i in best]
+
+        # Exact scan in blocks so only one block of the memory map is touched at a time
+        candidates_rows, candidates_scores = [], []
+        for start in range(0, self.size, SEARCH_BLOCK_ROWS):
+            stop = min(start + SEARCH_BLOCK_ROWS, self.size)
+            scores = dot_scores(self.vectors[start:stop], self._scales(slice(start, stop)), query)
+            scores[self.deleted[start:stop]] = -np.inf
+            top = _top_k(scores, k)
+            candidates_rows.append(top + start)
+            candidates_scores.append(scores[top])
+        if not candidates_rows:
+            return []
+        rows = np.concatenate(candidates_rows)
+        scores = np.concatenate(candidates_scores)
+        best = [i for i in _top_k(scores, k) if np.isfinite(scores[i])]
+        return [(self.ids[rows[i]], self.categories[rows[i]], float(scores[i])) for i in best]
+
+
+# ------------------ Build & Query ------------------
+def read_corpus(csv_path, text_column="Resume", category_column="Category"):
+    """
+    Yield (id, category, text) rows; the id is the row number in the CSV. csv_path
+    may also be a corpus store converted from that CSV (see corpus_store.py).
+    """
+    from corpus_store import CorpusStore, is_store
+
+    if is_store(csv_path):
+        with CorpusStore(csv_path) as store:
+            field = text_column if text_column in store.fields else store.fields[0]
+            for i in range(len(store)):
+                yield str(store.ids[i]), store.category(i), store.text(i, field)
+        return
+    csv.field_size_limit(sys.maxsize)
+    with open(csv_path, newline="", encoding="utf-8") as f:
+        for i, row in enumerate(csv.DictReader(f)):
+            text = row.get(text_column) or ""
+            if text.strip():
+                yield str(i), row.get(category_column), text
+
+
+def build_index(csv_path, index_path, model, model_name, cache=None, batch_size=256, ivf=False, dtype="float32"):
+    import match_model
+
+    index = None
+    rows = list(read_corpus(csv_path))
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        vectors = match_model.encode(model, [text for _, _, text in chunk], cache, batch_size=64)
+        if index is None:
+            index = VectorIndex.create(index_path, vectors.shape[1], model_name, dtype=dtype)
+        index.add(vectors, [doc_id for doc_id, _, _ in chunk], [category for _, category, _ in chunk])
+        print(f"\r🧮 Embedded {min(start + batch_size, len(rows))}/{len(rows)} resumes", end="", flush=True)
+    print()
+    if index is None:
+        sys.exit("❌ No resumes found in the corpus.")
+    if ivf:
+        index.train_ivf()
+    index.save()
+    return index
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build or query the resume vector index.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    build = sub.add_parser("build", help="embed a resume CSV into a persisted index")
+    build.add_argument("--csv", default="UpdatedResumeDataSet.csv")
+    build.add_argument("--index", default=DEFAULT_INDEX_DIR)
+    build.add_argument("--ivf", action="store_true", help="also train the approximate IVF lists")
+    build.add_argument("--dtype", choices=DTYPES, default="float32", help="storage format of the vectors")
+    query = sub.add_parser("query", help="return the top-k resumes for a job description")
+    query.add_argument("--index", default=DEFAULT_INDEX_DIR)
+    query.add_argument("--jd", required=True, help="path to a text file holding the job description")
+    query.add_argument("-k", type=int, default=10)
+    query.add_argument("--nprobe", type=int, default=None, help="probe this many IVF lists instead of an exact scan")
+    args = parser.parse_args(argv)
+
+    import match_model
+    from embedding_cache import EmbeddingCache
+
+    model = match_model.get_model()
+    cache = EmbeddingCache(match_model.MODEL_NAME)
+
+    if args.command == "build":
+        index = build_index(args.csv, args.index, model, match_model.MODEL_NAME, cache, ivf=args.ivf, dtype=args.dtype)
+        print(f"✅ Indexed {len(index)} resumes into {args.index}")
+        return
+
+    index = VectorIndex(args.index)
+    with open(args.jd, encoding="utf-8") as f:
+        job_desc = f.read()
+    query_vector = match_model.encode(model, [job_desc], cache)[0]
+    start = time.perf_counter()
+    results = index.search(query_vector, k=args.k, nprobe=args.nprobe)
+    elapsed = (time.perf_counter() - start) * 1000
+    for rank, (doc_id, category, score) in enumerate(results, 1):
+        print(f"#{rank:<3} row {doc_id:<6} {score:.3f}  {category}")
+    print(f"⚡ Searched {len(index)} resumes in {elapsed:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()